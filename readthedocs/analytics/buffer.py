@@ -0,0 +1,259 @@
+"""
+Buffer of page views.
+
+Instead of writing to the database on each page view,
+page views are counted in the cache (atomic increments),
+grouped in buckets of ``RTD_ANALYTICS_BUFFER_BUCKET_SECONDS`` seconds.
+A periodic task flushes the closed buckets into the database,
+adding the counts of each page with a single bulk upsert.
+
+This means that:
+
+- Page views show up in the database with a lag of up to two buckets
+  plus the interval of the periodic task (see ``PageViewBuffer.get_status``).
+- Once a bucket has ``RTD_ANALYTICS_BUFFER_MAX_KEYS`` distinct pages,
+  page views for new pages in that bucket are dropped (and counted as dropped),
+  this keeps the work done by each flush bounded.
+- Buckets that aren't flushed before they expire from the cache are lost.
+- Only one flush runs at a time (guarded by a lock in the cache),
+  overlapping flushes would count the same bucket twice.
+"""
+
+import hashlib
+import time
+
+import structlog
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from readthedocs.builds.utils import memcache_lock
+
+log = structlog.get_logger(__name__)
+
+
+class PageViewBuffer:
+
+    """Count page views in the cache, and flush them to the database in bulk."""
+
+    prefix = "pageviews-buffer"
+
+    @property
+    def bucket_seconds(self):
+        return settings.RTD_ANALYTICS_BUFFER_BUCKET_SECONDS
+
+    @property
+    def timeout(self):
+        # Give enough time to the periodic task to flush the buckets,
+        # even if it's delayed for a while.
+        return self.bucket_seconds * 60
+
+    @property
+    def lock_timeout(self):
+        return self.bucket_seconds * 10
+
+    def get_current_bucket(self):
+        return int(time.time() // self.bucket_seconds)
+
+    def _get_slots_key(self, bucket):
+        return f"{self.prefix}-{bucket}-slots"
+
+    def _get_slot_key(self, bucket, slot):
+        return f"{self.prefix}-{bucket}-slot-{slot}"
+
+    def _get_counter_key(self, bucket, data):
+        digest = hashlib.md5(repr(data).encode(), usedforsecurity=False).hexdigest()
+        return f"{self.prefix}-{bucket}-{digest}"
+
+    def _get_dropped_key(self, bucket):
+        return f"{self.prefix}-{bucket}-dropped"
+
+    def _get_flushed_key(self):
+        return f"{self.prefix}-flushed"
+
+    def _get_lock_key(self):
+        return f"{self.prefix}-lock"
+
+    def _incr(self, key):
+        """Increment `key`, creating it if it doesn't exist."""
+        if not cache.add(key, 1, timeout=self.timeout):
+            cache.incr(key)
+
+    def add(self, project_id, version_id, path, full_path, date, status):
+        """
+        Count a page view.
+
+        The first view of a page in the current bucket registers
+        the page in a new slot of the bucket, next views only increment its counter.
+        """
+        bucket = self.get_current_bucket()
+        data = (project_id, version_id, path, full_path, date.isoformat(), status)
+        counter_key = self._get_counter_key(bucket, data)
+        try:
+            cache.incr(counter_key)
+            return
+        except ValueError:
+            # This is the first view of this page in this bucket.
+            pass
+
+        slots_key = self._get_slots_key(bucket)
+        if cache.get(slots_key, 0) >= settings.RTD_ANALYTICS_BUFFER_MAX_KEYS:
+            self._incr(self._get_dropped_key(bucket))
+            return
+
+        if cache.add(counter_key, 1, timeout=self.timeout):
+            cache.add(slots_key, 0, timeout=self.timeout)
+            slot = cache.incr(slots_key)
+            cache.set(
+                self._get_slot_key(bucket, slot),
+                (counter_key, data),
+                timeout=self.timeout,
+            )
+        else:
+            # Another request registered this page at the same time.
+            cache.incr(counter_key)
+
+    def get_status(self):
+        """
+        Get the status of the buffer.
+
+        :returns: A dictionary with the number of seconds
+         the counts in the database are behind (``lag_seconds``),
+         and the number of page views dropped in the buckets
+         pending to be flushed (``dropped``).
+        """
+        current_bucket = self.get_current_bucket()
+        flushed_bucket = cache.get(self._get_flushed_key())
+        if flushed_bucket is None:
+            return {"lag_seconds": None, "dropped": 0}
+        pending_buckets = range(flushed_bucket + 1, current_bucket + 1)
+        dropped = cache.get_many(
+            [self._get_dropped_key(bucket) for bucket in pending_buckets]
+        )
+        return {
+            "lag_seconds": (current_bucket - flushed_bucket) * self.bucket_seconds,
+            "dropped": sum(dropped.values()),
+        }
+
+    def flush(self):
+        """
+        Flush all closed buckets into the database.
+
+        The current and previous buckets are left open,
+        since requests may still be writing to them.
+
+        :returns: A dictionary with the number of buckets flushed,
+         the number of page views and rows written, and the number of page views dropped,
+         or ``None`` if another flush is already running.
+        """
+        with memcache_lock(
+            self._get_lock_key(), self.lock_timeout, "flush"
+        ) as acquired:
+            if not acquired:
+                log.warning("Page views are already being flushed.")
+                return None
+            return self._flush()
+
+    def _flush(self):
+        stats = {"buckets": 0, "page_views": 0, "rows": 0, "dropped": 0}
+        last_closed_bucket = self.get_current_bucket() - 2
+        flushed_bucket = cache.get(self._get_flushed_key())
+        # Buckets older than the timeout have already expired.
+        oldest_bucket = last_closed_bucket - self.timeout // self.bucket_seconds
+        if flushed_bucket is None or flushed_bucket < oldest_bucket:
+            flushed_bucket = oldest_bucket
+
+        for bucket in range(flushed_bucket + 1, last_closed_bucket + 1):
+            page_views, dropped = self._flush_bucket(bucket)
+            stats["buckets"] += 1
+            stats["page_views"] += sum(page_views.values())
+            stats["rows"] += len(page_views)
+            stats["dropped"] += dropped
+            cache.set(self._get_flushed_key(), bucket, timeout=None)
+
+        log.info("Page views flushed.", **stats)
+        if stats["dropped"]:
+            log.warning("Page views were dropped.", dropped=stats["dropped"])
+        return stats
+
+    def _flush_bucket(self, bucket):
+        slots_key = self._get_slots_key(bucket)
+        dropped_key = self._get_dropped_key(bucket)
+        slots = cache.get(slots_key, 0)
+        dropped = cache.get(dropped_key, 0)
+
+        slot_keys = [self._get_slot_key(bucket, slot) for slot in range(1, slots + 1)]
+        registered = cache.get_many(slot_keys)
+        counter_keys = [counter_key for counter_key, _ in registered.values()]
+        counts = cache.get_many(counter_keys)
+
+        page_views = {}
+        for counter_key, data in registered.values():
+            count = counts.get(counter_key)
+            if count:
+                page_views[data] = count
+        upsert_page_views(page_views)
+
+        cache.delete_many([slots_key, dropped_key, *slot_keys, *counter_keys])
+        return page_views, dropped
+
+
+def upsert_page_views(page_views, chunk_size=500):
+    """
+    Add the given counts to the page views from the database.
+
+    New page views are created, and the counts are added to the existing ones,
+    using a bulk ``INSERT ... ON CONFLICT DO UPDATE`` for each type of unique constraint
+    (page views with and without a version).
+
+    :param page_views: Dictionary of tuples of
+     (project_id, version_id, path, full_path, date, status) to the number of views.
+    :param chunk_size: Maximum number of rows to upsert in each query.
+    """
+    # Group the counts by the unique fields of the model,
+    # a single query can't update the same row twice.
+    rows = {}
+    for data, count in page_views.items():
+        project_id, version_id, path, full_path, date, status = data
+        key = (project_id, version_id, path, date, status)
+        if key in rows:
+            rows[key][1] += count
+        else:
+            rows[key] = [full_path, count]
+
+    with_version = []
+    without_version = []
+    for key, (full_path, count) in rows.items():
+        project_id, version_id, path, date, status = key
+        row = (project_id, version_id, path, full_path, date, status, count)
+        if version_id is None:
+            without_version.append(row)
+        else:
+            with_version.append(row)
+
+    # Sort the rows to always lock them in the same order,
+    # avoiding deadlocks between concurrent flushes.
+    with_version.sort(key=lambda row: (row[0], row[1], row[2], row[4], row[5]))
+    without_version.sort(key=lambda row: (row[0], row[2], row[4], row[5]))
+    with transaction.atomic(), connection.cursor() as cursor:
+        for rows, conflict_target in (
+            (with_version, "(project_id, version_id, path, date, status)"),
+            (
+                without_version,
+                "(project_id, path, date, status) WHERE version_id IS NULL",
+            ),
+        ):
+            for i in range(0, len(rows), chunk_size):
+                chunk = rows[i : i + chunk_size]
+                values = ", ".join(["(%s, %s, %s, %s, %s, %s, %s)"] * len(chunk))
+                cursor.execute(
+                    "INSERT INTO analytics_pageview "
+                    "(project_id, version_id, path, full_path, date, status, view_count) "
+                    f"VALUES {values} "
+                    f"ON CONFLICT {conflict_target} DO UPDATE "
+                    "SET view_count = analytics_pageview.view_count + excluded.view_count",
+                    [value for row in chunk for value in row],
+                )
+
+
+page_view_buffer = PageViewBuffer()
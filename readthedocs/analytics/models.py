@@ -3,11 +3,13 @@ import datetime
 from collections import namedtuple
 from urllib.parse import urlparse
 
+from django.conf import settings
 from django.db import models
 from django.db.models import Sum
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from readthedocs.analytics.buffer import page_view_buffer
 from readthedocs.builds.models import Version
 from readthedocs.core.resolver import Resolver
 from readthedocs.projects.models import Feature, Project
@@ -26,7 +28,13 @@ class PageViewManager(models.Manager):
     """Manager for PageView model."""
 
     def register_page_view(self, project, version, filename, path, status):
-        """Track page view with the given parameters."""
+        """
+        Track page view with the given parameters.
+
+        If ``RTD_ANALYTICS_BUFFER_PAGE_VIEWS`` is enabled,
+        the page view is counted in the buffer and written to the database later
+        (see ``readthedocs.analytics.buffer``), and ``None`` is returned.
+        """
         # TODO: remove after the migration of duplicate records has been completed.
         if project.has_feature(Feature.DISABLE_PAGEVIEWS):
             return
@@ -35,6 +43,17 @@ class PageViewManager(models.Manager):
         filename = "/" + filename.lstrip("/")
         path = "/" + path.lstrip("/")
 
+        if settings.RTD_ANALYTICS_BUFFER_PAGE_VIEWS:
+            page_view_buffer.add(
+                project_id=project.pk,
+                version_id=version.pk if version else None,
+                path=filename,
+                full_path=path,
+                date=timezone.now().date(),
+                status=status,
+            )
+            return None
+
         page_view, created = self.get_or_create(
             project=project,
             version=version,
@@ -1,5 +1,6 @@
 """Tasks for Read the Docs' analytics."""
 
+import structlog
 from django.conf import settings
 from django.db import connection
 from django.utils import timezone
@@ -7,8 +8,12 @@ from django.utils import timezone
 import readthedocs
 from readthedocs.worker import app
 
+from .buffer import page_view_buffer
 from .utils import send_to_analytics
 
+log = structlog.get_logger(__name__)
+
+
 DEFAULT_PARAMETERS = {
     "v": "1",  # analytics version (always 1)
     "aip": "1",  # anonymize IP
@@ -90,3 +95,16 @@ def delete_old_page_counts():
                 days_ago,
             ],
         )
+
+
+@app.task(queue="web")
+def flush_page_views():
+    """
+    Flush the page views counted in the buffer into the database.
+
+    This is intended to run from a periodic task every minute.
+    The status of the buffer is logged after each run,
+    a growing lag means the page views aren't being flushed.
+    """
+    page_view_buffer.flush()
+    log.info("Page views buffer status.", **page_view_buffer.get_status())
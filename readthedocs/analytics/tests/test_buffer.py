@@ -0,0 +1,158 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django_dynamic_fixture import get
+
+from readthedocs.analytics.buffer import page_view_buffer, upsert_page_views
+from readthedocs.analytics.models import PageView
+from readthedocs.analytics.tasks import flush_page_views
+from readthedocs.projects.models import Project
+
+
+@override_settings(
+    RTD_ANALYTICS_BUFFER_PAGE_VIEWS=True,
+    RTD_ANALYTICS_BUFFER_BUCKET_SECONDS=60,
+    RTD_ANALYTICS_BUFFER_MAX_KEYS=3,
+)
+@mock.patch("readthedocs.analytics.buffer.time.time")
+class TestPageViewBuffer(TestCase):
+    def setUp(self):
+        self.user = get(User)
+        self.project = get(Project, users=[self.user])
+        self.version = self.project.versions.first()
+        self.today = timezone.now().date()
+        self.now = 1_000_000 * 60
+
+    def _register(self, filename, status=200, version=True):
+        PageView.objects.register_page_view(
+            project=self.project,
+            version=self.version if version else None,
+            filename=filename,
+            path=f"/en/latest/{filename}",
+            status=status,
+        )
+
+    def test_page_views_are_flushed_in_bulk(self, time):
+        time.return_value = self.now
+        get(
+            PageView,
+            project=self.project,
+            version=self.version,
+            path="/index.html",
+            full_path="/en/latest/index.html",
+            date=self.today,
+            status=200,
+            view_count=5,
+        )
+
+        self._register("index.html")
+        self._register("index.html")
+        self._register("install.html")
+        self._register("missing.html", status=404, version=False)
+        self._register("missing.html", status=404, version=False)
+        self.assertEqual(PageView.objects.count(), 1)
+
+        # The current bucket and the previous one aren't flushed yet.
+        time.return_value = self.now + 60
+        self.assertEqual(page_view_buffer.flush()["page_views"], 0)
+        self.assertEqual(PageView.objects.count(), 1)
+        self.assertEqual(
+            page_view_buffer.get_status(), {"lag_seconds": 120, "dropped": 0}
+        )
+
+        time.return_value = self.now + 120
+        # One upsert for page views with a version, and another one without,
+        # plus the savepoint queries from the transaction.
+        with self.assertNumQueries(4):
+            stats = page_view_buffer.flush()
+        self.assertEqual(
+            stats, {"buckets": 1, "page_views": 5, "rows": 3, "dropped": 0}
+        )
+        self.assertEqual(
+            page_view_buffer.get_status(), {"lag_seconds": 120, "dropped": 0}
+        )
+
+        page_views = {
+            (page_view.path, page_view.version_id, page_view.status): page_view
+            for page_view in PageView.objects.all()
+        }
+        self.assertEqual(len(page_views), 3)
+        self.assertEqual(
+            page_views[("/index.html", self.version.pk, 200)].view_count, 7
+        )
+        self.assertEqual(
+            page_views[("/install.html", self.version.pk, 200)].view_count, 1
+        )
+        missing = page_views[("/missing.html", None, 404)]
+        self.assertEqual(missing.view_count, 2)
+        self.assertEqual(missing.full_path, "/en/latest/missing.html")
+
+        # Buckets are flushed only once.
+        time.return_value = self.now + 180
+        self.assertEqual(page_view_buffer.flush()["buckets"], 1)
+        self.assertEqual(
+            page_views[("/index.html", self.version.pk, 200)].view_count, 7
+        )
+
+    def test_flush_task_logs_status(self, time):
+        time.return_value = self.now
+        self._register("index.html")
+        time.return_value = self.now + 120
+        with mock.patch("readthedocs.analytics.tasks.log") as log:
+            flush_page_views()
+        log.info.assert_called_once_with(
+            "Page views buffer status.", lag_seconds=120, dropped=0
+        )
+        self.assertEqual(PageView.objects.count(), 1)
+
+    def test_overlapping_flushes_dont_count_twice(self, time):
+        time.return_value = self.now
+        self._register("index.html")
+
+        time.return_value = self.now + 120
+        # Another flush is running.
+        cache.add(page_view_buffer._get_lock_key(), "flush")
+        with self.assertNumQueries(0):
+            self.assertIsNone(page_view_buffer.flush())
+        self.assertEqual(PageView.objects.count(), 0)
+
+        cache.delete(page_view_buffer._get_lock_key())
+        self.assertEqual(page_view_buffer.flush()["page_views"], 1)
+        # The lock is released after flushing.
+        self.assertIsNone(cache.get(page_view_buffer._get_lock_key()))
+        self.assertEqual(page_view_buffer.flush()["page_views"], 0)
+        self.assertEqual(PageView.objects.get().view_count, 1)
+
+    def test_page_views_are_dropped_when_the_bucket_is_full(self, time):
+        time.return_value = self.now
+        for filename in ["one.html", "two.html", "three.html", "four.html"]:
+            self._register(filename)
+        # Existing pages are still counted.
+        self._register("one.html")
+        # Mark the previous bucket as flushed.
+        page_view_buffer.flush()
+
+        self.assertEqual(page_view_buffer.get_status()["dropped"], 1)
+
+        time.return_value = self.now + 120
+        stats = page_view_buffer.flush()
+        self.assertEqual(
+            stats, {"buckets": 2, "page_views": 4, "rows": 3, "dropped": 1}
+        )
+        self.assertFalse(PageView.objects.filter(path="/four.html").exists())
+        self.assertEqual(PageView.objects.get(path="/one.html").view_count, 2)
+
+    def test_upsert_groups_rows_with_the_same_unique_fields(self, time):
+        date = self.today.isoformat()
+        upsert_page_views(
+            {
+                (self.project.pk, self.version.pk, "/", "/en/latest/", date, 200): 2,
+                (self.project.pk, self.version.pk, "/", "/en/stable/", date, 200): 3,
+            }
+        )
+        page_view = PageView.objects.get()
+        self.assertEqual(page_view.view_count, 5)
+        self.assertEqual(page_view.path, "/")
@@ -2,9 +2,12 @@
 
 import itertools
 import re
+from collections import defaultdict
 
 import structlog
 from django.conf import settings
+from django.db import router
+from django.db.models.deletion import Collector
 from rest_framework.pagination import PageNumberPagination
 
 from readthedocs.builds.constants import (
@@ -17,7 +20,13 @@ from readthedocs.builds.constants import (
     STABLE_VERBOSE_NAME,
     TAG,
 )
-from readthedocs.builds.models import RegexAutomationRule, Version
+from readthedocs.builds.automation_actions import BulkActions
+from readthedocs.builds.models import (
+    AutomationRuleMatch,
+    RegexAutomationRule,
+    Version,
+)
+from readthedocs.proxito.sitemap import invalidate_sitemap
 
 log = structlog.get_logger(__name__)
 
@@ -27,7 +36,7 @@ def sync_versions_to_db(project, versions, type):
     Update the database with the current versions from the repository.
 
     - check if user has a ``stable`` / ``latest`` version and disable ours
-    - update old versions with newer configs (identifier, type, machine)
+    - update old versions with newer configs (identifier, type, machine) (in bulk)
     - create new versions that do not exist on DB (in bulk)
     - it does not delete versions
 
@@ -37,13 +46,22 @@ def sync_versions_to_db(project, versions, type):
     :returns: set of versions' slug added
     """
     old_version_values = project.versions.filter(type=type).values_list(
+        'pk',
         'verbose_name',
         'identifier',
     )
-    old_versions = dict(old_version_values)
+    old_versions = {}
+    old_versions_pks = defaultdict(list)
+    for pk, verbose_name, identifier in old_version_values:
+        old_versions[verbose_name] = identifier
+        # A tag and a branch can share the same verbose_name,
+        # but we are always filtering by type, so this is just defensive.
+        old_versions_pks[verbose_name].append(pk)
 
     # Add new versions
     versions_to_create = []
+    versions_to_update = []
+    updated = []
     added = set()
     has_user_stable = False
     has_user_latest = False
@@ -78,26 +96,30 @@ def sync_versions_to_db(project, versions, type):
                 continue
 
             # Update slug with new identifier
-            Version.objects.filter(
-                project=project,
-                verbose_name=version_name,
-                # Always filter by type, a tag and a branch
-                # can share the same verbose_name.
-                type=type,
-            ).update(
-                identifier=version_id,
-                machine=False,
-            )
-
-            log.info(
-                'Re-syncing versions: version updated.',
-                version_verbose_name=version_name,
-                version_id=version_id,
+            versions_to_update.extend(
+                Version(pk=pk, identifier=version_id, machine=False)
+                for pk in old_versions_pks[version_name]
             )
+            updated.append(version_name)
         else:
             # New Version
             versions_to_create.append((version_id, version_name))
 
+    if versions_to_update:
+        # ``bulk_update`` doesn't send the ``post_save`` signal,
+        # the identifier isn't part of the sitemap nor the highest version,
+        # their caches don't need to be invalidated.
+        Version.objects.bulk_update(
+            versions_to_update,
+            fields=["identifier", "machine"],
+            batch_size=settings.RTD_SYNC_VERSIONS_BATCH_SIZE,
+        )
+        log.info(
+            "Re-syncing versions: versions updated.",
+            count=len(updated),
+            versions=",".join(itertools.islice(updated, 100)),
+        )
+
     added.update(_create_versions(project, type, versions_to_create))
 
     if not has_user_stable:
@@ -133,23 +155,42 @@ def _create_versions(project, type, versions):
 
     .. note::
 
-       ``Version.slug`` relies on the post_save signal,
-       so we can't use bulk_create.
+       ``Version.slug`` is generated on save and requires a query per version
+       to check for its uniqueness, so we generate the slugs of all versions
+       at once, and create them with ``bulk_create``.
+       ``bulk_create`` doesn't send the ``post_save`` signal,
+       so we invalidate the sitemap of the project once.
+       The cached highest version of the project (``invalidate_project_highest_version``)
+       isn't invalidated on purpose, new versions aren't active nor built,
+       they can't be the highest version.
     """
-    versions_objs = (
+    if not versions:
+        return set()
+
+    existing_slugs = Version.objects.filter(project=project).values_list(
+        "slug", flat=True
+    )
+    slugs = Version._meta.get_field("slug").create_slugs(
+        model_cls=Version,
+        contents=[version_name for _, version_name in versions],
+        existing_slugs=existing_slugs,
+    )
+    versions_objs = [
         Version(
             project=project,
             type=type,
             identifier=version_id,
             verbose_name=version_name,
+            slug=slug,
         )
-        for version_id, version_name in versions
+        for (version_id, version_name), slug in zip(versions, slugs)
+    ]
+    Version.objects.bulk_create(
+        versions_objs,
+        batch_size=settings.RTD_SYNC_VERSIONS_BATCH_SIZE,
     )
-    added = set()
-    for version in versions_objs:
-        version.save()
-        added.add(version.slug)
-    return added
+    invalidate_sitemap(project.pk, project.main_language_project_id)
+    return set(slugs)
 
 
 def _set_or_create_version(project, slug, version_id, verbose_name, type_):
@@ -171,67 +212,74 @@ def _set_or_create_version(project, slug, version_id, verbose_name, type_):
     return version, False
 
 
-def _get_deleted_versions_qs(project, tags_data, branches_data):
+def _get_deleted_versions(project, tags_data, branches_data):
+    """
+    Get the versions from the database that aren't in the repository anymore.
+
+    Repositories can have thousands of tags and branches,
+    instead of sending all their names to the database to exclude them,
+    we fetch the versions of the project once and compare them in Python.
+
+    :returns: A tuple with the pk of the inactive versions,
+     and the slug of the active versions.
+    """
     # We use verbose_name for tags
     # because several tags can point to the same identifier.
-    versions_tags = [
-        version['verbose_name']
-        for version in tags_data
-    ]
-    versions_branches = [
-        version['identifier']
-        for version in branches_data
-    ]
+    versions_tags = {version["verbose_name"] for version in tags_data}
+    versions_branches = {version["identifier"] for version in branches_data}
 
-    to_delete_qs = (
+    versions = (
         project.versions(manager=INTERNAL)
         .exclude(uploaded=True)
         .exclude(slug__in=NON_REPOSITORY_VERSIONS)
+        .values_list("pk", "slug", "type", "verbose_name", "identifier", "active")
     )
-
-    to_delete_qs = to_delete_qs.exclude(
-        type=TAG,
-        verbose_name__in=versions_tags,
-    )
-    to_delete_qs = to_delete_qs.exclude(
-        type=BRANCH,
-        identifier__in=versions_branches,
-    )
-    return to_delete_qs
+    deleted_versions = []
+    deleted_active_versions = set()
+    for pk, slug, type_, verbose_name, identifier, active in versions:
+        if type_ == TAG and verbose_name in versions_tags:
+            continue
+        if type_ == BRANCH and identifier in versions_branches:
+            continue
+        if active:
+            deleted_active_versions.add(slug)
+        else:
+            deleted_versions.append(pk)
+    return deleted_versions, deleted_active_versions
 
 
 def delete_versions_from_db(project, tags_data, branches_data):
     """
     Delete all versions not in the current repo.
 
-    :returns: The slug of the deleted versions from the database.
+    Active versions aren't deleted,
+    they are handled by the automation rules.
+
+    :returns: The slug of the active versions that were deleted from the repository.
     """
-    to_delete_qs = (
-        _get_deleted_versions_qs(
-            project=project,
-            tags_data=tags_data,
-            branches_data=branches_data,
-        )
-        .exclude(active=True)
+    deleted_versions, deleted_active_versions = _get_deleted_versions(
+        project=project,
+        tags_data=tags_data,
+        branches_data=branches_data,
     )
-    _, deleted = to_delete_qs.delete()
-    versions_count = deleted.get('builds.Version', 0)
+    versions_count = 0
+    batch_size = settings.RTD_SYNC_VERSIONS_BATCH_SIZE
+    for i in range(0, len(deleted_versions), batch_size):
+        versions = list(
+            Version.objects.filter(pk__in=deleted_versions[i : i + batch_size])
+        )
+        # The delete signals of each version use its project,
+        # we already have it, so it isn't fetched for each version.
+        for version in versions:
+            version.project = project
+        collector = Collector(using=router.db_for_write(Version))
+        collector.collect(versions)
+        _, deleted = collector.delete()
+        versions_count += deleted.get("builds.Version", 0)
     log.info(
         'Re-syncing versions: versions deleted.', project_slug=project.slug, count=versions_count,
     )
-
-
-def get_deleted_active_versions(project, tags_data, branches_data):
-    """Return the slug of active versions that were deleted from the repository."""
-    to_delete_qs = (
-        _get_deleted_versions_qs(
-            project=project,
-            tags_data=tags_data,
-            branches_data=branches_data,
-        )
-        .filter(active=True)
-    )
-    return set(to_delete_qs.values_list('slug', flat=True))
+    return deleted_active_versions
 
 
 def run_automation_rules(project, added_versions, deleted_active_versions):
@@ -254,10 +302,24 @@ def run_automation_rules(project, added_versions, deleted_active_versions):
         (deleted_active_versions, class_.allowed_actions_on_delete),
     ]
     for versions_slug, allowed_actions in actions:
+        rules = list(project.automation_rules.filter(action__in=allowed_actions))
+        if not versions_slug or not rules:
+            continue
+
         versions = project.versions.filter(slug__in=versions_slug)
-        rules = project.automation_rules.filter(action__in=allowed_actions)
-        for version, rule in itertools.product(versions, rules):
-            rule.run(version)
+        # Prepare each rule only once (e.g. compile its regex).
+        matchers = [(rule, rule.get_matcher()) for rule in rules]
+        bulk_actions = BulkActions(project)
+        matches = []
+        for version in versions:
+            for rule, matcher in matchers:
+                match, result = matcher(version)
+                if match:
+                    rule.apply_action(version, result, bulk_actions=bulk_actions)
+                    matches.append((rule, version))
+
+        bulk_actions.save()
+        AutomationRuleMatch.objects.register_matches(matches)
 
 
 def normalize_build_command(command, project_slug, version_slug):
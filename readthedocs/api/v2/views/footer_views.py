@@ -5,6 +5,7 @@ from functools import lru_cache
 
 import structlog
 from django.conf import settings
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
 from django.template import loader as template_loader
 from rest_framework.renderers import JSONRenderer
@@ -20,12 +21,16 @@ from readthedocs.core.utils.extend import SettingsOverrideObject
 from readthedocs.projects.constants import MKDOCS, SPHINX_HTMLDIR
 from readthedocs.projects.models import Project
 from readthedocs.projects.version_handling import (
+    get_highest_version_cache_key,
     highest_version,
     parse_version_failsafe,
 )
 
 log = structlog.get_logger(__name__)
 
+# Cached when the project doesn't have a highest version.
+NO_HIGHEST_VERSION = "no-highest-version"
+
 
 def get_version_compare_data(project, base_version=None, user=None):
     """
@@ -40,19 +45,8 @@ def get_version_compare_data(project, base_version=None, user=None):
     ):
         return {'is_highest': False}
 
-    versions_qs = Version.internal.public(project=project, user=user).filter(
-        built=True, active=True
-    )
-
-    # Take preferences over tags only if the project has at least one tag
-    if versions_qs.filter(type=TAG).exists():
-        versions_qs = versions_qs.filter(type=TAG)
-
-    # Optimization
-    versions_qs = versions_qs.select_related('project')
-
-    highest_version_obj, highest_version_comparable = highest_version(
-        versions_qs,
+    highest_version_obj, highest_version_comparable = _get_highest_version(
+        project, user
     )
     ret_val = {
         'project': str(highest_version_obj),
@@ -82,6 +76,62 @@ def get_version_compare_data(project, base_version=None, user=None):
     return ret_val
 
 
+def _get_highest_version(project, user=None):
+    """
+    Get the highest public built version of the project.
+
+    The result for anonymous users is cached (we only store the pk of the version),
+    it's invalidated when a version of the project changes.
+    The cached version is still checked to be public, active and built.
+
+    :returns: a tuple of the version and its comparable version,
+     or ``(None, None)`` if the project doesn't have a version with a version number.
+    """
+    versions_qs = Version.internal.public(project=project, user=user).filter(
+        built=True, active=True
+    )
+
+    use_cache = not user or not user.is_authenticated
+    cache_key = get_highest_version_cache_key(project.pk)
+    if use_cache:
+        cached = cache.get(cache_key)
+        if cached == NO_HIGHEST_VERSION:
+            return None, None
+        if cached is not None:
+            version_pk, comparable = cached
+            version = (
+                versions_qs.filter(pk=version_pk).select_related("project").first()
+            )
+            # Tags are preferred,
+            # a branch is only valid if the project doesn't have tags.
+            if version and (
+                version.type == TAG or not versions_qs.filter(type=TAG).exists()
+            ):
+                return version, parse_version_failsafe(comparable)
+
+    # Take preferences over tags only if the project has at least one tag
+    if versions_qs.filter(type=TAG).exists():
+        versions_qs = versions_qs.filter(type=TAG)
+
+    # Optimization
+    versions_qs = versions_qs.select_related('project')
+
+    highest_version_obj, highest_version_comparable = highest_version(
+        versions_qs,
+    )
+    if use_cache:
+        if highest_version_obj:
+            cached = (highest_version_obj.pk, str(highest_version_comparable))
+        else:
+            cached = NO_HIGHEST_VERSION
+        cache.set(
+            cache_key,
+            cached,
+            timeout=settings.RTD_HIGHEST_VERSION_CACHE_TIMEOUT,
+        )
+    return highest_version_obj, highest_version_comparable
+
+
 class BaseFooterHTML(CDNCacheTagsMixin, APIView):
 
     """
@@ -359,6 +359,63 @@ class BuildCommandViewSet(DisableListEndpoint, CreateModelMixin, UserSelectViewS
 
         return super().perform_create(serializer)
 
+    @decorators.action(
+        detail=False,
+        permission_classes=[HasBuildAPIKey],
+        methods=["post"],
+    )
+    def bulk(self, request, **kwargs):
+        """
+        Create or update several build commands in one request.
+
+        The body of the request is a list of commands.
+        Commands that were already created (like the ones saved while running,
+        or sent again after a retry) are updated.
+        """
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        commands = serializer.validated_data
+
+        builds_pk = {command["build"].pk for command in commands}
+        build_api_key = request.build_api_key
+        if (
+            build_api_key.project.builds.filter(pk__in=builds_pk).count()
+            != len(builds_pk)
+        ):
+            raise PermissionDenied()
+
+        # The last version of each command in the request wins.
+        commands = {
+            (command["build"].pk, command["start_time"]): command
+            for command in commands
+        }
+        existing = {
+            (build_id, start_time): pk
+            for build_id, start_time, pk in BuildCommandResult.objects.filter(
+                build__in=builds_pk,
+                start_time__in=[start_time for _, start_time in commands],
+            ).values_list("build_id", "start_time", "pk")
+        }
+        commands_to_create = []
+        commands_to_update = []
+        for key, command in commands.items():
+            if key in existing:
+                commands_to_update.append(
+                    BuildCommandResult(pk=existing[key], **command)
+                )
+            else:
+                commands_to_create.append(BuildCommandResult(**command))
+
+        BuildCommandResult.objects.bulk_create(commands_to_create)
+        BuildCommandResult.objects.bulk_update(
+            commands_to_update,
+            fields=["command", "description", "output", "exit_code", "end_time"],
+        )
+        return Response(
+            {"created": len(commands_to_create), "updated": len(commands_to_update)},
+            status=status.HTTP_201_CREATED,
+        )
+
     def get_queryset_for_api_key(self, api_key):
         return self.model.objects.filter(build__project=api_key.project)
 
@@ -78,3 +78,80 @@ def delete_version(version, match_result, action_arg, *args, **kwargs):
         )
         return
     version.delete()
+
+
+class BulkActions:
+
+    """
+    Apply the actions to several versions, saving the changes in bulk.
+
+    The functions from this module save the version (and trigger a build)
+    each time an action is applied. When running all the rules over the
+    versions added in a sync, the changes are applied to the version objects,
+    and saved once at the end with :py:meth:`save`.
+
+    There is a method for each action, with the same name and arguments.
+    """
+
+    fields = ["active", "hidden", "privacy_level"]
+
+    def __init__(self, project):
+        self.project = project
+        self.versions = {}
+        self.default_version = None
+
+    def activate_version(self, version, match_result, action_arg, *args, **kwargs):
+        version.active = True
+        self.versions[version.pk] = version
+
+    def set_default_version(self, version, match_result, action_arg, *args, **kwargs):
+        self.activate_version(version, match_result, action_arg)
+        self.default_version = version.slug
+
+    def hide_version(self, version, match_result, action_arg, *args, **kwargs):
+        version.hidden = True
+        self.versions[version.pk] = version
+
+        if not version.active:
+            self.activate_version(version, match_result, action_arg)
+
+    def set_public_privacy_level(
+        self, version, match_result, action_arg, *args, **kwargs
+    ):
+        version.privacy_level = PUBLIC
+        self.versions[version.pk] = version
+
+    def set_private_privacy_level(
+        self, version, match_result, action_arg, *args, **kwargs
+    ):
+        version.privacy_level = PRIVATE
+        self.versions[version.pk] = version
+
+    def delete_version(self, version, match_result, action_arg, *args, **kwargs):
+        # Versions are deleted one by one, to clean their resources.
+        delete_version(version, match_result, action_arg)
+
+    def save(self):
+        """Save all the changed versions, and trigger a build for the activated ones."""
+        # Avoid circular import.
+        from readthedocs.builds.models import Version
+        from readthedocs.projects.version_handling import invalidate_highest_version
+        from readthedocs.proxito.sitemap import invalidate_sitemap
+
+        versions = list(self.versions.values())
+        if versions:
+            Version.objects.bulk_update(versions, self.fields)
+            # ``bulk_update`` doesn't send the ``post_save`` signal.
+            invalidate_sitemap(self.project.pk, self.project.main_language_project_id)
+            invalidate_highest_version(self.project.pk)
+
+        for version in versions:
+            if version.active and not version.built:
+                trigger_build(project=version.project, version=version)
+
+        if self.default_version is not None:
+            self.project.default_version = self.default_version
+            self.project.save()
+
+        self.versions = {}
+        self.default_version = None
@@ -148,3 +148,31 @@ class AutomationRuleMatchManager(models.Manager):
         for match in self.filter(rule__project=rule.project)[max_registers:]:
             match.delete()
         return created
+
+    def register_matches(self, matches, max_registers=15):
+        """
+        Register several matches at once.
+
+        :param matches: A list of ``(rule, version)`` tuples, all from the same project.
+        """
+        if not matches:
+            return []
+
+        created = self.bulk_create(
+            [
+                self.model(
+                    rule=rule,
+                    match_arg=rule.get_match_arg(),
+                    action=rule.action,
+                    version_name=version.verbose_name,
+                    version_type=version.type,
+                )
+                # Only the last ``max_registers`` matches are kept.
+                for rule, version in matches[-max_registers:]
+            ]
+        )
+
+        project = matches[0][0].project
+        for match in self.filter(rule__project=project)[max_registers:]:
+            match.delete()
+        return created
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.10 on 2026-10-18 20:05
+
+from django.db import migrations, models
+from django_safemigrate import Safe
+
+
+class Migration(migrations.Migration):
+    safe = Safe.before_deploy
+
+    dependencies = [
+        ("builds", "0058_alter_version_created_alter_version_modified"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="buildcommandresult",
+            name="end_time",
+            field=models.DateTimeField(blank=True, null=True, verbose_name="End time"),
+        ),
+        migrations.AlterField(
+            model_name="buildcommandresult",
+            name="exit_code",
+            field=models.IntegerField(
+                blank=True, null=True, verbose_name="Command exit code"
+            ),
+        ),
+    ]
@@ -1147,10 +1147,11 @@ class BuildCommandResult(BuildCommandResultMixin, models.Model):
     command = models.TextField(_('Command'))
     description = models.TextField(_('Description'), blank=True)
     output = models.TextField(_('Command output'), blank=True)
-    exit_code = models.IntegerField(_('Command exit code'))
+    # The exit code and end time are ``None`` while the command is running.
+    exit_code = models.IntegerField(_('Command exit code'), null=True, blank=True)
 
     start_time = models.DateTimeField(_('Start time'))
-    end_time = models.DateTimeField(_('End time'))
+    end_time = models.DateTimeField(_('End time'), null=True, blank=True)
 
     class Meta:
         ordering = ['start_time']
@@ -1292,12 +1293,32 @@ class VersionAutomationRule(PolymorphicModel, TimeStampedModel):
         """
         return False, None
 
-    def apply_action(self, version, match_result):
+    def get_matcher(self):
+        """
+        Return a function to match several versions against this rule.
+
+        The function receives a version and returns the same as `match`,
+        including the check of the version type.
+        Subclasses can override it to prepare the match argument only once.
+        """
+        match_arg = self.get_match_arg()
+
+        def matcher(version):
+            if version.type != self.version_type:
+                return False, None
+            return self.match(version, match_arg)
+
+        return matcher
+
+    def apply_action(self, version, match_result, bulk_actions=None):
         """
         Apply the action from allowed_actions_on_*.
 
         :type version: readthedocs.builds.models.Version
         :param any match_result: Additional context from the match operation
+        :param bulk_actions: A
+         :py:class:`readthedocs.builds.automation_actions.BulkActions` instance
+         to defer saving the changes, instead of saving them right away.
         :raises: NotImplementedError if the action
                  isn't implemented or supported for this rule.
         """
@@ -1307,6 +1328,9 @@ class VersionAutomationRule(PolymorphicModel, TimeStampedModel):
         )
         if action is None:
             raise NotImplementedError
+        if bulk_actions is not None:
+            # BulkActions has a method with the same name for each action.
+            action = getattr(bulk_actions, action.__name__)
         action(version, match_result, self.action_arg)
 
     def move(self, steps):
@@ -1387,18 +1411,40 @@ class RegexAutomationRule(VersionAutomationRule):
            but there isn't a stable library at the time of writing this code.
         """
         try:
-            match = regex.search(
-                match_arg,
-                version.verbose_name,
-                # Compatible with the re module
-                flags=regex.VERSION0,
-                timeout=self.TIMEOUT,
-            )
+            pattern = self._compile(match_arg)
+        except Exception:
+            log.exception('Error parsing regex.', exc_info=True)
+            return False, None
+        return self._search(pattern, version)
+
+    def get_matcher(self):
+        """Return a function to match versions, the regex is compiled only once."""
+        try:
+            pattern = self._compile(self.get_match_arg())
+        except Exception:
+            log.exception("Error parsing regex.", exc_info=True)
+            return lambda version: (False, None)
+
+        def matcher(version):
+            if version.type != self.version_type:
+                return False, None
+            return self._search(pattern, version)
+
+        return matcher
+
+    @staticmethod
+    def _compile(match_arg):
+        # Compatible with the re module
+        return regex.compile(match_arg, flags=regex.VERSION0)
+
+    def _search(self, pattern, version):
+        try:
+            match = pattern.search(version.verbose_name, timeout=self.TIMEOUT)
             return bool(match), match
         except TimeoutError:
             log.warning(
                 'Timeout while parsing regex.',
-                pattern=match_arg,
+                pattern=pattern.pattern,
                 version_slug=version.slug,
             )
         except Exception:
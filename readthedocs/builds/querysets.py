@@ -221,39 +221,34 @@ class BuildQuerySet(models.QuerySet):
         :returns: limit_reached, number of concurrent builds, number of max concurrent
         """
         limit_reached = False
-        query = Q(
-            project=project,
-        )
+        projects = Q(pk=project.pk)
+        # The project has translations, counts their builds as well
+        projects |= Q(main_language_project=project.pk)
 
-        if project.main_language_project:
+        if project.main_language_project_id:
             # Project is a translation, counts all builds of all the translations
-            query |= Q(project__main_language_project=project.main_language_project)
-            query |= Q(project__slug=project.main_language_project.slug)
-
-        elif project.translations.exists():
-            # The project has translations, counts their builds as well
-            query |= Q(project__in=project.translations.all())
+            projects |= Q(pk=project.main_language_project_id)
+            projects |= Q(main_language_project=project.main_language_project_id)
 
         # If the project belongs to an organization, count all the projects
         # from this organization as well
-        organization = project.organizations.first()
-        if organization:
-            query |= Q(project__in=organization.projects.all())
+        projects |= Q(organizations__projects=project.pk)
 
+        # Filter by a subquery of the projects instead of joining them,
+        # so builds aren't duplicated and we don't need a ``DISTINCT``.
         # Limit builds to 5 hours ago to speed up the query
-        query &= Q(date__gt=timezone.now() - datetime.timedelta(hours=5))
-
         concurrent = (
-            (
-                self.filter(query).exclude(
-                    state__in=[
-                        BUILD_STATE_TRIGGERED,
-                        BUILD_STATE_FINISHED,
-                        BUILD_STATE_CANCELLED,
-                    ]
-                )
+            self.filter(
+                project__in=Project.objects.filter(projects).values("pk"),
+                date__gt=timezone.now() - datetime.timedelta(hours=5),
+            )
+            .exclude(
+                state__in=[
+                    BUILD_STATE_TRIGGERED,
+                    BUILD_STATE_FINISHED,
+                    BUILD_STATE_CANCELLED,
+                ]
             )
-            .distinct()
             .count()
         )
 
@@ -90,6 +90,10 @@ function BuildDetailView(instance) {
                 );
                 if (!match) {
                     self.commands.push(command);
+                } else if (match.output !== command.output ||
+                           match.exit_code !== command.exit_code) {
+                    // The output of running commands is saved while they run.
+                    self.commands.replace(match, command);
                 }
             }
         });
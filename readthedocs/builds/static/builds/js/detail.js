@@ -1 +1 @@
-require=function r(s,n,u){function i(t,e){if(!n[t]){if(!s[t]){var o="function"==typeof require&&require;if(!e&&o)return o(t,!0);if(a)return a(t,!0);throw(e=new Error("Cannot find module '"+t+"'")).code="MODULE_NOT_FOUND",e}o=n[t]={exports:{}},s[t][0].call(o.exports,function(e){return i(s[t][1][e]||e)},o,o.exports,r,s,n,u)}return n[t].exports}for(var a="function"==typeof require&&require,e=0;e<u.length;e++)i(u[e]);return i}({"builds/detail":[function(e,t,o){var n=e("knockout"),u=e("jquery");function i(e){var t=this;t.id=n.observable(e.id),t.command=n.observable(e.command),t.output=n.observable(e.output),t.exit_code=n.observable(e.exit_code||0),t.successful=n.observable(0===t.exit_code()),t.run_time=n.observable(e.run_time),t.is_showing=n.observable(!t.successful()),t.toggleCommand=function(){t.is_showing(!t.is_showing())},t.command_status=n.computed(function(){return t.successful()?"build-command-successful":"build-command-failed"})}function r(t){var s=this,t=t||{},r=0;s.state=n.observable(t.state),s.state_display=n.observable(t.state_display),s.cancelled=n.computed(function(){return"cancelled"===s.state()}),s.finished=n.computed(function(){return"finished"===s.state()||"cancelled"===s.state()}),s.date=n.observable(t.date),s.success=n.observable(t.success),s.error=n.observable(t.error),s.length=n.observable(t.length),s.commands=n.observableArray(t.commands),s.display_commands=n.computed(function(){var e,t=[],o=s.commands();for(e in o){var r=new i(o[e]);t.push(r)}return t}),s.commit=n.observable(t.commit),s.docs_url=n.observable(t.docs_url),s.commit_url=n.observable(t.commit_url),s.legacy_output=n.observable(!1),s.show_legacy_output=function(){s.legacy_output(!0)},function e(){u.getJSON("/api/v2/build/"+t.id+"/",function(e){for(var t in s.state(e.state),s.state_display(e.state_display),s.date(e.date),s.success(e.success),s.error(e.error),s.length(e.length),s.commit(e.commit),s.docs_url(e.docs_url),s.commit_url(e.commit_url),r+=1,e.commands){var o=e.commands[t];n.utils.arrayFirst(s.commands(),function(e){return e.id===o.id})||s.commands.push(o)}}),s.finished()?1!==r&&location.reload():setTimeout(e,2e3)}()}r.init=function(e,t){e=new r(e),t=t||u("#build-detail")[0];return n.applyBindings(e,t),e},t.exports.BuildDetailView=r},{jquery:"jquery",knockout:"knockout"}]},{},[]);
\ No newline at end of file
+require=function r(s,n,u){function i(t,e){if(!n[t]){if(!s[t]){var o="function"==typeof require&&require;if(!e&&o)return o(t,!0);if(a)return a(t,!0);throw(e=new Error("Cannot find module '"+t+"'")).code="MODULE_NOT_FOUND",e}o=n[t]={exports:{}},s[t][0].call(o.exports,function(e){return i(s[t][1][e]||e)},o,o.exports,r,s,n,u)}return n[t].exports}for(var a="function"==typeof require&&require,e=0;e<u.length;e++)i(u[e]);return i}({"builds/detail":[function(e,t,o){var n=e("knockout"),u=e("jquery");function i(e){var t=this;t.id=n.observable(e.id),t.command=n.observable(e.command),t.output=n.observable(e.output),t.exit_code=n.observable(e.exit_code||0),t.successful=n.observable(0===t.exit_code()),t.run_time=n.observable(e.run_time),t.is_showing=n.observable(!t.successful()),t.toggleCommand=function(){t.is_showing(!t.is_showing())},t.command_status=n.computed(function(){return t.successful()?"build-command-successful":"build-command-failed"})}function r(t){var s=this,t=t||{},r=0;s.state=n.observable(t.state),s.state_display=n.observable(t.state_display),s.cancelled=n.computed(function(){return"cancelled"===s.state()}),s.finished=n.computed(function(){return"finished"===s.state()||"cancelled"===s.state()}),s.date=n.observable(t.date),s.success=n.observable(t.success),s.error=n.observable(t.error),s.length=n.observable(t.length),s.commands=n.observableArray(t.commands),s.display_commands=n.computed(function(){var e,t=[],o=s.commands();for(e in o){var r=new i(o[e]);t.push(r)}return t}),s.commit=n.observable(t.commit),s.docs_url=n.observable(t.docs_url),s.commit_url=n.observable(t.commit_url),s.legacy_output=n.observable(!1),s.show_legacy_output=function(){s.legacy_output(!0)},function e(){u.getJSON("/api/v2/build/"+t.id+"/",function(e){for(var t in s.state(e.state),s.state_display(e.state_display),s.date(e.date),s.success(e.success),s.error(e.error),s.length(e.length),s.commit(e.commit),s.docs_url(e.docs_url),s.commit_url(e.commit_url),r+=1,e.commands){var o=e.commands[t];var a=n.utils.arrayFirst(s.commands(),function(e){return e.id===o.id});a?a.output===o.output&&a.exit_code===o.exit_code||s.commands.replace(a,o):s.commands.push(o)}}),s.finished()?1!==r&&location.reload():setTimeout(e,2e3)}()}r.init=function(e,t){e=new r(e),t=t||u("#build-detail")[0];return n.applyBindings(e,t),e},t.exports.BuildDetailView=r},{jquery:"jquery",knockout:"knockout"}]},{},[]);
\ No newline at end of file
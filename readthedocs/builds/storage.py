@@ -1,3 +1,9 @@
+import hashlib
+import json
+import os
+import posixpath
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property
 from pathlib import Path
 
@@ -7,6 +13,7 @@ from django.contrib.staticfiles.storage import (
     StaticFilesStorage as BaseStaticFilesStorage,
 )
 from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
 from django.core.files.storage import FileSystemStorage
 from storages.utils import get_available_overwrite_name
 
@@ -27,6 +34,10 @@ class BuildMediaStorageMixin:
     of finding an available name.
     This mixin also adds convenience methods to copy and delete entire directories.
 
+    Directories synced with ``rclone_sync_directory`` have a manifest
+    with all their files, so they can be walked and deleted
+    without listing each directory from the storage.
+
     See: https://docs.djangoproject.com/en/1.11/ref/files/storage
     """
 
@@ -34,6 +45,14 @@ class BuildMediaStorageMixin:
     # that will serve files from this storage.
     internal_redirect_root_path = "proxito"
 
+    # Manifests are stored outside the directories they describe,
+    # so they aren't served, synced or deleted together with the files.
+    manifest_root_path = "manifests"
+    manifest_version = 1
+
+    # Maximum number of files to delete in a single request.
+    delete_files_batch_size = 1000
+
     @staticmethod
     def _dirpath(path):
         """
@@ -72,21 +91,65 @@ class BuildMediaStorageMixin:
             raise SuspiciousFileOperation('Deleting all storage cannot be right')
 
         log.debug('Deleting path from media storage', path=path)
+        manifest = self.get_manifest(path)
+        if manifest is not None:
+            self.delete_files(self.join(path, entry[0]) for entry in manifest)
+            self.delete(self._get_manifest_path(path))
+            return
+
+        self.delete_files(
+            self.join(path, filepath) for filepath in self._list_files(path)
+        )
+        # The directory may contain other directories with their own manifest
+        # (e.g. when deleting all versions of a project).
+        manifests_path = self._get_manifest_path(path).removesuffix(".json")
+        self.delete_files(
+            self.join(manifests_path, filepath)
+            for filepath in self._list_files(manifests_path)
+        )
+        self.delete(self._get_manifest_path(path))
+
+    def delete_files(self, paths):
+        """
+        Delete all the given files from storage.
+
+        Backends that support deleting several files in a single request
+        should override this method to delete them in batches
+        of up to ``delete_files_batch_size`` files.
+
+        :param paths: iterable of paths to the files to delete
+        """
+        for path in paths:
+            self.delete(path)
+
+    def _list_files(self, path):
+        """
+        List all files under `path` recursively.
+
+        :returns: an iterator of paths relative to `path`
+        """
         folders, files = self.listdir(self._dirpath(path))
-        for folder_name in folders:
-            if folder_name:
-                # Recursively delete the subdirectory
-                self.delete_directory(self.join(path, folder_name))
         for filename in files:
             if filename:
-                self.delete(self.join(path, filename))
+                yield filename
+        for folder_name in folders:
+            if folder_name:
+                for filepath in self._list_files(self.join(path, folder_name)):
+                    yield posixpath.join(folder_name, filepath)
 
     def copy_directory(self, source, destination):
         """
         Copy a directory recursively to storage.
 
+        Files are uploaded concurrently (``RTD_BUILD_MEDIA_COPY_WORKERS``),
+        and each upload is retried up to ``RTD_BUILD_MEDIA_COPY_RETRIES`` times.
+        Files that already exist in storage with the same size and hash are skipped,
+        like ``rclone sync --checksum`` does.
+
         :param source: the source path on the local disk
         :param destination: the destination path in storage
+        :returns: a dictionary with the number of files and bytes transferred,
+         and the number of files skipped.
         """
         log.debug(
             'Copying source directory to media storage',
@@ -95,6 +158,41 @@ class BuildMediaStorageMixin:
         )
         source = Path(source)
         self._check_suspicious_path(source)
+
+        start = time.monotonic()
+        stats = {
+            "files": 0,
+            "bytes": 0,
+            "skipped_files": 0,
+        }
+        with ThreadPoolExecutor(
+            max_workers=settings.RTD_BUILD_MEDIA_COPY_WORKERS
+        ) as executor:
+            futures = [
+                executor.submit(self._copy_file, filepath, sub_destination)
+                for filepath, sub_destination in self._iter_files_to_copy(
+                    source, destination
+                )
+            ]
+            for future in futures:
+                copied, size = future.result()
+                if copied:
+                    stats["files"] += 1
+                    stats["bytes"] += size
+                else:
+                    stats["skipped_files"] += 1
+
+        log.info(
+            "Directory copied to media storage.",
+            source=str(source),
+            destination=destination,
+            seconds=round(time.monotonic() - start, 2),
+            **stats,
+        )
+        return stats
+
+    def _iter_files_to_copy(self, source, destination):
+        """Yield tuples of (path on disk, path in storage) of all files to copy."""
         for filepath in source.iterdir():
             sub_destination = self.join(destination, filepath.name)
 
@@ -108,10 +206,66 @@ class BuildMediaStorageMixin:
 
             if filepath.is_dir():
                 # Recursively copy the subdirectory
-                self.copy_directory(filepath, sub_destination)
+                yield from self._iter_files_to_copy(filepath, sub_destination)
             elif filepath.is_file():
+                yield filepath, sub_destination
+
+    def _copy_file(self, filepath, destination):
+        """
+        Upload a file to storage, unless it's already there.
+
+        :returns: a tuple of (copied, size), where ``copied``
+         is ``False`` if the file was skipped.
+        """
+        size = filepath.stat().st_size
+        stored_checksum = self.get_checksum(destination)
+        if stored_checksum is not None:
+            stored_size, stored_hash = stored_checksum
+            # Like rclone, we compare only the size if the storage doesn't have a hash.
+            if stored_size == size and stored_hash in (
+                None,
+                self._get_file_hash(filepath),
+            ):
+                return False, size
+
+        retries = settings.RTD_BUILD_MEDIA_COPY_RETRIES
+        for attempt in range(retries + 1):
+            try:
                 with safe_open(filepath, "rb") as fd:
-                    self.save(sub_destination, fd)
+                    self.save(destination, fd)
+                break
+            except Exception:
+                if attempt >= retries:
+                    raise
+                log.warning(
+                    "Error uploading file to media storage, retrying.",
+                    destination=destination,
+                    attempt=attempt + 1,
+                    exc_info=True,
+                )
+                time.sleep(2**attempt)
+        return True, size
+
+    def get_checksum(self, path):
+        """
+        Get the size and MD5 hash of a file from storage.
+
+        Backends that can get the hash of a file without downloading it
+        should override this method.
+
+        :returns: a tuple of (size, hash), where ``hash`` can be ``None``
+         if it isn't available, or ``None`` if the file doesn't exist.
+        """
+        try:
+            with self.open(path) as fd:
+                size = 0
+                file_hash = hashlib.md5(usedforsecurity=False)
+                for chunk in iter(lambda: fd.read(1024 * 1024), b""):
+                    size += len(chunk)
+                    file_hash.update(chunk)
+        except FileNotFoundError:
+            return None
+        return size, file_hash.hexdigest()
 
     def _check_suspicious_path(self, path):
         """Check that the given path isn't a symlink or outside the doc root."""
@@ -133,12 +287,134 @@ class BuildMediaStorageMixin:
         raise NotImplementedError
 
     def rclone_sync_directory(self, source, destination):
-        """Sync a directory recursively to storage using rclone sync."""
+        """
+        Sync a directory recursively to storage using rclone sync.
+
+        :returns: a dictionary with the number of ``files`` and ``bytes``
+         of the synced directory, taken from its manifest.
+        """
         if destination in ("", "/"):
             raise SuspiciousFileOperation("Syncing all storage cannot be right")
 
         self._check_suspicious_path(source)
-        return self._rclone.sync(source, destination)
+        # Remove the manifest before syncing the files,
+        # so we never read an outdated manifest if the sync fails.
+        self.delete(self._get_manifest_path(destination))
+        # Files are hashed while rclone uploads them,
+        # instead of reading all files again after the sync.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            manifest = executor.submit(self.create_manifest, source)
+            self._rclone.sync(source, destination)
+            manifest = manifest.result()
+        self.save_manifest(source, destination, manifest=manifest)
+        return {
+            "files": len(manifest),
+            "bytes": sum(size for _, size, _, _ in manifest),
+        }
+
+    def _get_manifest_path(self, path):
+        return self.join(self.manifest_root_path, str(path).strip("/") + ".json")
+
+    @staticmethod
+    def _get_file_hash(path):
+        """Get the MD5 hash of a file, the same hash used by rclone and S3."""
+        file_hash = hashlib.md5(usedforsecurity=False)
+        with safe_open(path, "rb") as fd:
+            for chunk in iter(lambda: fd.read(1024 * 1024), b""):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
+    def create_manifest(self, source):
+        """
+        Create a manifest of all files from the `source` directory.
+
+        Symlinks are skipped, the same as when syncing the directory.
+
+        :param source: the source path on the local disk
+        :returns: a list of ``[path, size, hash, mtime]`` entries,
+         where ``path`` is relative to ``source``.
+        """
+        manifest = []
+        for root, dirs, files in os.walk(source):
+            # Don't follow symlinks to directories.
+            dirs[:] = [
+                dirname
+                for dirname in dirs
+                if not os.path.islink(os.path.join(root, dirname))
+            ]
+            for filename in files:
+                filepath = os.path.join(root, filename)
+                if os.path.islink(filepath):
+                    continue
+                stat = os.stat(filepath)
+                manifest.append(
+                    [
+                        Path(os.path.relpath(filepath, source)).as_posix(),
+                        stat.st_size,
+                        self._get_file_hash(filepath),
+                        int(stat.st_mtime),
+                    ]
+                )
+        manifest.sort()
+        return manifest
+
+    def save_manifest(self, source, destination, manifest=None):
+        """
+        Save the manifest of the `source` directory for `destination`.
+
+        :param source: the source path on the local disk
+        :param destination: the destination path in storage
+        :param manifest: the manifest of `source` if it was already created
+        :returns: the saved manifest
+        """
+        if manifest is None:
+            manifest = self.create_manifest(source)
+        content = json.dumps(
+            {"version": self.manifest_version, "files": manifest},
+            separators=(",", ":"),
+        )
+        self.save(self._get_manifest_path(destination), ContentFile(content.encode()))
+        log.debug(
+            "Manifest saved to media storage.",
+            destination=destination,
+            files=len(manifest),
+        )
+        return manifest
+
+    def get_manifest(self, path):
+        """
+        Get the manifest of the directory at `path`.
+
+        :returns: a list of ``[path, size, hash, mtime]`` entries,
+         or ``None`` if the directory doesn't have a manifest.
+        """
+        try:
+            with self.open(self._get_manifest_path(path)) as fd:
+                data = json.load(fd)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            log.warning("Invalid manifest in media storage.", path=path)
+            return None
+
+        if data.get("version") != self.manifest_version:
+            return None
+        return data["files"]
+
+    def get_manifest_hash(self, path):
+        """
+        Get the MD5 hash of the manifest of the directory at `path`.
+
+        The manifest is saved again each time the directory is synced,
+        the hash can be used to know if it changed without downloading it.
+
+        :returns: the hash of the manifest, or ``None`` if the directory
+         doesn't have a manifest or its hash isn't available.
+        """
+        checksum = self.get_checksum(self._get_manifest_path(path))
+        if checksum is None:
+            return None
+        return checksum[1]
 
     def join(self, directory, filepath):
         return safe_join(directory, filepath)
@@ -148,14 +424,34 @@ class BuildMediaStorageMixin:
             raise SuspiciousFileOperation('Iterating all storage cannot be right')
 
         log.debug('Walking path in media storage', path=top)
-        folders, files = self.listdir(self._dirpath(top))
-
-        yield top, folders, files
-
-        for folder_name in folders:
-            if folder_name:
-                # Recursively walk the subdirectory
-                yield from self.walk(self.join(top, folder_name))
+        manifest = self.get_manifest(top)
+        if manifest is not None:
+            paths = [entry[0] for entry in manifest]
+        else:
+            paths = self._list_files(top)
+
+        # Build the tree of directories from the list of files,
+        # each directory is mapped to a tuple of (folders, files).
+        tree = {"": ([], [])}
+        for filepath in paths:
+            *parents, filename = filepath.split("/")
+            current = ""
+            for folder_name in parents:
+                parent, current = current, posixpath.join(current, folder_name)
+                if current not in tree:
+                    tree[current] = ([], [])
+                    tree[parent][0].append(folder_name)
+            tree[current][1].append(filename)
+
+        pending = [""]
+        while pending:
+            current = pending.pop()
+            folders, files = tree[current]
+            yield self.join(top, current) if current else top, folders, files
+            pending.extend(
+                posixpath.join(current, folder_name)
+                for folder_name in reversed(folders)
+            )
 
 
 class BuildMediaFileSystemStorage(BuildMediaStorageMixin, FileSystemStorage):
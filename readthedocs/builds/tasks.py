@@ -13,7 +13,6 @@ from readthedocs import __version__
 from readthedocs.api.v2.serializers import BuildCommandSerializer
 from readthedocs.api.v2.utils import (
     delete_versions_from_db,
-    get_deleted_active_versions,
     run_automation_rules,
     sync_versions_to_db,
 )
@@ -332,12 +331,7 @@ def sync_versions_task(project_pk, tags_data, branches_data, **kwargs):
         )
         added_versions.update(result)
 
-        delete_versions_from_db(
-            project=project,
-            tags_data=tags_data,
-            branches_data=branches_data,
-        )
-        deleted_active_versions = get_deleted_active_versions(
+        deleted_active_versions = delete_versions_from_db(
             project=project,
             tags_data=tags_data,
             branches_data=branches_data,
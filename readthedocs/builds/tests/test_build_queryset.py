@@ -163,3 +163,34 @@ class TestBuildQuerySet:
             )
         assert (True, 2, 2) == Build.objects.concurrent(project_limited)
         assert (False, 2, 10) == Build.objects.concurrent(project_not_limited)
+
+    def test_concurrent_builds_organization_and_translations(self):
+        organization = fixture.get(
+            Organization,
+            max_concurrent_builds=None,
+        )
+        project = fixture.get(
+            Project,
+            max_concurrent_builds=None,
+            main_language_project=None,
+        )
+        translation = fixture.get(
+            Project,
+            max_concurrent_builds=None,
+            main_language_project=project,
+        )
+        another_project = fixture.get(
+            Project,
+            max_concurrent_builds=None,
+            main_language_project=None,
+        )
+        organization.projects.add(project, translation, another_project)
+        for build_project in (project, translation, another_project):
+            fixture.get(
+                Build,
+                project=build_project,
+                state="building",
+            )
+        # Builds from projects matching more than one criteria are counted once
+        assert (False, 3, 4) == Build.objects.concurrent(project)
+        assert (False, 3, 4) == Build.objects.concurrent(translation)
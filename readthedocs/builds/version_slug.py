@@ -151,46 +151,33 @@ class VersionSlugField(models.CharField):
             current = current % length**exp
         return "_{suffix}".format(suffix=suffix)
 
-    def create_slug(self, model_instance):
-        """Generate a unique slug for a model instance."""
-
-        # get fields to populate from and slug field to set
-        slug_field = model_instance._meta.get_field(self.attname)
-
-        slug = self.slugify(getattr(model_instance, self._populate_from))
-        count = 0
-
-        # strip slug depending on max_length attribute of the slug field
-        # and clean-up
+    def _get_original_slug(self, content, slug_field):
+        """Slugify ``content`` and strip it depending on the max_length of the slug field."""
+        slug = self.slugify(content)
         slug_len = slug_field.max_length
         if slug_len:
             slug = slug[:slug_len]
-        original_slug = slug
+        return slug
 
-        # exclude the current model instance from the queryset used in finding
-        # the next valid slug
-        queryset = self.get_queryset(model_instance.__class__, slug_field)
-        if model_instance.pk:
-            queryset = queryset.exclude(pk=model_instance.pk)
+    def _make_unique(self, original_slug, slug_field, is_taken):
+        """
+        Append a suffix to ``original_slug`` until it's unique.
 
-        # form a kwarg dict used to implement any unique_together constraints
-        kwargs = {}
-        for params in model_instance._meta.unique_together:
-            if self.attname in params:
-                for param in params:
-                    kwargs[param] = getattr(model_instance, param, None)
-        kwargs[self.attname] = slug
+        :param is_taken: callable that returns `True` if the given slug is already used.
+        """
+        slug = original_slug
+        slug_len = slug_field.max_length
+        count = 0
 
         # increases the number while searching for the next valid slug
         # depending on the given slug, clean-up
-        while not slug or queryset.filter(**kwargs).exists():
+        while not slug or is_taken(slug):
             slug = original_slug
             end = self.uniquifying_suffix(count)
             end_len = len(end)
             if slug_len and len(slug) + end_len > slug_len:
                 slug = slug[: slug_len - end_len]
             slug = slug + end
-            kwargs[self.attname] = slug
             count += 1
 
         is_slug_valid = self.test_pattern.match(slug)
@@ -199,6 +186,58 @@ class VersionSlugField(models.CharField):
             raise Exception("Invalid generated slug: {slug}".format(slug=slug))
         return slug
 
+    def create_slug(self, model_instance):
+        """Generate a unique slug for a model instance."""
+
+        # get fields to populate from and slug field to set
+        slug_field = model_instance._meta.get_field(self.attname)
+        original_slug = self._get_original_slug(
+            getattr(model_instance, self._populate_from), slug_field
+        )
+
+        # exclude the current model instance from the queryset used in finding
+        # the next valid slug
+        queryset = self.get_queryset(model_instance.__class__, slug_field)
+        if model_instance.pk:
+            queryset = queryset.exclude(pk=model_instance.pk)
+
+        # form a kwarg dict used to implement any unique_together constraints
+        kwargs = {}
+        for params in model_instance._meta.unique_together:
+            if self.attname in params:
+                for param in params:
+                    kwargs[param] = getattr(model_instance, param, None)
+
+        def is_taken(slug):
+            kwargs[self.attname] = slug
+            return queryset.filter(**kwargs).exists()
+
+        return self._make_unique(original_slug, slug_field, is_taken)
+
+    def create_slugs(self, model_cls, contents, existing_slugs):
+        """
+        Generate unique slugs for a batch of new instances of ``model_cls``.
+
+        Uniqueness is checked in memory, instead of doing a query per slug.
+
+        :param contents: values of the ``populate_from`` field of each new instance.
+        :param existing_slugs: slugs already in use in the ``unique_together`` group
+         of the new instances (e.g. the slugs of all versions of a project).
+        :returns: a list with the slug of each new instance, in the same order as ``contents``.
+        """
+        slug_field = model_cls._meta.get_field(self.attname)
+        taken = set(existing_slugs)
+        slugs = []
+        for content in contents:
+            slug = self._make_unique(
+                self._get_original_slug(content, slug_field),
+                slug_field,
+                taken.__contains__,
+            )
+            taken.add(slug)
+            slugs.append(force_str(slug))
+        return slugs
+
     def pre_save(self, model_instance, add):
         value = getattr(model_instance, self.attname)
         # We only create a new slug if none was set yet.
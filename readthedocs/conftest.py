@@ -5,6 +5,25 @@ from rest_framework.test import APIClient
 pytest_plugins = ("sphinx.testing.fixtures",)
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run the benchmarks (tests marked with ``benchmark``).",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip the benchmarks unless they are requested with ``--benchmark``."""
+    if config.getoption("--benchmark"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="Run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -31,6 +31,7 @@ class AdminPermissionBase:
         :param bool admin: include projects where the user has admin access to the project
         :param bool member: include projects where the user has read access to the project
         """
+        from readthedocs.organizations.models import Organization, Team
         from readthedocs.projects.models import Project
         from readthedocs.sso.models import SSOIntegration
 
@@ -43,33 +44,51 @@ class AdminPermissionBase:
             # when we aren't using organizations.
             return user.projects.all()
 
+        if not admin and not member:
+            return projects
+
+        # Access isn't granted from teams or owners of organizations
+        # with SSO enabled, check each organization only once.
+        sso_organizations = [
+            organization.pk
+            for organization in Organization.objects.filter(
+                Q(teams__members=user) | Q(owners=user)
+            ).distinct()
+            if cls.has_sso_enabled(organization, SSOIntegration.PROVIDER_ALLAUTH)
+        ]
+
+        # Project Team Admin and Project Team Member.
+        access = []
         if admin:
-            # Project Team Admin
-            admin_teams = user.teams.filter(access=ADMIN_ACCESS)
-            for team in admin_teams:
-                if not cls.has_sso_enabled(
-                    team.organization, SSOIntegration.PROVIDER_ALLAUTH
-                ):
-                    projects |= team.projects.all()
+            access.append(ADMIN_ACCESS)
+        if member:
+            access.append(READ_ONLY_ACCESS)
+        teams = Team.objects.filter(members=user, access__in=access).exclude(
+            organization__in=sso_organizations
+        )
+        # Filter with subqueries, so the SQL doesn't grow
+        # with the number of teams and organizations of the user.
+        projects_filter = Q(
+            pk__in=Team.projects.through.objects.filter(team__in=teams).values(
+                "project_id"
+            )
+        )
 
+        if admin:
             # Org Admin
-            for org in user.owner_organizations.all():
-                if not cls.has_sso_enabled(org, SSOIntegration.PROVIDER_ALLAUTH):
-                    # Do not grant admin access on projects for owners if the
-                    # organization has SSO enabled with Authorization on the provider.
-                    projects |= org.projects.all()
-
+            owner_organizations = user.owner_organizations.exclude(
+                pk__in=sso_organizations
+            )
+            projects_filter |= Q(
+                pk__in=Organization.projects.through.objects.filter(
+                    organization__in=owner_organizations
+                ).values("project_id")
+            )
+
+        projects = Project.objects.filter(projects_filter)
+        if admin:
             projects |= cls._get_projects_for_sso_user(user, admin=True)
-
         if member:
-            # Project Team Member
-            member_teams = user.teams.filter(access=READ_ONLY_ACCESS)
-            for team in member_teams:
-                if not cls.has_sso_enabled(
-                    team.organization, SSOIntegration.PROVIDER_ALLAUTH
-                ):
-                    projects |= team.projects.all()
-
             projects |= cls._get_projects_for_sso_user(user, admin=False)
 
         return projects
@@ -4,15 +4,36 @@ import requests
 import structlog
 from allauth.account.signals import email_confirmed
 from django.conf import settings
-from django.db.models.signals import pre_delete
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import Signal, receiver
 from simple_history.models import HistoricalRecords
 from simple_history.signals import pre_create_historical_record
 
 from readthedocs.analytics.utils import get_client_ip
+from readthedocs.builds.constants import BUILD_FINAL_STATES
+from readthedocs.builds.models import Build, Version
+from readthedocs.builds.signals import build_complete
 from readthedocs.core.models import UserProfile
+from readthedocs.core.unresolver import unresolver_cache
 from readthedocs.organizations.models import Organization
-from readthedocs.projects.models import Project
+from readthedocs.projects.models import (
+    Domain,
+    Feature,
+    Project,
+    invalidate_features_cache,
+)
+from readthedocs.projects.version_handling import invalidate_highest_version
+from readthedocs.proxito.sitemap import (
+    forget_main_language_project,
+    invalidate_sitemap,
+    invalidate_sitemap_of_version,
+)
 
 log = structlog.get_logger(__name__)
 
@@ -106,3 +127,171 @@ def add_extra_historical_fields(sender, **kwargs):
     if request:
         history_instance.extra_history_ip = get_client_ip(request)
         history_instance.extra_history_browser = request.headers.get("User-Agent")
+
+
+@receiver(pre_save, sender=Project)
+def invalidate_unresolver_renamed_project_cache(sender, instance, **kwargs):
+    """Invalidate the unresolver cache for the old slug of a renamed project."""
+    if not instance.pk:
+        return
+    old_slug = (
+        Project.objects.filter(pk=instance.pk).values_list("slug", flat=True).first()
+    )
+    if old_slug and old_slug != instance.slug:
+        unresolver_cache.invalidate_project(old_slug)
+
+
+@receiver(post_save, sender=Project)
+def invalidate_unresolver_project_cache(sender, instance, **kwargs):
+    """
+    Invalidate the unresolver cache (including negative results) for this project.
+
+    Cached domains include their project, so they are invalidated as well.
+    """
+    unresolver_cache.invalidate_project(instance.slug)
+    for domain in instance.domains.values_list("domain", flat=True):
+        unresolver_cache.invalidate_domain(domain)
+
+
+@receiver(post_delete, sender=Project)
+def invalidate_unresolver_deleted_project_cache(sender, instance, **kwargs):
+    """Invalidate the unresolver cache for a deleted project."""
+    # Domains are deleted before the project, invalidating their cache.
+    unresolver_cache.invalidate_project(instance.slug)
+
+
+@receiver(pre_save, sender=Domain)
+def invalidate_unresolver_renamed_domain_cache(sender, instance, **kwargs):
+    """Invalidate the unresolver cache for the old name of a renamed domain."""
+    if not instance.pk:
+        return
+    old_domain = (
+        Domain.objects.filter(pk=instance.pk).values_list("domain", flat=True).first()
+    )
+    if old_domain and old_domain != instance.domain:
+        unresolver_cache.invalidate_domain(old_domain)
+
+
+@receiver(post_save, sender=Domain)
+@receiver(post_delete, sender=Domain)
+def invalidate_unresolver_domain_cache(sender, instance, **kwargs):
+    """Invalidate the unresolver cache (including negative results) for this domain."""
+    unresolver_cache.invalidate_domain(instance.domain)
+
+
+@receiver(build_complete, sender=Build)
+def update_sitemap_on_build_complete(sender, build, **kwargs):
+    """
+    Re-generate the sitemap of the project when a build finishes.
+
+    The `build_complete` signal is fired by the builder,
+    so we trigger a Celery task that has access to the database.
+    """
+    # Avoid circular import.
+    from readthedocs.projects.tasks.utils import update_sitemap
+
+    if build.get("project") and build["state"] in BUILD_FINAL_STATES:
+        update_sitemap.delay(build["project"])
+
+
+@receiver(post_save, sender=Version)
+@receiver(post_delete, sender=Version)
+def invalidate_version_sitemap(sender, instance, **kwargs):
+    """
+    Invalidate the sitemap of the project of this version.
+
+    The project of the version isn't fetched for each version,
+    since many versions are deleted at once when syncing versions or deleting a project.
+    """
+    invalidate_sitemap_of_version(instance)
+
+
+@receiver(post_save, sender=Version)
+@receiver(post_delete, sender=Version)
+def invalidate_project_highest_version(sender, instance, **kwargs):
+    """Invalidate the cached highest version of the project of this version."""
+    invalidate_highest_version(instance.project_id)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_sitemap(sender, instance, **kwargs):
+    """Invalidate the sitemap of the project, and of its main project if it's a translation."""
+    forget_main_language_project(instance.pk)
+    invalidate_sitemap(instance.pk, instance.main_language_project_id)
+
+
+@receiver(post_save, sender=Domain)
+@receiver(post_delete, sender=Domain)
+def invalidate_domain_sitemap(sender, instance, **kwargs):
+    """Invalidate the sitemap of the project and its translations, since they share the domain."""
+    invalidate_sitemap(
+        instance.project_id,
+        *instance.project.translations.values_list("pk", flat=True),
+    )
+
+
+def _applies_to_all_projects(feature):
+    return feature.default_true or feature.future_default_true
+
+
+@receiver(pre_save, sender=Feature)
+@receiver(pre_delete, sender=Feature)
+def store_feature_projects(sender, instance, **kwargs):
+    """
+    Store the projects of the feature before it changes.
+
+    The relation with the projects is already deleted when ``post_delete`` is sent,
+    and ``post_save`` doesn't know if the feature applied to all projects before.
+    """
+    instance._old_project_ids = []
+    instance._applied_to_all_projects = False
+    if not instance.pk:
+        return
+    instance._old_project_ids = list(instance.projects.values_list("pk", flat=True))
+    old_feature = Feature.objects.filter(pk=instance.pk).first()
+    instance._applied_to_all_projects = bool(
+        old_feature and _applies_to_all_projects(old_feature)
+    )
+
+
+@receiver(post_save, sender=Feature)
+@receiver(post_delete, sender=Feature)
+def invalidate_project_features(sender, instance, **kwargs):
+    """
+    Invalidate the cached feature flags of the projects of a feature when it changes.
+
+    Features with ``default_true`` or ``future_default_true`` apply to several projects,
+    the feature flags of all projects are invalidated when they change.
+    """
+    if _applies_to_all_projects(instance) or getattr(
+        instance, "_applied_to_all_projects", False
+    ):
+        invalidate_features_cache()
+    else:
+        invalidate_features_cache(getattr(instance, "_old_project_ids", []))
+
+
+@receiver(m2m_changed, sender=Feature.projects.through)
+def invalidate_m2m_project_features(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidate the cached feature flags of the projects added to or removed from a feature."""
+    if action == "pre_clear":
+        # The projects aren't known after the relation is cleared.
+        if reverse:
+            instance._cleared_project_ids = [instance.pk]
+        else:
+            instance._cleared_project_ids = list(
+                instance.projects.values_list("pk", flat=True)
+            )
+        return
+    if not action.startswith("post_"):
+        return
+
+    if reverse:
+        # The features of a project changed.
+        project_ids = [instance.pk]
+    elif action == "post_clear":
+        project_ids = getattr(instance, "_cleared_project_ids", [])
+    else:
+        project_ids = pk_set or []
+    invalidate_features_cache(project_ids)
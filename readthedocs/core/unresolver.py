@@ -1,14 +1,20 @@
+import hashlib
+import pickle
 import re
+import time
+from collections import Counter
 from dataclasses import dataclass
 from enum import Enum, auto
 from urllib.parse import ParseResult, urlparse
 
 import structlog
 from django.conf import settings
+from django.core.cache import cache
 
 from readthedocs.builds.constants import EXTERNAL, INTERNAL
 from readthedocs.builds.models import Version
 from readthedocs.constants import pattern_opts
+from readthedocs.core.utils.cache import LocalLRUCache
 from readthedocs.projects.constants import (
     MULTIPLE_VERSIONS_WITH_TRANSLATIONS,
     MULTIPLE_VERSIONS_WITHOUT_TRANSLATIONS,
@@ -145,6 +151,121 @@ class UnresolvedDomain:
         return self.source == DomainSourceType.external_domain
 
 
+class UnresolverCache:
+
+    """
+    Cache for the project and domain lookups done while unresolving a domain.
+
+    We cache the objects themselves (or ``None`` for unknown hosts),
+    so a cache hit doesn't hit the database.
+    Entries are stored in a small in-process LRU cache with a short TTL,
+    backed by the Django cache.
+    Objects are pickled, each hit returns a new instance,
+    so callers can't modify the cached object.
+
+    Entries are invalidated when a project or domain is saved or deleted
+    (see ``readthedocs.core.signals``),
+    changes that don't trigger signals (like ``QuerySet.update()``)
+    are visible after ``RTD_UNRESOLVER_CACHE_TIMEOUT`` seconds.
+    The in-process cache of other processes isn't invalidated,
+    changes are visible there after ``RTD_UNRESOLVER_CACHE_LOCAL_TIMEOUT`` seconds.
+
+    Keys include a hash of the fields of the cached models,
+    so objects pickled before a deploy that changes them are never loaded.
+    Hits and misses are logged every ``RTD_UNRESOLVER_CACHE_STATS_INTERVAL`` seconds.
+    """
+
+    def __init__(self):
+        self._local = LocalLRUCache(
+            maxsize=settings.RTD_UNRESOLVER_CACHE_LOCAL_SIZE,
+            ttl=settings.RTD_UNRESOLVER_CACHE_LOCAL_TIMEOUT,
+        )
+        self.stats = Counter()
+        self._stats_since = time.monotonic()
+        self.schema_version = self._get_schema_version()
+
+    @staticmethod
+    def _get_schema_version():
+        fields = [
+            f"{model._meta.label}.{field.attname}"
+            for model in (Project, Domain)
+            for field in model._meta.concrete_fields
+        ]
+        return hashlib.md5(
+            ",".join(fields).encode(), usedforsecurity=False
+        ).hexdigest()[:8]
+
+    def get_project_key(self, slug):
+        return f"unresolver-{self.schema_version}-project-{slug}"
+
+    def get_domain_key(self, domain):
+        return f"unresolver-{self.schema_version}-domain-{domain}"
+
+    def _count(self, stat):
+        self.stats[stat] += 1
+        now = time.monotonic()
+        elapsed = now - self._stats_since
+        if elapsed >= settings.RTD_UNRESOLVER_CACHE_STATS_INTERVAL:
+            log.info(
+                "Unresolver cache stats.",
+                local_hits=self.stats["local_hits"],
+                shared_hits=self.stats["shared_hits"],
+                misses=self.stats["misses"],
+                seconds=round(elapsed),
+            )
+            self.stats.clear()
+            self._stats_since = now
+
+    def get(self, key):
+        """
+        Get the cached ``(object,)`` tuple for `key`.
+
+        ``object`` is the project or domain, or ``None`` for unknown hosts.
+        ``None`` is returned if the key isn't cached.
+        """
+        value = self._local.get(key)
+        if value is not None:
+            self._count("local_hits")
+            return pickle.loads(value)
+
+        value = cache.get(key)
+        if value is not None:
+            self._count("shared_hits")
+            self._local.set(key, pickle.dumps(value))
+            return value
+
+        self._count("misses")
+        return None
+
+    def set(self, key, obj):
+        value = (obj,)
+        if obj is None:
+            timeout = settings.RTD_UNRESOLVER_CACHE_NEGATIVE_TIMEOUT
+        else:
+            timeout = settings.RTD_UNRESOLVER_CACHE_TIMEOUT
+        cache.set(key, value, timeout=timeout)
+        self._local.set(key, pickle.dumps(value))
+
+    def delete(self, key):
+        cache.delete(key)
+        self._local.delete(key)
+
+    def invalidate_project(self, slug):
+        self.delete(self.get_project_key(slug))
+
+    def invalidate_domain(self, domain):
+        self.delete(self.get_domain_key(domain))
+
+    def clear(self):
+        """Clear the in-process cache and the counters."""
+        self._local.clear()
+        self.stats.clear()
+        self._stats_since = time.monotonic()
+
+
+unresolver_cache = UnresolverCache()
+
+
 def _expand_regex(pattern):
     """
     Expand a pattern with the patterns from pattern_opts.
@@ -594,13 +715,7 @@ class Unresolver:
             raise SuspiciousHostnameError(domain=domain)
 
         # Custom domain.
-        domain_object = (
-            Domain.objects.filter(domain=domain).select_related("project").first()
-        )
-        if not domain_object:
-            log.info("Invalid domain.", domain=domain)
-            raise InvalidCustomDomainError(domain=domain)
-
+        domain_object = self._resolve_custom_domain(domain)
         log.debug("Custom domain.", domain=domain)
         return UnresolvedDomain(
             source_domain=domain,
@@ -611,10 +726,43 @@ class Unresolver:
 
     def _resolve_project_slug(self, slug, domain):
         """Get the project from the slug or raise an exception if not found."""
+        cache_key = unresolver_cache.get_project_key(slug)
+        cached = unresolver_cache.get(cache_key)
+        if cached:
+            (project,) = cached
+            if project is None:
+                raise InvalidSubdomainError(domain=domain)
+            return project
+
         try:
-            return Project.objects.get(slug=slug)
+            project = Project.objects.get(slug=slug)
         except Project.DoesNotExist as exc:
+            unresolver_cache.set(cache_key, None)
             raise InvalidSubdomainError(domain=domain) from exc
+        unresolver_cache.set(cache_key, project)
+        return project
+
+    def _resolve_custom_domain(self, domain):
+        """Get the domain object from the domain or raise an exception if not found."""
+        cache_key = unresolver_cache.get_domain_key(domain)
+        cached = unresolver_cache.get(cache_key)
+        if cached:
+            (domain_object,) = cached
+            if domain_object is None:
+                log.info("Invalid domain.", domain=domain)
+                raise InvalidCustomDomainError(domain=domain)
+            return domain_object
+
+        domain_object = (
+            Domain.objects.filter(domain=domain).select_related("project").first()
+        )
+        if not domain_object:
+            unresolver_cache.set(cache_key, None)
+            log.info("Invalid domain.", domain=domain)
+            raise InvalidCustomDomainError(domain=domain)
+
+        unresolver_cache.set(cache_key, domain_object)
+        return domain_object
 
     def unresolve_domain_from_request(self, request):
         """
@@ -0,0 +1,65 @@
+"""In-process caching utilities."""
+
+import threading
+from collections import OrderedDict
+from time import monotonic
+
+
+class LocalLRUCache:
+
+    """
+    Small thread-safe LRU cache with a per-entry TTL.
+
+    This cache lives in the memory of the current process,
+    it's meant to be used in front of the Django cache for values
+    that are read on every request (e.g. from proxito),
+    where a short TTL is enough to bound the staleness between workers.
+
+    :param maxsize: Maximum number of entries to keep.
+    :param ttl: Number of seconds an entry is considered valid,
+     ``None`` means entries don't expire.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                expires_at, value = self._data[key]
+            except KeyError:
+                return default
+            if expires_at is not None and expires_at < monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        return self.get(key, default=_missing) is not _missing
+
+    def __len__(self):
+        return len(self._data)
+
+
+_missing = object()
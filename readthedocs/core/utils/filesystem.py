@@ -5,6 +5,7 @@ Provides wrappers around common path operations
 with some security checks in place.
 """
 
+import os
 import shutil
 from pathlib import Path
 
@@ -178,3 +179,14 @@ def safe_rmtree(path, *args, **kwargs):
         return None
     assert_path_is_inside_docroot(path)
     return shutil.rmtree(path, *args, **kwargs)
+
+
+def get_directory_size(path):
+    """Get the size in bytes of all files inside `path`, symlinks aren't followed."""
+    size = 0
+    for root, _, files in os.walk(path):
+        for filename in files:
+            filepath = os.path.join(root, filename)
+            if not os.path.islink(filepath):
+                size += os.path.getsize(filepath)
+    return size
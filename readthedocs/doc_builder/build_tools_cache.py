@@ -0,0 +1,256 @@
+"""
+Builder-local cache of the build tools (Python, Node.js, etc).
+
+Build tools are stored as ``{os}-{tool}-{version}.tar.gz`` files in
+``build_tools_storage``, downloading and extracting them on each build takes
+time, so we keep them extracted on the builder's disk, and mount them read-only
+in the build container, or copy them into the directory shared with it.
+
+Files are never hardlinked into that directory,
+the build runs user code that could modify them and poison the cache
+for all the builds of the builder.
+
+The cache is limited by size, the least recently used tools are removed first.
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+
+import structlog
+
+from readthedocs.core.utils.filesystem import get_directory_size
+
+log = structlog.get_logger(__name__)
+
+
+# ``FICLONE`` ioctl from ``linux/fs.h``.
+FICLONE = 0x40049409
+
+
+def _reflink_or_copy(src, dst):
+    """
+    Copy `src` into `dst`, sharing its blocks if the filesystem supports it.
+
+    A reflink is copy-on-write, modifying `dst` doesn't modify `src`.
+    """
+    try:
+        with open(src, "rb") as src_fd, open(dst, "wb") as dst_fd:
+            fcntl.ioctl(dst_fd.fileno(), FICLONE, src_fd.fileno())
+    except OSError:
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+
+class BuildToolsCache:
+
+    """
+    LRU cache of extracted build tools.
+
+    Each tool is stored in its own directory,
+    named after the tarball and a fingerprint of its content,
+    so a tarball that is uploaded again is never served from an old entry.
+    A ``.size`` file next to each directory stores its size,
+    and the modification time of the directory is used as its last access time.
+
+    The cache can be used from several builds running in the same builder,
+    all operations that modify it are done while holding a file lock.
+    Builds using an entry hold a shared lock on its ``.lock`` file,
+    entries are never removed while they are in use.
+
+    :param path: directory where the tools are stored.
+    :param max_size: maximum size of the cache in bytes.
+    """
+
+    lock_filename = ".lock"
+    tmp_prefix = ".tmp-"
+    # Temporary directories older than this (in seconds) were left behind
+    # by a build that was killed while populating an entry.
+    tmp_max_age = 60 * 60
+
+    def __init__(self, path, max_size):
+        self.path = path
+        self.max_size = max_size
+
+    @staticmethod
+    def get_key(storage, tool_path):
+        """
+        Get the cache key of the tarball at `tool_path` from `storage`.
+
+        Storages don't give us the hash of a file without downloading it,
+        we use its size and modification time as a fingerprint of its content.
+        """
+        fingerprint = "{size}:{modified}".format(
+            size=storage.size(tool_path),
+            modified=storage.get_modified_time(tool_path).isoformat(),
+        )
+        name = os.path.basename(tool_path)
+        if name.endswith(".tar.gz"):
+            name = name[: -len(".tar.gz")]
+        return "{name}-{hash}".format(
+            name=name,
+            hash=hashlib.md5(fingerprint.encode(), usedforsecurity=False).hexdigest(),
+        )
+
+    @contextlib.contextmanager
+    def _lock(self):
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, self.lock_filename), "w") as fd:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _get_entry_path(self, key):
+        return os.path.join(self.path, key)
+
+    def _get_size_path(self, key):
+        return os.path.join(self.path, f"{key}.size")
+
+    def _get_entry_lock_path(self, key):
+        return os.path.join(self.path, f"{key}.lock")
+
+    def _lock_entry(self, key):
+        """
+        Mark the entry `key` as in use until the returned file is closed.
+
+        The lock must be held when calling this method.
+        """
+        fd = open(self._get_entry_lock_path(key), "w")
+        fcntl.flock(fd, fcntl.LOCK_SH)
+        return fd
+
+    def _get_entry_size(self, key):
+        try:
+            with open(self._get_size_path(key)) as fd:
+                return int(fd.read())
+        except (OSError, ValueError):
+            return get_directory_size(self._get_entry_path(key))
+
+    def _copy_entry(self, key, destination):
+        shutil.copytree(
+            self._get_entry_path(key),
+            destination,
+            symlinks=True,
+            copy_function=_reflink_or_copy,
+            dirs_exist_ok=True,
+        )
+
+    def fetch(self, key, destination, populate):
+        """
+        Put the content of the entry `key` into the `destination` directory.
+
+        If the entry isn't in the cache,
+        ``populate`` is called with a temporary directory to fill it.
+
+        :returns: a tuple with a boolean indicating if the entry was in the cache,
+         and the size in bytes of the entry.
+        """
+        with self._use(key, populate) as (hit, size):
+            self._copy_entry(key, destination)
+        return hit, size
+
+    @contextlib.contextmanager
+    def mount(self, key, populate):
+        """
+        Get the path of the entry `key`, to mount it in the build container.
+
+        The entry isn't removed from the cache until the context manager exits,
+        it must be mounted read-only.
+
+        :yields: a tuple with a boolean indicating if the entry was in the cache,
+         the size in bytes of the entry, and its path.
+        """
+        with self._use(key, populate) as (hit, size):
+            yield hit, size, self._get_entry_path(key)
+
+    @contextlib.contextmanager
+    def _use(self, key, populate):
+        """
+        Make sure the entry `key` is in the cache, and keep it while the context is active.
+
+        If the entry isn't in the cache,
+        ``populate`` is called with a temporary directory to fill it.
+        """
+        entry_path = self._get_entry_path(key)
+        entry_fd = None
+        with self._lock():
+            if os.path.isdir(entry_path):
+                # Mark the entry as recently used.
+                os.utime(entry_path)
+                entry_fd = self._lock_entry(key)
+                hit, size = True, self._get_entry_size(key)
+
+        if entry_fd is None:
+            # Populate the entry outside the lock,
+            # other builds don't need to wait for the download.
+            tmp_path = tempfile.mkdtemp(dir=self.path, prefix=self.tmp_prefix)
+            try:
+                populate(tmp_path)
+                size = get_directory_size(tmp_path)
+                with self._lock():
+                    # Another build could have added the same entry meanwhile.
+                    if not os.path.isdir(entry_path):
+                        os.rename(tmp_path, entry_path)
+                        with open(self._get_size_path(key), "w") as fd:
+                            fd.write(str(size))
+                    entry_fd = self._lock_entry(key)
+                    self._evict(keep=key)
+            finally:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+            hit = False
+
+        with entry_fd:
+            yield hit, size
+
+    def _evict(self, keep):
+        """
+        Remove the least recently used entries until the cache fits in ``max_size``.
+
+        Entries in use by other builds are never removed.
+        Temporary directories left behind by killed builds are removed too.
+        The lock must be held when calling this method.
+
+        :param keep: key of an entry that should never be removed.
+        """
+        entries = []
+        for key in os.listdir(self.path):
+            entry_path = self._get_entry_path(key)
+            if not os.path.isdir(entry_path):
+                continue
+            if key.startswith(self.tmp_prefix):
+                if os.path.getmtime(entry_path) < time.time() - self.tmp_max_age:
+                    log.info("Removing stale build tool temporary directory.", key=key)
+                    shutil.rmtree(entry_path, ignore_errors=True)
+                continue
+            if key.startswith("."):
+                continue
+            entries.append(
+                (os.path.getmtime(entry_path), key, self._get_entry_size(key))
+            )
+
+        total_size = sum(size for _, _, size in entries)
+        for _, key, size in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            if key == keep:
+                continue
+            with open(self._get_entry_lock_path(key), "w") as fd:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+                log.info("Removing build tool from local cache.", key=key, size=size)
+                shutil.rmtree(self._get_entry_path(key), ignore_errors=True)
+                for path in (
+                    self._get_size_path(key),
+                    self._get_entry_lock_path(key),
+                ):
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(path)
+            total_size -= size
@@ -7,6 +7,8 @@ It "directs" all of the high-level build jobs:
 * setting up the environment
 * fetching instructions etc.
 """
+import contextlib
+import functools
 import os
 import tarfile
 
@@ -17,14 +19,20 @@ from django.utils.translation import gettext_lazy as _
 
 from readthedocs.builds.constants import EXTERNAL
 from readthedocs.core.utils.filesystem import safe_open
+from readthedocs.doc_builder.build_tools_cache import BuildToolsCache
 from readthedocs.doc_builder.config import load_yaml_config
+from readthedocs.doc_builder.environments import DockerBuildEnvironment
 from readthedocs.doc_builder.exceptions import BuildUserError
 from readthedocs.doc_builder.loader import get_builder_class
 from readthedocs.doc_builder.python_environments import Conda, Virtualenv
-from readthedocs.projects.constants import BUILD_COMMANDS_OUTPUT_PATH_HTML
+from readthedocs.projects.constants import (
+    BUILD_COMMANDS_OUTPUT_PATH_HTML,
+    REPO_TYPE_GIT,
+)
 from readthedocs.projects.exceptions import RepositoryError
 from readthedocs.projects.signals import after_build, before_build, before_vcs
 from readthedocs.storage import build_tools_storage
+from readthedocs.vcs_support.mirrors import get_mirror_path
 
 log = structlog.get_logger(__name__)
 
@@ -58,6 +66,14 @@ class BuildDirector:
         """
         self.data = data
 
+        # Stats of the local cache of build tools, reported in the build data.
+        self.build_tools_cache_stats = {"hits": 0, "misses": 0, "bytes_saved": 0}
+
+        # Build tools from the local cache mounted in the build environment,
+        # they are kept in the cache until ``build_tools_mounts`` is closed.
+        self.mounted_build_tools = set()
+        self.build_tools_mounts = contextlib.ExitStack()
+
         # Reset `addons` field. It will be set to `True` only when it's built via `build.commands`
         self.data.version.addons = False
 
@@ -128,6 +144,8 @@ class BuildDirector:
         if commit:
             self.data.build["commit"] = commit
 
+        self.vcs_environment.flush_commands()
+
     def create_vcs_environment(self):
         self.vcs_environment = self.data.environment_class(
             project=self.data.project,
@@ -136,8 +154,31 @@ class BuildDirector:
             environment=self.get_vcs_env_vars(),
             container_image=settings.RTD_DOCKER_CLONE_IMAGE,
             api_client=self.data.api_client,
+            binds=self.get_vcs_binds(),
         )
 
+    def get_vcs_binds(self):
+        """
+        Get the extra paths to mount in the VCS environment.
+
+        The local mirror of the repository is only mounted in this environment,
+        commands from the build environment can't modify it.
+        """
+        if (
+            self.data.project.repo_type != REPO_TYPE_GIT
+            or self.data.version.type == EXTERNAL
+        ):
+            return {}
+
+        mirror_path = get_mirror_path(self.data.project)
+        if not mirror_path:
+            return {}
+
+        # Create the directory before mounting it,
+        # otherwise Docker creates it owned by root.
+        os.makedirs(mirror_path, exist_ok=True)
+        return {mirror_path: {"bind": mirror_path, "mode": "rw"}}
+
     def create_build_environment(self):
         self.build_environment = self.data.environment_class(
             project=self.data.project,
@@ -146,8 +187,49 @@ class BuildDirector:
             build=self.data.build,
             environment=self.get_build_env_vars(),
             api_client=self.data.api_client,
+            binds=self.get_build_tools_binds(),
         )
 
+    def get_build_tools_binds(self):
+        """
+        Get the build tools from the local cache to mount in the build environment.
+
+        Tools are mounted read-only, so they aren't copied on each build,
+        and commands from the build can't modify the cache.
+        Tools are copied by ``install_build_tools`` when they can't be mounted.
+        """
+        if (
+            not settings.RTD_BUILD_TOOLS_CACHE_PATH
+            or settings.RTD_DOCKER_COMPOSE
+            or self.data.environment_class is not DockerBuildEnvironment
+        ):
+            return {}
+
+        binds = {}
+        cache = self._get_build_tools_cache()
+        for tool, version in self.data.config.build.tools.items():
+            full_version = version.full_version
+            tool_path = self._get_build_tool_path(tool, full_version)
+            if not build_tools_storage.exists(tool_path):
+                continue
+
+            hit, size, entry_path = self.build_tools_mounts.enter_context(
+                cache.mount(
+                    cache.get_key(build_tools_storage, tool_path),
+                    populate=functools.partial(self._download_build_tool, tool_path),
+                )
+            )
+            self._record_build_tools_cache_stats(tool_path, hit, size)
+            binds[os.path.join(entry_path, full_version)] = {
+                "bind": os.path.join(
+                    settings.RTD_DOCKER_WORKDIR,
+                    f".asdf/installs/{tool}/{full_version}",
+                ),
+                "mode": "ro",
+            }
+            self.mounted_build_tools.add(tool)
+        return binds
+
     def setup_environment(self):
         """
         Create the environment and install required dependencies.
@@ -191,6 +273,8 @@ class BuildDirector:
         self.install()
         self.run_build_job("post_install")
 
+        self.build_environment.flush_commands()
+
     def build(self):
         """
         Build all the formats specified by the user.
@@ -211,6 +295,7 @@ class BuildDirector:
 
         self.run_build_job("post_build")
         self.store_readthedocs_build_yaml()
+        self.build_environment.flush_commands()
 
         after_build.send(
             sender=self.data.version,
@@ -457,6 +542,7 @@ class BuildDirector:
         self.data.version.addons = True
 
         self.store_readthedocs_build_yaml()
+        self.build_environment.flush_commands()
 
     def install_build_tools(self):
         """
@@ -492,34 +578,29 @@ class BuildDirector:
             # see https://github.com/readthedocs/readthedocs.org/pull/8447#issuecomment-911562267
             # tool_path = f'{self.config.build.os}/{tool}/2021-08-30/{full_version}.tar.gz'
 
-            build_os = self.data.config.build.os
-            if build_os == "ubuntu-lts-latest":
-                _, build_os = settings.RTD_DOCKER_BUILD_SETTINGS["os"][
-                    "ubuntu-lts-latest"
-                ].split(":")
-
-            tool_path = f"{build_os}-{tool}-{full_version}.tar.gz"
+            tool_path = self._get_build_tool_path(tool, full_version)
             tool_version_cached = build_tools_storage.exists(tool_path)
-            if tool_version_cached:
-                remote_fd = build_tools_storage.open(tool_path, mode="rb")
-                with tarfile.open(fileobj=remote_fd) as tar:
-                    # Extract it on the shared path between host and Docker container
-                    extract_path = os.path.join(self.data.project.doc_path, "tools")
-                    tar.extractall(extract_path)
-
-                    # Move the extracted content to the ``asdf`` installation
-                    cmd = [
-                        "mv",
-                        f"{extract_path}/{full_version}",
-                        os.path.join(
-                            settings.RTD_DOCKER_WORKDIR,
-                            f".asdf/installs/{tool}/{full_version}",
-                        ),
-                    ]
-                    self.build_environment.run(
-                        *cmd,
-                        record=False,
-                    )
+            if tool in self.mounted_build_tools:
+                # Already mounted read-only from the local cache.
+                pass
+            elif tool_version_cached:
+                # Extract it on the shared path between host and Docker container
+                extract_path = os.path.join(self.data.project.doc_path, "tools")
+                self._extract_build_tool(tool_path, extract_path)
+
+                # Move the extracted content to the ``asdf`` installation
+                cmd = [
+                    "mv",
+                    f"{extract_path}/{full_version}",
+                    os.path.join(
+                        settings.RTD_DOCKER_WORKDIR,
+                        f".asdf/installs/{tool}/{full_version}",
+                    ),
+                ]
+                self.build_environment.run(
+                    *cmd,
+                    record=False,
+                )
             else:
                 log.debug(
                     "Cached version for tool not found.",
@@ -604,6 +685,61 @@ class BuildDirector:
                     *cmd,
                 )
 
+        self.build_environment.flush_commands()
+
+    def _get_build_tool_path(self, tool, full_version):
+        """Get the path of the tarball of `tool` in ``build_tools_storage``."""
+        build_os = self.data.config.build.os
+        if build_os == "ubuntu-lts-latest":
+            _, build_os = settings.RTD_DOCKER_BUILD_SETTINGS["os"][
+                "ubuntu-lts-latest"
+            ].split(":")
+        return f"{build_os}-{tool}-{full_version}.tar.gz"
+
+    def _get_build_tools_cache(self):
+        return BuildToolsCache(
+            path=settings.RTD_BUILD_TOOLS_CACHE_PATH,
+            max_size=settings.RTD_BUILD_TOOLS_CACHE_MAX_SIZE,
+        )
+
+    def _download_build_tool(self, tool_path, path):
+        remote_fd = build_tools_storage.open(tool_path, mode="rb")
+        with tarfile.open(fileobj=remote_fd) as tar:
+            tar.extractall(path)
+
+    def _record_build_tools_cache_stats(self, tool_path, hit, size):
+        if hit:
+            self.build_tools_cache_stats["hits"] += 1
+            self.build_tools_cache_stats["bytes_saved"] += size
+        else:
+            self.build_tools_cache_stats["misses"] += 1
+        log.info(
+            "Build tool extracted.",
+            tool_path=tool_path,
+            cached=hit,
+            size=size,
+        )
+
+    def _extract_build_tool(self, tool_path, extract_path):
+        """
+        Extract the build tool at `tool_path` into `extract_path`.
+
+        When the local cache of build tools is enabled,
+        the tool is downloaded only if it isn't already on the builder's disk.
+        """
+        if not settings.RTD_BUILD_TOOLS_CACHE_PATH:
+            self._download_build_tool(tool_path, extract_path)
+            return
+
+        cache = self._get_build_tools_cache()
+        key = cache.get_key(build_tools_storage, tool_path)
+        hit, size = cache.fetch(
+            key,
+            extract_path,
+            populate=functools.partial(self._download_build_tool, tool_path),
+        )
+        self._record_build_tools_cache_stats(tool_path, hit, size)
+
     # Helpers
     #
     # TODO: move somewhere or change names to make them private or something to
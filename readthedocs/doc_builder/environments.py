@@ -2,8 +2,10 @@
 
 import os
 import re
+import selectors
 import subprocess
 import sys
+import time
 import uuid
 from datetime import datetime
 
@@ -36,6 +38,78 @@ from .exceptions import BuildAppError, BuildUserError
 log = structlog.get_logger(__name__)
 
 
+def get_max_output_size():
+    """Max size in bytes of the output of the commands sent in a request to the API."""
+    # Left some extra space for the rest of the request data
+    threshold = 512 * 1024  # 512Kb
+    return settings.DATA_UPLOAD_MAX_MEMORY_SIZE - threshold
+
+
+class CommandOutputBuffer:
+
+    """
+    Bounded buffer for the output of a command.
+
+    The output is written in chunks while the command runs,
+    only the first ``head_size`` bytes and the last ``tail_size`` bytes are kept,
+    so memory doesn't grow with the amount of output of the command.
+
+    :param head_size: number of bytes to keep from the beginning of the output.
+     Defaults to ``RTD_BUILD_COMMAND_OUTPUT_HEAD_SIZE``.
+    :param tail_size: number of bytes to keep from the end of the output.
+     Defaults to ``RTD_BUILD_COMMAND_OUTPUT_TAIL_SIZE``.
+    """
+
+    def __init__(self, head_size=None, tail_size=None):
+        self.head_size = (
+            settings.RTD_BUILD_COMMAND_OUTPUT_HEAD_SIZE
+            if head_size is None
+            else head_size
+        )
+        self.tail_size = (
+            settings.RTD_BUILD_COMMAND_OUTPUT_TAIL_SIZE
+            if tail_size is None
+            else tail_size
+        )
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.truncated = 0
+
+    @property
+    def size(self):
+        """Number of bytes written to the buffer."""
+        return len(self.head) + len(self.tail) + self.truncated
+
+    def write(self, chunk: bytes):
+        if not chunk:
+            return
+        missing_head = self.head_size - len(self.head)
+        if missing_head > 0:
+            self.head += chunk[:missing_head]
+            chunk = chunk[missing_head:]
+
+        self.tail += chunk
+        extra = len(self.tail) - self.tail_size
+        if extra > 0:
+            del self.tail[:extra]
+            self.truncated += extra
+
+    def getvalue(self) -> bytes:
+        """Return the kept output, with a note in the middle if it was truncated."""
+        if not self.truncated:
+            return bytes(self.head + self.tail)
+        return b"".join(
+            [
+                bytes(self.head),
+                (
+                    "\n\n.. (truncated) ...\n"
+                    f"Output is too big. Truncated {self.truncated} bytes.\n\n\n"
+                ).encode("utf-8"),
+                bytes(self.tail),
+            ]
+        )
+
+
 class BuildCommand(BuildCommandResultMixin):
 
     """
@@ -58,6 +132,9 @@ class BuildCommand(BuildCommandResultMixin):
     :param build_env: build environment to use to execute commands
     :param bin_path: binary path to add to PATH resolution
     :param demux: Return stdout and stderr separately.
+    :param record: Whether this command is recorded via the API,
+     its output is saved every ``RTD_BUILD_COMMAND_OUTPUT_SAVE_INTERVAL`` seconds
+     while it runs.
     :param kwargs: allow to subclass this class and extend it
     """
 
@@ -72,6 +149,7 @@ class BuildCommand(BuildCommandResultMixin):
         bin_path=None,
         record_as_success=False,
         demux=False,
+        record=False,
         **kwargs,
     ):
         self.command = command
@@ -91,7 +169,10 @@ class BuildCommand(BuildCommandResultMixin):
         self.bin_path = bin_path
         self.record_as_success = record_as_success
         self.demux = demux
+        self.record = record
         self.exit_code = None
+        self._output_saved_at = None
+        self._output_saved_size = 0
 
         # NOTE: `self.build_env` is not available when instantiating this class
         # from hacky tests. `Project.vcs_repo` allows not passing an
@@ -129,6 +210,7 @@ class BuildCommand(BuildCommandResultMixin):
     def run(self):
         """Set up subprocess and execute command."""
         self.start_time = datetime.utcnow()
+        self._output_saved_at = time.monotonic()
         environment = self._environment.copy()
         if "DJANGO_SETTINGS_MODULE" in environment:
             del environment["DJANGO_SETTINGS_MODULE"]
@@ -164,7 +246,7 @@ class BuildCommand(BuildCommandResultMixin):
                 stderr=stderr,
                 env=environment,
             )
-            cmd_stdout, cmd_stderr = proc.communicate()
+            cmd_stdout, cmd_stderr = self._read_output(proc)
             self.output = self.decode_output(cmd_stdout)
             self.error = self.decode_output(cmd_stderr)
             self.exit_code = proc.returncode
@@ -174,6 +256,82 @@ class BuildCommand(BuildCommandResultMixin):
         finally:
             self.end_time = datetime.utcnow()
 
+    def _read_output(self, proc):
+        """
+        Read the stdout and stderr of ``proc`` incrementally until it finishes.
+
+        The output is kept in a bounded buffer,
+        instead of holding all the output in memory (like ``proc.communicate()`` does).
+
+        :returns: a tuple with the stdout and stderr of the command (`None` if not captured).
+        """
+        stdout_buffer, stderr_buffer = self._get_output_buffers()
+        buffers = {proc.stdout: stdout_buffer}
+        if proc.stderr:
+            buffers[proc.stderr] = stderr_buffer
+
+        with selectors.DefaultSelector() as selector:
+            for stream in buffers:
+                selector.register(stream, selectors.EVENT_READ)
+            while selector.get_map():
+                # Wake up periodically to save the output of a silent command.
+                events = selector.select(
+                    timeout=settings.RTD_BUILD_COMMAND_OUTPUT_SAVE_INTERVAL
+                )
+                for key, _ in events:
+                    chunk = os.read(key.fd, settings.RTD_BUILD_COMMAND_OUTPUT_CHUNK_SIZE)
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+                        key.fileobj.close()
+                        continue
+                    buffers[key.fileobj].write(chunk)
+                self._save_partial_output(stdout_buffer)
+        proc.wait()
+
+        cmd_stdout = buffers[proc.stdout].getvalue()
+        cmd_stderr = buffers[proc.stderr].getvalue() if proc.stderr else None
+        return cmd_stdout, cmd_stderr
+
+    def _get_output_buffers(self):
+        """
+        Get the buffers for the stdout and stderr of the command.
+
+        When stdout and stderr are read separately,
+        each one gets half of the space,
+        so the output of the command always fits in a request to the API.
+        """
+        head_size = settings.RTD_BUILD_COMMAND_OUTPUT_HEAD_SIZE
+        tail_size = settings.RTD_BUILD_COMMAND_OUTPUT_TAIL_SIZE
+        if self.demux:
+            head_size //= 2
+            tail_size //= 2
+        return (
+            CommandOutputBuffer(head_size=head_size, tail_size=tail_size),
+            CommandOutputBuffer(head_size=head_size, tail_size=tail_size),
+        )
+
+    def _save_partial_output(self, buffer):
+        """
+        Save the output of the command while it's running.
+
+        The output (the beginning and the end of it, as kept by ``buffer``)
+        is saved every ``RTD_BUILD_COMMAND_OUTPUT_SAVE_INTERVAL`` seconds,
+        only if there is new output.
+        """
+        if not self.record or not self.build_env:
+            return
+        if (
+            time.monotonic() - self._output_saved_at
+            < settings.RTD_BUILD_COMMAND_OUTPUT_SAVE_INTERVAL
+        ):
+            return
+        self._output_saved_at = time.monotonic()
+        if buffer.size == self._output_saved_size:
+            return
+        self._output_saved_size = buffer.size
+        self.output = self.decode_output(buffer.getvalue())
+        self.build_env.save_running_command(self)
+
     def decode_output(self, output: bytes) -> str:
         """Decode bytes output to a UTF-8 string."""
         decoded = ""
@@ -211,9 +369,7 @@ class BuildCommand(BuildCommandResultMixin):
         # TODO: we are calculating the length in bytes, but truncating the string
         # in characters. We should use bytes or characters, but not both.
         output_length = len(sanitized.encode("utf-8"))
-        # Left some extra space for the rest of the request data
-        threshold = 512 * 1024  # 512Kb
-        allowed_length = settings.DATA_UPLOAD_MAX_MEMORY_SIZE - threshold
+        allowed_length = get_max_output_size()
         if output_length > allowed_length:
             log.info(
                 "Command output is too big.",
@@ -234,8 +390,8 @@ class BuildCommand(BuildCommandResultMixin):
             return " ".join(self.command)
         return self.command
 
-    def save(self, api_client):
-        """Save this command and result via the API."""
+    def get_api_data(self):
+        """Get the data of this command and result to be saved via the API."""
         # Force record this command as success to avoid Build reporting errors
         # on commands that are just for checking purposes and do not interferes
         # in the Build
@@ -243,7 +399,7 @@ class BuildCommand(BuildCommandResultMixin):
             log.warning("Recording command exit_code as success")
             self.exit_code = 0
 
-        data = {
+        return {
             "build": self.build_env.build.get("id"),
             "command": self.get_command(),
             "output": self.sanitize_output(self.output),
@@ -252,6 +408,10 @@ class BuildCommand(BuildCommandResultMixin):
             "end_time": self.end_time,
         }
 
+    def save(self, api_client):
+        """Save this command and result via the API."""
+        data = self.get_api_data()
+
         if self.build_env.project.has_feature(Feature.API_LARGE_DATA):
             # Don't use slumber directly here. Slumber tries to enforce a string,
             # which will break our multipart encoding here.
@@ -304,6 +464,7 @@ class DockerBuildCommand(BuildCommand):
         )
 
         self.start_time = datetime.utcnow()
+        self._output_saved_at = time.monotonic()
         client = self.build_env.get_client()
         try:
             exec_cmd = client.exec_create(
@@ -316,17 +477,21 @@ class DockerBuildCommand(BuildCommand):
                 stderr=True,
             )
 
+            # Stream the output, so we don't hold all of it in memory.
             out = client.exec_start(
-                exec_id=exec_cmd["Id"], stream=False, demux=self.demux
+                exec_id=exec_cmd["Id"], stream=True, demux=self.demux
             )
-            cmd_stdout = ""
-            cmd_stderr = ""
-            if self.demux:
-                cmd_stdout, cmd_stderr = out
-            else:
-                cmd_stdout = out
-            self.output = self.decode_output(cmd_stdout)
-            self.error = self.decode_output(cmd_stderr)
+            stdout_buffer, stderr_buffer = self._get_output_buffers()
+            for chunk in out:
+                if self.demux:
+                    stdout_chunk, stderr_chunk = chunk
+                    stdout_buffer.write(stdout_chunk)
+                    stderr_buffer.write(stderr_chunk)
+                else:
+                    stdout_buffer.write(chunk)
+                self._save_partial_output(stdout_buffer)
+            self.output = self.decode_output(stdout_buffer.getvalue())
+            self.error = self.decode_output(stderr_buffer.getvalue())
             cmd_ret = client.exec_inspect(exec_id=exec_cmd["Id"])
             self.exit_code = cmd_ret["ExitCode"]
 
@@ -445,6 +610,11 @@ class BaseBuildEnvironment:
         self.record = record
         self.api_client = api_client
 
+        # Commands waiting to be saved via the API (see ``flush_commands``).
+        self._pending_commands = []
+        self._pending_commands_size = 0
+        self._pending_commands_since = None
+
         if self.record and not self.api_client:
             raise ValueError("api_client is required when record=True")
 
@@ -454,11 +624,93 @@ class BaseBuildEnvironment:
         return self
 
     def __exit__(self, exc_type, exc_value, tb):
-        return
+        try:
+            self.flush_commands()
+        except Exception:
+            # Don't hide the exception raised by the build (if any).
+            log.exception("Couldn't save the pending build commands.")
 
     def record_command(self, command):
-        if self.record:
+        """
+        Save ``command`` via the API.
+
+        Commands are buffered and saved in bulk,
+        the buffer is flushed when it's full, when the oldest command
+        has been waiting for ``RTD_BUILD_COMMANDS_FLUSH_INTERVAL`` seconds,
+        at the end of each phase of the build, and when exiting the environment.
+        """
+        if not self.record:
+            return
+
+        # Big outputs are sent as multipart, one command at a time.
+        if self.project and self.project.has_feature(Feature.API_LARGE_DATA):
             command.save(self.api_client)
+            return
+
+        data = command.get_api_data()
+        size = len(data["output"].encode("utf-8"))
+        if command.error:
+            size += len(command.error.encode("utf-8"))
+        if (
+            self._pending_commands
+            and self._pending_commands_size + size > get_max_output_size()
+        ):
+            self.flush_commands()
+
+        if not self._pending_commands:
+            self._pending_commands_since = time.monotonic()
+        self._pending_commands.append(data)
+        self._pending_commands_size += size
+
+        if len(self._pending_commands) >= settings.RTD_BUILD_COMMANDS_BATCH_SIZE:
+            self.flush_commands()
+        else:
+            self._flush_stale_commands()
+
+    def _flush_stale_commands(self):
+        """Flush the pending commands if they have been waiting for too long."""
+        if (
+            self._pending_commands
+            and time.monotonic() - self._pending_commands_since
+            >= settings.RTD_BUILD_COMMANDS_FLUSH_INTERVAL
+        ):
+            self.flush_commands()
+
+    def save_running_command(self, command):
+        """
+        Save ``command`` via the API while it's running, to show its output.
+
+        The command is saved without an exit code and end time,
+        it's updated when it's recorded after it finishes.
+        Pending commands are saved first, so they are shown before this one.
+        Errors are logged, the command is saved again when it finishes.
+        """
+        if not self.record:
+            return
+
+        # Big outputs are sent as multipart, one command at a time.
+        if self.project and self.project.has_feature(Feature.API_LARGE_DATA):
+            return
+
+        data = command.get_api_data()
+        data.update(exit_code=None, end_time=None)
+        try:
+            self.flush_commands()
+            self.api_client.command.bulk.post([data])
+        except Exception:
+            log.exception("Couldn't save the output of the running command.")
+
+    def flush_commands(self):
+        """Save all the pending commands via the API with a single request."""
+        if not self._pending_commands:
+            return
+
+        commands = self._pending_commands
+        self._pending_commands = []
+        self._pending_commands_size = 0
+        self._pending_commands_since = None
+        resp = self.api_client.command.bulk.post(commands)
+        log.debug("Post response for bulk commands.", count=len(commands), response=resp)
 
     def run(self, *cmd, **kwargs):
         """Shortcut to run command from environment."""
@@ -496,6 +748,11 @@ class BaseBuildEnvironment:
             raise BuildAppError("environment can't be passed in via commands.")
         kwargs["environment"] = environment
         kwargs["build_env"] = self
+        kwargs["record"] = record
+
+        # Don't leave finished commands waiting while running a (maybe long) command.
+        self._flush_stale_commands()
+
         build_cmd = cls(cmd, **kwargs)
         build_cmd.run()
 
@@ -565,6 +822,8 @@ class DockerBuildEnvironment(BaseBuildEnvironment):
 
     def __init__(self, *args, **kwargs):
         container_image = kwargs.pop("container_image", None)
+        # Extra paths from the host to mount in the container.
+        self.binds = kwargs.pop("binds", None) or {}
         super().__init__(*args, **kwargs)
         self.client = None
         self.container = None
@@ -643,6 +902,12 @@ class DockerBuildEnvironment(BaseBuildEnvironment):
 
     def __exit__(self, exc_type, exc_value, tb):
         """End of environment context."""
+        try:
+            self.flush_commands()
+        except Exception:
+            # Don't skip the clean up of the container.
+            log.exception("Couldn't save the pending build commands.")
+
         client = self.get_client()
         try:
             client.kill(self.container_id)
@@ -729,6 +994,7 @@ class DockerBuildEnvironment(BaseBuildEnvironment):
             }
 
         binds.update(settings.RTD_DOCKER_ADDITIONAL_BINDS)
+        binds.update(self.binds)
 
         return binds
 
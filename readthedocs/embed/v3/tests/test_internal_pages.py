@@ -91,3 +91,44 @@ class TestEmbedAPIv3InternalPages:
         assert response.status_code == 200
 
         storage_open.assert_called_once_with("html/project/latest/My Spaced File.html")
+
+    @mock.patch("readthedocs.embed.v3.views.build_media_storage.open")
+    @mock.patch("readthedocs.embed.v3.views.build_media_storage.exists")
+    def test_content_is_cached(self, storage_exists, storage_open, client):
+        storage_exists.return_value = True
+        storage_open.side_effect = self._mock_open(
+            '<div id="first">first</div><div id="second">second</div>'
+        )
+
+        params = {
+            "url": "https://project.readthedocs.io/en/latest/page.html#first",
+        }
+        response = client.get(self.api_url, params)
+        assert response.status_code == 200
+        assert response.json()["content"] == '<div id="first">first</div>'
+        assert storage_open.call_count == 1
+
+        # The same fragment is served from the cache.
+        response = client.get(self.api_url, params)
+        assert response.status_code == 200
+        assert response.json()["content"] == '<div id="first">first</div>'
+        assert storage_open.call_count == 1
+
+        # Other fragments are read from the page.
+        params = {
+            "url": "https://project.readthedocs.io/en/latest/page.html#second",
+        }
+        response = client.get(self.api_url, params)
+        assert response.status_code == 200
+        assert response.json()["content"] == '<div id="second">second</div>'
+        assert storage_open.call_count == 2
+
+        # A new build invalidates the cached content.
+        storage_open.side_effect = self._mock_open(
+            '<div id="second">second (new build)</div>'
+        )
+        self.project.versions.get(slug="latest").save()
+        response = client.get(self.api_url, params)
+        assert response.status_code == 200
+        assert response.json()["content"] == '<div id="second">second (new build)</div>'
+        assert storage_open.call_count == 3
@@ -1,5 +1,6 @@
 """Views for the EmbedAPI v3 app."""
 
+import hashlib
 import re
 import urllib.parse
 from urllib.parse import urlparse
@@ -69,6 +70,59 @@ class EmbedAPIBase(EmbedAPIMixin, CDNCacheTagsMixin, APIView):
         # it can't find the project in our database
         return self.unresolved_url is None
 
+    def _get_content_cache_key(self, url, fragment, doctool, doctoolversion):
+        """
+        Get the cache key for the content of `fragment` from the page at `url`.
+
+        For internal pages the key includes the modification date of the version,
+        it changes after each successful build, so a new build invalidates the content.
+        """
+        key = "\n".join([url, fragment or "", doctool or "", doctoolversion or ""])
+        content_hash = hashlib.sha256(key.encode()).hexdigest()
+        if self.external:
+            return f"embed-api-content-external-{content_hash}"
+
+        version = self.unresolved_url.version
+        return (
+            f"embed-api-content-{version.pk}-{version.modified.timestamp()}-{content_hash}"
+        )
+
+    def _get_cached_content(self, url, fragment, doctool, doctoolversion):
+        """
+        Get the content of `fragment`, using the cache to avoid reading and parsing the page.
+
+        Content bigger than ``RTD_EMBED_API_CONTENT_CACHE_MAX_SIZE`` isn't cached.
+        """
+        cache_key = self._get_content_cache_key(url, fragment, doctool, doctoolversion)
+        content = cache.get(cache_key)
+        if content is not None:
+            log.debug("Cached content.", url=url, fragment=fragment)
+            return content
+
+        content_requested = self._get_content_by_fragment(
+            url,
+            fragment,
+            doctool,
+            doctoolversion,
+        )
+        if not content_requested:
+            return None
+
+        # Make links from the content to be absolute
+        content = clean_references(
+            content_requested,
+            url,
+            html_raw_response=True,
+        )
+        if len(content) <= settings.RTD_EMBED_API_CONTENT_CACHE_MAX_SIZE:
+            timeout = (
+                settings.RTD_EMBED_API_PAGE_CACHE_TIMEOUT
+                if self.external
+                else settings.RTD_EMBED_API_CONTENT_CACHE_TIMEOUT
+            )
+            cache.set(cache_key, content, timeout=timeout)
+        return content
+
     def _download_page_content(self, url):
         # Sanitize the URL before requesting it
         url = urlparse(url)._replace(fragment="", query="").geturl()
@@ -332,9 +386,12 @@ class EmbedAPIBase(EmbedAPIMixin, CDNCacheTagsMixin, APIView):
         # whitespaces (spaces, tabs, etc.).
         fragment = parsed_url.fragment
 
+        # Sanitize the URL before requesting it
+        sanitized_url = urlparse(url)._replace(fragment="", query="").geturl()
+
         try:
-            content_requested = self._get_content_by_fragment(
-                url,
+            content = self._get_cached_content(
+                sanitized_url,
                 fragment,
                 doctool,
                 doctoolversion,
@@ -364,7 +421,7 @@ class EmbedAPIBase(EmbedAPIMixin, CDNCacheTagsMixin, APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if not content_requested:
+        if not content:
             log.warning("Identifier not found.", url=url, fragment=fragment)
             return Response(
                 {
@@ -376,15 +433,6 @@ class EmbedAPIBase(EmbedAPIMixin, CDNCacheTagsMixin, APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        # Sanitize the URL before requesting it
-        sanitized_url = urlparse(url)._replace(fragment="", query="").geturl()
-        # Make links from the content to be absolute
-        content = clean_references(
-            content_requested,
-            sanitized_url,
-            html_raw_response=True,
-        )
-
         response = {
             "url": url,
             "fragment": fragment if fragment else None,
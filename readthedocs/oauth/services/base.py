@@ -1,5 +1,6 @@
 """OAuth utility functions."""
 
+import time
 from datetime import datetime
 
 import structlog
@@ -13,6 +14,13 @@ from oauthlib.oauth2.rfc6749.errors import InvalidClientIdError
 from requests.exceptions import RequestException
 from requests_oauthlib import OAuth2Session
 
+from readthedocs.oauth.models import (
+    RemoteOrganization,
+    RemoteOrganizationRelation,
+    RemoteRepository,
+    RemoteRepositoryRelation,
+)
+
 log = structlog.get_logger(__name__)
 
 
@@ -42,10 +50,50 @@ class Service:
     default_user_avatar_url = settings.OAUTH_AVATAR_USER_DEFAULT_URL
     default_org_avatar_url = settings.OAUTH_AVATAR_ORG_DEFAULT_URL
 
+    # Fields updated on existing objects when syncing.
+    remote_repository_update_fields = [
+        "organization",
+        "name",
+        "full_name",
+        "description",
+        "avatar_url",
+        "ssh_url",
+        "clone_url",
+        "html_url",
+        "private",
+        "vcs",
+        "default_branch",
+        "modified",
+    ]
+    remote_organization_update_fields = [
+        "slug",
+        "name",
+        "email",
+        "avatar_url",
+        "url",
+        "modified",
+    ]
+
+    # Headers with the number of requests remaining for the token,
+    # and the time (as a UNIX timestamp) when the rate limit is reset.
+    rate_limit_remaining_header = None
+    rate_limit_reset_header = None
+
+    # Repositories that already belong to another organization aren't updated,
+    # they are updated when syncing the repositories of that organization.
+    skip_repositories_from_other_organizations = False
+
     def __init__(self, user, account):
         self.session = None
         self.user = user
         self.account = account
+        # Counters of the work done by ``sync``.
+        self.stats = {
+            "api_calls": 0,
+            "repositories": 0,
+            "organizations": 0,
+            "rate_limit_wait": 0,
+        }
         log.bind(
             user_username=self.user.username,
             social_provider=self.provider_id,
@@ -145,61 +193,109 @@ class Service:
 
         return _updater
 
+    def track_response(self, response):
+        """
+        Count an API call, and pace the calls using the rate limit headers of `response`.
+
+        When the number of requests remaining for the token goes below
+        ``RTD_OAUTH_RATE_LIMIT_MIN_REMAINING``, wait until the rate limit
+        is reset (at most ``RTD_OAUTH_RATE_LIMIT_MAX_WAIT`` seconds).
+        """
+        self.stats["api_calls"] += 1
+        if not self.rate_limit_remaining_header:
+            return
+
+        try:
+            remaining = int(response.headers[self.rate_limit_remaining_header])
+            reset = int(response.headers[self.rate_limit_reset_header])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        if remaining > settings.RTD_OAUTH_RATE_LIMIT_MIN_REMAINING:
+            return
+
+        wait = min(max(reset - time.time(), 0), settings.RTD_OAUTH_RATE_LIMIT_MAX_WAIT)
+        log.info(
+            "Rate limit almost exhausted, waiting.",
+            rate_limit_remaining=remaining,
+            wait=round(wait, 2),
+        )
+        self.stats["rate_limit_wait"] += wait
+        time.sleep(wait)
+
     def paginate(self, url, **kwargs):
         """
-        Recursively combine results from service's pagination.
+        Iterate over the results from all the pages of service's pagination.
 
         :param url: start url to get the data from.
         :type url: unicode
         :param kwargs: optional parameters passed to .get() method
         :type kwargs: dict
         """
-        resp = None
-        try:
-            resp = self.get_session().get(url, params=kwargs)
-
-            # TODO: this check of the status_code would be better in the
-            # ``create_session`` method since it could be used from outside, but
-            # I didn't find a generic way to make a test request to each
-            # provider.
-            if resp.status_code == 401:
-                # Bad credentials: the token we have in our database is not
-                # valid. Probably the user has revoked the access to our App. He
-                # needs to reconnect his account
+        for results in self.get_pages(url, **kwargs):
+            yield from results
+
+    def get_pages(self, url, **kwargs):
+        """
+        Iterate over the pages of service's pagination.
+
+        Pages are requested as they are consumed,
+        so results can be processed without loading all of them in memory.
+
+        :param url: start url to get the data from.
+        :type url: unicode
+        :param kwargs: optional parameters passed to .get() method
+        :type kwargs: dict
+        :returns: a generator of lists of results.
+        """
+        while url:
+            resp = None
+            try:
+                resp = self.get_session().get(url, params=kwargs)
+                self.track_response(resp)
+
+                # TODO: this check of the status_code would be better in the
+                # ``create_session`` method since it could be used from outside, but
+                # I didn't find a generic way to make a test request to each
+                # provider.
+                if resp.status_code == 401:
+                    # Bad credentials: the token we have in our database is not
+                    # valid. Probably the user has revoked the access to our App. He
+                    # needs to reconnect his account
+                    raise SyncServiceError(
+                        SyncServiceError.INVALID_OR_REVOKED_ACCESS_TOKEN.format(
+                            provider=self.provider_name
+                        )
+                    )
+
+                results = self.get_paginated_results(resp)
+                url = self.get_next_url_to_paginate(resp)
+                # The next URL already includes the parameters.
+                kwargs = {}
+            # Catch specific exception related to OAuth
+            except InvalidClientIdError:
+                log.warning("access_token or refresh_token failed.", url=url)
                 raise SyncServiceError(
                     SyncServiceError.INVALID_OR_REVOKED_ACCESS_TOKEN.format(
                         provider=self.provider_name
                     )
                 )
-
-            next_url = self.get_next_url_to_paginate(resp)
-            results = self.get_paginated_results(resp)
-            if next_url:
-                results.extend(self.paginate(next_url))
-            return results
-        # Catch specific exception related to OAuth
-        except InvalidClientIdError:
-            log.warning("access_token or refresh_token failed.", url=url)
-            raise SyncServiceError(
-                SyncServiceError.INVALID_OR_REVOKED_ACCESS_TOKEN.format(
-                    provider=self.provider_name
+            # Catch exceptions with request or deserializing JSON
+            except (RequestException, ValueError):
+                # Response data should always be JSON, still try to log if not
+                # though
+                try:
+                    debug_data = resp.json() if resp else {}
+                except ValueError:
+                    debug_data = resp.content
+                log.debug(
+                    "Paginate failed at URL.",
+                    url=url,
+                    debug_data=debug_data,
                 )
-            )
-        # Catch exceptions with request or deserializing JSON
-        except (RequestException, ValueError):
-            # Response data should always be JSON, still try to log if not
-            # though
-            try:
-                debug_data = resp.json() if resp else {}
-            except ValueError:
-                debug_data = resp.content
-            log.debug(
-                "Paginate failed at URL.",
-                url=url,
-                debug_data=debug_data,
-            )
+                return
 
-        return []
+            yield results
 
     def sync(self):
         """
@@ -209,7 +305,11 @@ class Service:
         - updates fields for existing RemoteRepository/Organization
         - deletes old RemoteRepository/Organization that are not present
           for this user in the current provider
+
+        :returns: a dictionary with the number of API calls made,
+         and the number of repositories and organizations synced.
         """
+        start = time.monotonic()
         remote_repositories = self.sync_repositories()
         (
             remote_organizations,
@@ -221,30 +321,276 @@ class Service:
         all_remote_repositories = (
             remote_repositories + remote_repositories_organizations
         )
-        repository_remote_ids = [
+        repository_remote_ids = {
             r.remote_id for r in all_remote_repositories if r is not None
-        ]
-        (
-            self.user.remote_repository_relations.exclude(
-                remote_repository__remote_id__in=repository_remote_ids,
-                remote_repository__vcs_provider=self.vcs_provider_slug,
-            )
-            .filter(account=self.account)
-            .delete()
+        }
+        deleted_repository_relations = self._delete_stale_relations(
+            relations=self.user.remote_repository_relations,
+            relation_field="remote_repository",
+            remote_ids=repository_remote_ids,
         )
 
         # Delete RemoteOrganization where the user doesn't have access anymore
-        organization_remote_ids = [
+        organization_remote_ids = {
             o.remote_id for o in remote_organizations if o is not None
+        }
+        deleted_organization_relations = self._delete_stale_relations(
+            relations=self.user.remote_organization_relations,
+            relation_field="remote_organization",
+            remote_ids=organization_remote_ids,
+        )
+
+        duration = time.monotonic() - start
+        log.info(
+            "Remote repositories synced.",
+            vcs_provider=self.vcs_provider_slug,
+            api_calls=self.stats["api_calls"],
+            repositories=self.stats["repositories"],
+            organizations=self.stats["organizations"],
+            rate_limit_wait=round(self.stats["rate_limit_wait"], 2),
+            deleted_relations=deleted_repository_relations
+            + deleted_organization_relations,
+            duration=round(duration, 2),
+            repositories_per_second=round(
+                self.stats["repositories"] / duration if duration else 0, 2
+            ),
+        )
+        return self.stats
+
+    def _delete_stale_relations(self, relations, relation_field, remote_ids):
+        """
+        Delete the relations of the current account with objects not in `remote_ids`.
+
+        The diff is computed in Python,
+        instead of sending all the IDs back to the database.
+
+        :param relations: manager of the user's relations to filter.
+        :param relation_field: name of the field pointing to the remote object.
+        :param remote_ids: set of remote IDs the user still has access to.
+        :returns: the number of deleted relations.
+        """
+        stale_relations = [
+            pk
+            for pk, remote_id, vcs_provider in relations.filter(
+                account=self.account
+            ).values_list(
+                "pk",
+                f"{relation_field}__remote_id",
+                f"{relation_field}__vcs_provider",
+            )
+            if remote_id not in remote_ids or vcs_provider != self.vcs_provider_slug
         ]
-        (
-            self.user.remote_organization_relations.exclude(
-                remote_organization__remote_id__in=organization_remote_ids,
-                remote_organization__vcs_provider=self.vcs_provider_slug,
+        if stale_relations:
+            relations.model.objects.filter(pk__in=stale_relations).delete()
+        return len(stale_relations)
+
+    def get_remote_repository(self, fields, privacy=None, organization=None):
+        """
+        Get a RemoteRepository from the API response, without saving it.
+
+        :param fields: dictionary of response data from API
+        :param privacy: privacy level to support
+        :param organization: remote organization to associate with
+        :type organization: RemoteOrganization
+        :returns: a tuple with the unsaved RemoteRepository and a boolean indicating
+         if the user is admin of the repository (``None`` if it's unknown),
+         or ``None`` if the repository shouldn't be imported.
+        """
+        raise NotImplementedError
+
+    def get_remote_organization(self, fields):
+        """
+        Get a RemoteOrganization from the API response, without saving it.
+
+        :param fields: dictionary of response data from API
+        :rtype: RemoteOrganization
+        """
+        raise NotImplementedError
+
+    def create_repository(self, fields, privacy=None, organization=None):
+        """
+        Update or create a repository from the API response.
+
+        :param fields: dictionary of response data from API
+        :param privacy: privacy level to support
+        :param organization: remote organization to associate with
+        :type organization: RemoteOrganization
+        :rtype: RemoteRepository
+        """
+        remote_repositories = self.create_repositories(
+            [fields],
+            privacy=privacy,
+            organization=organization,
+        )
+        return remote_repositories[0] if remote_repositories else None
+
+    def create_repositories(self, repositories, privacy=None, organization=None):
+        """
+        Update or create repositories from a page of the API response.
+
+        :param repositories: list of dictionaries of response data from API
+        :param privacy: privacy level to support
+        :param organization: remote organization to associate with
+        :type organization: RemoteOrganization
+        :returns: list of the RemoteRepository objects that were imported
+        """
+        remote_repositories = []
+        for fields in repositories:
+            remote_repository = self.get_remote_repository(
+                fields,
+                privacy=privacy,
+                organization=organization,
+            )
+            if remote_repository:
+                remote_repositories.append(remote_repository)
+        return self._upsert_repositories(remote_repositories)
+
+    def _upsert_repositories(self, remote_repositories):
+        """
+        Update or create repositories and their relations with the user in bulk.
+
+        :param remote_repositories: list of tuples as returned by :py:meth:`get_remote_repository`.
+        :returns: list of the saved RemoteRepository objects.
+        """
+        # The same row can't be updated twice by the same query.
+        repositories = {}
+        admins = {}
+        for remote_repository, admin in remote_repositories:
+            repositories[remote_repository.remote_id] = remote_repository
+            admins[remote_repository.remote_id] = admin
+        if not repositories:
+            return []
+
+        if self.skip_repositories_from_other_organizations:
+            existing_organizations = RemoteRepository.objects.filter(
+                vcs_provider=self.vcs_provider_slug,
+                remote_id__in=repositories.keys(),
+                organization__isnull=False,
+            ).values_list("remote_id", "organization_id")
+            for remote_id, organization_id in existing_organizations:
+                if organization_id != repositories[remote_id].organization_id:
+                    log.debug(
+                        "Not importing repository because mismatched orgs.",
+                        repository=repositories[remote_id].name,
+                    )
+                    del repositories[remote_id]
+
+        RemoteRepository.objects.bulk_create(
+            repositories.values(),
+            update_conflicts=True,
+            unique_fields=["remote_id", "vcs_provider"],
+            update_fields=self.remote_repository_update_fields,
+        )
+        # Primary keys aren't set by ``bulk_create`` when updating conflicts.
+        saved_repositories = {
+            remote_repository.remote_id: remote_repository
+            for remote_repository in RemoteRepository.objects.filter(
+                vcs_provider=self.vcs_provider_slug,
+                remote_id__in=repositories.keys(),
+            ).select_related("organization")
+        }
+
+        relations = [
+            RemoteRepositoryRelation(
+                remote_repository=remote_repository,
+                user=self.user,
+                account=self.account,
+                admin=bool(admins[remote_id]),
             )
-            .filter(account=self.account)
-            .delete()
+            for remote_id, remote_repository in saved_repositories.items()
+        ]
+        # Don't override the admin field if we don't know its value.
+        RemoteRepositoryRelation.objects.bulk_create(
+            [
+                relation
+                for relation in relations
+                if admins[relation.remote_repository.remote_id] is not None
+            ],
+            update_conflicts=True,
+            unique_fields=["remote_repository", "account"],
+            update_fields=["admin", "modified"],
+        )
+        RemoteRepositoryRelation.objects.bulk_create(
+            [
+                relation
+                for relation in relations
+                if admins[relation.remote_repository.remote_id] is None
+            ],
+            ignore_conflicts=True,
+        )
+
+        self.stats["repositories"] += len(saved_repositories)
+        return [
+            saved_repositories[remote_id]
+            for remote_id in repositories
+            if remote_id in saved_repositories
+        ]
+
+    def create_organization(self, fields, create_user_relationship=True):
+        """
+        Update or create a remote organization from the API response.
+
+        :param fields: dictionary response of data from API
+        :param bool create_user_relationship: Whether to create a remote relationship between the
+         organization and the current user. If `False`, only the `RemoteOrganization` object
+         will be created/updated.
+        :rtype: RemoteOrganization
+        """
+        return self.create_organizations(
+            [fields],
+            create_user_relationship=create_user_relationship,
+        )[0]
+
+    def create_organizations(self, organizations, create_user_relationship=True):
+        """
+        Update or create remote organizations from a page of the API response in bulk.
+
+        :param organizations: list of dictionaries of response data from API
+        :param bool create_user_relationship: Whether to create a remote relationship between the
+         organizations and the current user.
+        :returns: list of the saved RemoteOrganization objects.
+        """
+        remote_organizations = {}
+        for fields in organizations:
+            remote_organization = self.get_remote_organization(fields)
+            remote_organizations[remote_organization.remote_id] = remote_organization
+        if not remote_organizations:
+            return []
+
+        RemoteOrganization.objects.bulk_create(
+            remote_organizations.values(),
+            update_conflicts=True,
+            unique_fields=["remote_id", "vcs_provider"],
+            update_fields=self.remote_organization_update_fields,
         )
+        # Primary keys aren't set by ``bulk_create`` when updating conflicts.
+        saved_organizations = {
+            remote_organization.remote_id: remote_organization
+            for remote_organization in RemoteOrganization.objects.filter(
+                vcs_provider=self.vcs_provider_slug,
+                remote_id__in=remote_organizations.keys(),
+            )
+        }
+
+        if create_user_relationship:
+            RemoteOrganizationRelation.objects.bulk_create(
+                [
+                    RemoteOrganizationRelation(
+                        remote_organization=remote_organization,
+                        user=self.user,
+                        account=self.account,
+                    )
+                    for remote_organization in saved_organizations.values()
+                ],
+                ignore_conflicts=True,
+            )
+
+        self.stats["organizations"] += len(saved_organizations)
+        return [
+            saved_organizations[remote_id]
+            for remote_id in remote_organizations
+            if remote_id in saved_organizations
+        ]
 
     def get_next_url_to_paginate(self, response):
         """
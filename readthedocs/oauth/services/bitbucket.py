@@ -29,6 +29,7 @@ class BitbucketService(Service):
     url_pattern = re.compile(r"bitbucket.org")
     https_url_pattern = re.compile(r"^https:\/\/[^@]+@bitbucket.org/")
     vcs_provider_slug = BITBUCKET
+    skip_repositories_from_other_organizations = True
 
     def sync_repositories(self):
         """Sync repositories from Bitbucket API."""
@@ -36,13 +37,12 @@ class BitbucketService(Service):
 
         # Get user repos
         try:
-            repos = self.paginate(
+            pages = self.get_pages(
                 "https://bitbucket.org/api/2.0/repositories/",
                 role="member",
             )
-            for repo in repos:
-                remote_repository = self.create_repository(repo)
-                remote_repositories.append(remote_repository)
+            for repos in pages:
+                remote_repositories.extend(self.create_repositories(repos))
 
         except (TypeError, ValueError):
             log.warning("Error syncing Bitbucket repositories")
@@ -60,15 +60,12 @@ class BitbucketService(Service):
                 "https://bitbucket.org/api/2.0/repositories/",
                 role="admin",
             )
-            admin_repo_relations = RemoteRepositoryRelation.objects.filter(
+            RemoteRepositoryRelation.objects.filter(
                 user=self.user,
                 account=self.account,
                 remote_repository__vcs_provider=self.vcs_provider_slug,
                 remote_repository__remote_id__in=[r["uuid"] for r in resp],
-            )
-            for remote_repository_relation in admin_repo_relations:
-                remote_repository_relation.admin = True
-                remote_repository_relation.save()
+            ).update(admin=True)
         except (TypeError, ValueError):
             pass
 
@@ -86,16 +83,17 @@ class BitbucketService(Service):
             )
             for workspace in workspaces:
                 remote_organization = self.create_organization(workspace)
-                repos = self.paginate(workspace["links"]["repositories"]["href"])
+                pages = self.get_pages(workspace["links"]["repositories"]["href"])
 
                 remote_organizations.append(remote_organization)
 
-                for repo in repos:
-                    remote_repository = self.create_repository(
-                        repo,
-                        organization=remote_organization,
+                for repos in pages:
+                    remote_repositories.extend(
+                        self.create_repositories(
+                            repos,
+                            organization=remote_organization,
+                        )
                     )
-                    remote_repositories.append(remote_repository)
 
         except ValueError:
             log.warning("Error syncing Bitbucket organizations")
@@ -107,9 +105,9 @@ class BitbucketService(Service):
 
         return remote_organizations, remote_repositories
 
-    def create_repository(self, fields, privacy=None, organization=None):
+    def get_remote_repository(self, fields, privacy=None, organization=None):
         """
-        Update or create a repository from Bitbucket API response.
+        Get a repository from Bitbucket API response, without saving it.
 
         .. note::
             The :py:data:`admin` property is not set during creation, as
@@ -120,7 +118,8 @@ class BitbucketService(Service):
         :param privacy: privacy level to support
         :param organization: remote organization to associate with
         :type organization: RemoteOrganization
-        :rtype: RemoteRepository
+        :returns: a tuple with the unsaved RemoteRepository and ``None``,
+         or ``None`` if the repository shouldn't be imported.
         """
         privacy = privacy or settings.DEFAULT_PRIVACY_LEVEL
         if any(
@@ -129,18 +128,10 @@ class BitbucketService(Service):
                 (fields["is_private"] is False and privacy == "public"),
             ]
         ):
-            repo, _ = RemoteRepository.objects.get_or_create(
-                remote_id=fields["uuid"], vcs_provider=self.vcs_provider_slug
+            repo = RemoteRepository(
+                remote_id=fields["uuid"],
+                vcs_provider=self.vcs_provider_slug,
             )
-            repo.get_remote_repository_relation(self.user, self.account)
-
-            if repo.organization and repo.organization != organization:
-                log.debug(
-                    "Not importing repository because mismatched orgs.",
-                    repository=fields["name"],
-                )
-                return None
-
             repo.organization = organization
             repo.name = fields["name"]
             repo.full_name = fields["full_name"]
@@ -167,27 +158,24 @@ class BitbucketService(Service):
             if not repo.avatar_url:
                 repo.avatar_url = self.default_user_avatar_url
 
-            repo.save()
-
-            return repo
+            return repo, None
 
         log.debug(
             "Not importing repository because mismatched type.",
             repository=fields["name"],
         )
 
-    def create_organization(self, fields):
+    def get_remote_organization(self, fields):
         """
-        Update or create remote organization from Bitbucket API response.
+        Get a remote organization from Bitbucket API response, without saving it.
 
         :param fields: dictionary response of data from API
         :rtype: RemoteOrganization
         """
-        organization, _ = RemoteOrganization.objects.get_or_create(
-            remote_id=fields["uuid"], vcs_provider=self.vcs_provider_slug
+        organization = RemoteOrganization(
+            remote_id=fields["uuid"],
+            vcs_provider=self.vcs_provider_slug,
         )
-        organization.get_remote_organization_relation(self.user, self.account)
-
         organization.slug = fields.get("slug")
         organization.name = fields.get("name")
         organization.url = fields["links"]["html"]["href"]
@@ -195,8 +183,6 @@ class BitbucketService(Service):
         if not organization.avatar_url:
             organization.avatar_url = self.default_org_avatar_url
 
-        organization.save()
-
         return organization
 
     def get_next_url_to_paginate(self, response):
@@ -28,16 +28,17 @@ class GitHubService(Service):
     # TODO replace this with a less naive check
     url_pattern = re.compile(r"github\.com")
     vcs_provider_slug = GITHUB
+    rate_limit_remaining_header = "X-RateLimit-Remaining"
+    rate_limit_reset_header = "X-RateLimit-Reset"
 
     def sync_repositories(self):
         """Sync repositories from GitHub API."""
         remote_repositories = []
 
         try:
-            repos = self.paginate("https://api.github.com/user/repos", per_page=100)
-            for repo in repos:
-                remote_repository = self.create_repository(repo)
-                remote_repositories.append(remote_repository)
+            pages = self.get_pages("https://api.github.com/user/repos", per_page=100)
+            for repos in pages:
+                remote_repositories.extend(self.create_repositories(repos))
         except (TypeError, ValueError):
             log.warning("Error syncing GitHub repositories")
             raise SyncServiceError(
@@ -55,7 +56,9 @@ class GitHubService(Service):
         try:
             orgs = self.paginate("https://api.github.com/user/orgs", per_page=100)
             for org in orgs:
-                org_details = self.get_session().get(org["url"]).json()
+                resp = self.get_session().get(org["url"])
+                self.track_response(resp)
+                org_details = resp.json()
                 remote_organization = self.create_organization(
                     org_details,
                     create_user_relationship=True,
@@ -63,13 +66,12 @@ class GitHubService(Service):
                 remote_organizations.append(remote_organization)
 
                 org_url = org["url"]
-                org_repos = self.paginate(
+                pages = self.get_pages(
                     f"{org_url}/repos",
                     per_page=100,
                 )
-                for repo in org_repos:
-                    remote_repository = self.create_repository(repo)
-                    remote_repositories.append(remote_repository)
+                for org_repos in pages:
+                    remote_repositories.extend(self.create_repositories(org_repos))
 
         except (TypeError, ValueError):
             log.warning("Error syncing GitHub organizations")
@@ -81,15 +83,58 @@ class GitHubService(Service):
 
         return remote_organizations, remote_repositories
 
-    def create_repository(self, fields, privacy=None):
+    def create_repositories(self, repositories, privacy=None, organization=None):
+        """
+        Update or create repositories from a page of the GitHub API response.
+
+        The organization of each repository is the owner of the repository,
+        the ``organization`` argument is ignored.
+
+        :param repositories: list of dictionaries of response data from API
+        :param privacy: privacy level to support
+        :returns: list of the RemoteRepository objects that were imported
+        """
+        remote_repositories = []
+        owners = {}
+        for fields in repositories:
+            remote_repository = self.get_remote_repository(fields, privacy=privacy)
+            if remote_repository:
+                remote_repositories.append(remote_repository)
+                if fields["owner"]["type"] == "Organization":
+                    owners[str(fields["id"])] = fields["owner"]
+
+        # We aren't creating a remote relationship between the current user
+        # and the organization, since the user can have access to the repository,
+        # but not to the organization.
+        organizations = {
+            remote_organization.remote_id: remote_organization
+            for remote_organization in self.create_organizations(
+                owners.values(),
+                create_user_relationship=False,
+            )
+        }
+
+        # If there is an organization associated with the repository,
+        # attach the organization to the repository.
+        for remote_repository, _ in remote_repositories:
+            owner = owners.get(remote_repository.remote_id)
+            if owner:
+                remote_repository.organization = organizations[str(owner["id"])]
+
+        return self._upsert_repositories(remote_repositories)
+
+    def get_remote_repository(self, fields, privacy=None, organization=None):
         """
-        Update or create a repository from GitHub API response.
+        Get a repository from GitHub API response, without saving it.
 
         :param fields: dictionary of response data from API
         :param privacy: privacy level to support
-        :param organization: remote organization to associate with
+        :param organization: remote organization to associate with,
+         if the owner of the repository is an organization.
         :type organization: RemoteOrganization
-        :rtype: RemoteRepository
+        :returns: a tuple with the unsaved RemoteRepository and a boolean indicating
+         if the user is admin of the repository, or ``None`` if the repository
+         shouldn't be imported.
         """
         privacy = privacy or settings.DEFAULT_PRIVACY_LEVEL
         if any(
@@ -98,44 +143,15 @@ class GitHubService(Service):
                 (fields["private"] is False and privacy == "public"),
             ]
         ):
-            repo, created = RemoteRepository.objects.get_or_create(
+            repo = RemoteRepository(
                 remote_id=str(fields["id"]),
                 vcs_provider=self.vcs_provider_slug,
             )
 
-            # TODO: For debugging: https://github.com/readthedocs/readthedocs.org/pull/9449.
-            if created:
-                _old_remote_repository = RemoteRepository.objects.filter(
-                    full_name=fields["full_name"], vcs_provider=self.vcs_provider_slug
-                ).first()
-                if _old_remote_repository:
-                    log.warning(
-                        "GitHub repository created with different remote_id but exact full_name.",
-                        fields=fields,
-                        old_remote_repository=_old_remote_repository.__dict__,
-                        imported=_old_remote_repository.projects.exists(),
-                    )
-
-            owner_type = fields["owner"]["type"]
-            organization = None
-            if owner_type == "Organization":
-                # We aren't creating a remote relationship between the current user
-                # and the organization, since the user can have access to the repository,
-                # but not to the organization.
-                organization = self.create_organization(
-                    fields=fields["owner"],
-                    create_user_relationship=False,
-                )
-
-            # If there is an organization associated with this repository,
-            # attach the organization to the repository.
-            if organization and owner_type == "Organization":
-                repo.organization = organization
-
             # If the repository belongs to a user,
-            # remove the organization linked to the repository.
-            if owner_type == "User":
-                repo.organization = None
+            # it isn't linked to an organization.
+            if fields["owner"]["type"] == "Organization":
+                repo.organization = organization
 
             repo.name = fields["name"]
             repo.full_name = fields["full_name"]
@@ -155,40 +171,25 @@ class GitHubService(Service):
             if not repo.avatar_url:
                 repo.avatar_url = self.default_user_avatar_url
 
-            repo.save()
-
-            remote_repository_relation = repo.get_remote_repository_relation(
-                self.user, self.account
-            )
-            remote_repository_relation.admin = fields.get("permissions", {}).get(
-                "admin", False
-            )
-            remote_repository_relation.save()
-
-            return repo
+            admin = fields.get("permissions", {}).get("admin", False)
+            return repo, admin
 
         log.debug(
             "Not importing repository because mismatched type.",
             repository=fields["name"],
         )
 
-    def create_organization(self, fields, create_user_relationship=False):
+    def get_remote_organization(self, fields):
         """
-        Update or create remote organization from GitHub API response.
+        Get a remote organization from GitHub API response, without saving it.
 
         :param fields: dictionary response of data from API
-        :param bool create_relationship: Whether to create a remote relationship between the
-         organization and the current user. If `False`, only the `RemoteOrganization` object
-         will be created/updated.
         :rtype: RemoteOrganization
         """
-        organization, _ = RemoteOrganization.objects.get_or_create(
+        organization = RemoteOrganization(
             remote_id=str(fields["id"]),
             vcs_provider=self.vcs_provider_slug,
         )
-        if create_user_relationship:
-            organization.get_remote_organization_relation(self.user, self.account)
-
         organization.url = fields.get("html_url")
         # fields['login'] contains GitHub Organization slug
         organization.slug = fields.get("login")
@@ -199,8 +200,6 @@ class GitHubService(Service):
         if not organization.avatar_url:
             organization.avatar_url = self.default_org_avatar_url
 
-        organization.save()
-
         return organization
 
     def get_next_url_to_paginate(self, response):
@@ -43,6 +43,9 @@ class GitLabService(Service):
     PERMISSION_OWNER = 50
 
     vcs_provider_slug = GITLAB
+    skip_repositories_from_other_organizations = True
+    rate_limit_remaining_header = "RateLimit-Remaining"
+    rate_limit_reset_header = "RateLimit-Reset"
 
     def _get_repo_id(self, project):
         """
@@ -72,7 +75,7 @@ class GitLabService(Service):
     def sync_repositories(self):
         remote_repositories = []
         try:
-            repos = self.paginate(
+            pages = self.get_pages(
                 "{url}/api/v4/projects".format(url=self.adapter.provider_base_url),
                 per_page=100,
                 archived=False,
@@ -81,9 +84,8 @@ class GitLabService(Service):
                 membership=True,
             )
 
-            for repo in repos:
-                remote_repository = self.create_repository(repo)
-                remote_repositories.append(remote_repository)
+            for repos in pages:
+                remote_repositories.extend(self.create_repositories(repos))
         except (TypeError, ValueError):
             log.warning("Error syncing GitLab repositories")
             raise SyncServiceError(
@@ -108,7 +110,7 @@ class GitLabService(Service):
             )
             for org in orgs:
                 remote_organization = self.create_organization(org)
-                org_repos = self.paginate(
+                pages = self.get_pages(
                     "{url}/api/v4/groups/{id}/projects".format(
                         url=self.adapter.provider_base_url,
                         id=org["id"],
@@ -121,37 +123,43 @@ class GitLabService(Service):
 
                 remote_organizations.append(remote_organization)
 
-                for repo in org_repos:
-                    # TODO: Optimize this so that we don't re-fetch project data
-                    # Details: https://github.com/readthedocs/readthedocs.org/issues/7743
-                    try:
-                        # The response from /groups/{id}/projects API does not contain
-                        # admin permission fields for GitLab projects.
-                        # So, fetch every single project data from the API
-                        # which contains the admin permission fields.
-                        resp = self.get_session().get(
-                            "{url}/api/v4/projects/{id}".format(
-                                url=self.adapter.provider_base_url, id=repo["id"]
+                for org_repos in pages:
+                    repos_details = []
+                    for repo in org_repos:
+                        # TODO: Optimize this so that we don't re-fetch project data
+                        # Details: https://github.com/readthedocs/readthedocs.org/issues/7743
+                        try:
+                            # The response from /groups/{id}/projects API does not contain
+                            # admin permission fields for GitLab projects.
+                            # So, fetch every single project data from the API
+                            # which contains the admin permission fields.
+                            resp = self.get_session().get(
+                                "{url}/api/v4/projects/{id}".format(
+                                    url=self.adapter.provider_base_url, id=repo["id"]
+                                )
                             )
-                        )
-
-                        if resp.status_code == 200:
-                            repo_details = resp.json()
-                            remote_repository = self.create_repository(
-                                repo_details, organization=remote_organization
-                            )
-                            remote_repositories.append(remote_repository)
-                        else:
-                            log.warning(
-                                "GitLab project does not exist or user does not have permissions.",
+                            self.track_response(resp)
+
+                            if resp.status_code == 200:
+                                repos_details.append(resp.json())
+                            else:
+                                log.warning(
+                                    "GitLab project does not exist or user does not have permissions.",
+                                    repository=repo["name_with_namespace"],
+                                )
+
+                        except Exception:
+                            log.exception(
+                                "Error fetching GitLab repository",
                                 repository=repo["name_with_namespace"],
                             )
 
-                    except Exception:
-                        log.exception(
-                            "Error creating GitLab repository",
-                            repository=repo["name_with_namespace"],
+                    remote_repositories.extend(
+                        self.create_repositories(
+                            repos_details,
+                            organization=remote_organization,
                         )
+                    )
 
         except (TypeError, ValueError):
             log.warning("Error syncing GitLab organizations")
@@ -163,9 +171,9 @@ class GitLabService(Service):
 
         return remote_organizations, remote_repositories
 
-    def create_repository(self, fields, privacy=None, organization=None):
+    def get_remote_repository(self, fields, privacy=None, organization=None):
         """
-        Update or create a repository from GitLab API response.
+        Get a repository from GitLab API response, without saving it.
 
         ``admin`` field is computed using the ``permissions`` fields from the
         repository response. The permission from GitLab is given by an integer:
@@ -181,25 +189,17 @@ class GitLabService(Service):
         :param privacy: privacy level to support
         :param organization: remote organization to associate with
         :type organization: RemoteOrganization
-        :rtype: RemoteRepository
+        :returns: a tuple with the unsaved RemoteRepository and a boolean indicating
+         if the user is admin of the repository, or ``None`` if the repository
+         shouldn't be imported.
         """
         privacy = privacy or settings.DEFAULT_PRIVACY_LEVEL
         repo_is_public = fields["visibility"] == "public"
         if privacy == "private" or (repo_is_public and privacy == "public"):
-            repo, _ = RemoteRepository.objects.get_or_create(
-                remote_id=fields["id"], vcs_provider=self.vcs_provider_slug
+            repo = RemoteRepository(
+                remote_id=str(fields["id"]),
+                vcs_provider=self.vcs_provider_slug,
             )
-            remote_repository_relation = repo.get_remote_repository_relation(
-                self.user, self.account
-            )
-
-            if repo.organization and repo.organization != organization:
-                log.debug(
-                    "Not importing because mismatched orgs",
-                    repository=fields["name"],
-                )
-                return None
-
             repo.organization = organization
             repo.name = fields["name"]
             repo.full_name = fields["path_with_namespace"]
@@ -221,8 +221,6 @@ class GitLabService(Service):
             else:
                 repo.clone_url = fields["http_url_to_repo"]
 
-            repo.save()
-
             project_access_level = group_access_level = self.PERMISSION_NO_ACCESS
 
             project_access = fields.get("permissions", {}).get("project_access", {})
@@ -237,7 +235,7 @@ class GitLabService(Service):
                     "access_level", self.PERMISSION_NO_ACCESS
                 )
 
-            remote_repository_relation.admin = any(
+            admin = any(
                 [
                     project_access_level
                     in (self.PERMISSION_MAINTAINER, self.PERMISSION_OWNER),
@@ -245,9 +243,7 @@ class GitLabService(Service):
                     in (self.PERMISSION_MAINTAINER, self.PERMISSION_OWNER),
                 ]
             )
-            remote_repository_relation.save()
-
-            return repo
+            return repo, admin
 
         log.info(
             "Not importing repository because mismatched type.",
@@ -255,18 +251,17 @@ class GitLabService(Service):
             visibility=fields["visibility"],
         )
 
-    def create_organization(self, fields):
+    def get_remote_organization(self, fields):
         """
-        Update or create remote organization from GitLab API response.
+        Get a remote organization from GitLab API response, without saving it.
 
         :param fields: dictionary response of data from API
         :rtype: RemoteOrganization
         """
-        organization, _ = RemoteOrganization.objects.get_or_create(
-            remote_id=fields["id"], vcs_provider=self.vcs_provider_slug
+        organization = RemoteOrganization(
+            remote_id=str(fields["id"]),
+            vcs_provider=self.vcs_provider_slug,
         )
-        organization.get_remote_organization_relation(self.user, self.account)
-
         organization.name = fields.get("name")
         organization.slug = fields.get("path")
         organization.url = "{url}/{path}".format(
@@ -278,8 +273,6 @@ class GitLabService(Service):
         if not organization.avatar_url:
             organization.avatar_url = self.default_user_avatar_url
 
-        organization.save()
-
         return organization
 
     def get_webhook_data(self, repo_id, project, integration):
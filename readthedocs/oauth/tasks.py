@@ -1,10 +1,18 @@
 """Tasks for OAuth services."""
 
 import datetime
+import math
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 import structlog
 from allauth.socialaccount.providers import registry as allauth_registry
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
 from django.db.models.functions import ExtractIsoWeekDay
 from django.urls import reverse
 from django.utils import timezone
@@ -44,6 +52,21 @@ def sync_remote_repositories(user_id):
     if not user:
         return
 
+    failed_services = _sync_user_remote_repositories(user)
+    if failed_services:
+        raise SyncServiceError(
+            SyncServiceError.INVALID_OR_REVOKED_ACCESS_TOKEN.format(
+                provider=", ".join(failed_services)
+            )
+        )
+
+
+def _sync_user_remote_repositories(user):
+    """
+    Sync the remote repositories from all the accounts connected by `user`.
+
+    :returns: a set with the names of the providers that failed to sync.
+    """
     failed_services = set()
     for service_cls in registry:
         for service in service_cls.for_user(user):
@@ -51,12 +74,7 @@ def sync_remote_repositories(user_id):
                 service.sync()
             except SyncServiceError:
                 failed_services.add(service.provider_name)
-    if failed_services:
-        raise SyncServiceError(
-            SyncServiceError.INVALID_OR_REVOKED_ACCESS_TOKEN.format(
-                provider=", ".join(failed_services)
-            )
-        )
+    return failed_services
 
 
 @app.task(queue="web")
@@ -105,11 +123,7 @@ def sync_remote_repositories_organizations(organization_slugs=None):
             )
 
 
-@app.task(
-    queue="web",
-    time_limit=60 * 60 * 3,  # 3h
-    soft_time_limit=(60 * 60 * 3) - 5 * 60,  # 2h 55m
-)
+@app.task(queue="web")
 def sync_active_users_remote_repositories():
     """
     Sync ``RemoteRepository`` for active users.
@@ -120,37 +134,193 @@ def sync_active_users_remote_repositories():
     last login of the user with today's weekday. If they match, the re-sync is
     triggered. This logic guarantees us the re-sync to be done once a week per user.
 
-    Note this is a long running task syncronizhing all the users in the same Celery process,
-    and it will require a pretty high ``time_limit`` and ``soft_time_limit``.
+    Users are split in batches of ``RTD_SYNC_REMOTE_REPOSITORIES_BATCH_SIZE``,
+    each batch is synced by a ``sync_users_remote_repositories`` task.
     """
     today_weekday = timezone.now().isoweekday()
     three_months_ago = timezone.now() - datetime.timedelta(days=90)
-    users = User.objects.annotate(weekday=ExtractIsoWeekDay("last_login")).filter(
-        last_login__gt=three_months_ago,
-        socialaccount__isnull=False,
-        weekday=today_weekday,
+    user_ids = list(
+        User.objects.annotate(weekday=ExtractIsoWeekDay("last_login"))
+        .filter(
+            last_login__gt=three_months_ago,
+            socialaccount__isnull=False,
+            weekday=today_weekday,
+        )
+        .distinct()
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+    batch_size = settings.RTD_SYNC_REMOTE_REPOSITORIES_BATCH_SIZE
+    log.info(
+        "Triggering re-sync of RemoteRepository for active users.",
+        total_users=len(user_ids),
+        batches=math.ceil(len(user_ids) / batch_size),
     )
+    for i in range(0, len(user_ids), batch_size):
+        sync_users_remote_repositories.delay(user_ids[i : i + batch_size])
 
-    users_count = users.count()
-    log.bind(total_users=users_count)
-    log.info("Triggering re-sync of RemoteRepository for active users.")
 
-    for i, user in enumerate(users):
-        log.bind(
+def _get_synced_user_cache_key(user_id):
+    return f"oauth-sync-remote-repositories-synced-{user_id}"
+
+
+def _get_started_user_cache_key(user_id):
+    return f"oauth-sync-remote-repositories-started-{user_id}"
+
+
+def _start_user_sync(user_id):
+    """
+    Checkpoint that the sync of `user_id` was started.
+
+    :returns: the number of times the sync of the user was started.
+    """
+    key = _get_started_user_cache_key(user_id)
+    cache.add(
+        key, 0, timeout=settings.RTD_SYNC_REMOTE_REPOSITORIES_CHECKPOINT_TIMEOUT
+    )
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # The key expired between the two calls.
+        return 1
+
+
+def _sync_user_remote_repositories_in_thread(user):
+    """Sync the remote repositories of `user` from a thread of ``sync_users_remote_repositories``."""
+    try:
+        failed_services = _sync_user_remote_repositories(user)
+        if failed_services:
+            log.info(
+                "Some services failed to re-sync RemoteRepository.",
+                user_username=user.username,
+                failed_services=sorted(failed_services),
+            )
+    except Exception:
+        log.exception(
+            "There was a problem re-syncing RemoteRepository.",
             user_username=user.username,
-            progress=f"{i}/{users_count}",
         )
+    finally:
+        # Each thread opens its own database connection.
+        connection.close()
+
+
+@app.task(
+    queue="web",
+    # Re-deliver the batch if the worker is killed (e.g. by the time limit or OOM),
+    # users that were already synced, or that were started too many times, are skipped.
+    acks_late=True,
+    reject_on_worker_lost=True,
+    # No users are started after the time budget of the batch,
+    # give some time to the ones in progress to finish.
+    time_limit=settings.RTD_SYNC_REMOTE_REPOSITORIES_BATCH_TIME_BUDGET + 15 * 60,
+    soft_time_limit=settings.RTD_SYNC_REMOTE_REPOSITORIES_BATCH_TIME_BUDGET
+    + 10 * 60,
+)
+def sync_users_remote_repositories(user_ids):
+    """
+    Sync ``RemoteRepository`` for a batch of users.
 
-        # Log an update every 50 users
-        if i % 50 == 0:
-            log.info("Progress on re-syncing RemoteRepository for active users.")
+    Users are synced concurrently by ``RTD_SYNC_REMOTE_REPOSITORIES_WORKERS`` threads.
+    Provider rate limits are per user token, so users don't compete for them.
+
+    Each synced user is checkpointed in the cache, so a batch that is re-delivered
+    after its worker was killed continues where it stopped.
+    Users whose sync was started ``RTD_SYNC_REMOTE_REPOSITORIES_MAX_ATTEMPTS`` times
+    without finishing are skipped, so a user that hangs the worker
+    doesn't make the batch be re-delivered forever.
+    Users that weren't started after ``RTD_SYNC_REMOTE_REPOSITORIES_BATCH_TIME_BUDGET``
+    seconds are moved to a new task.
+
+    :param user_ids: list of IDs of the users to sync.
+    """
+    start = time.monotonic()
+    max_attempts = settings.RTD_SYNC_REMOTE_REPOSITORIES_MAX_ATTEMPTS
+    checkpoints = cache.get_many(
+        [_get_synced_user_cache_key(user_id) for user_id in user_ids]
+        + [_get_started_user_cache_key(user_id) for user_id in user_ids]
+    )
+    synced_user_ids = [
+        user_id
+        for user_id in user_ids
+        if _get_synced_user_cache_key(user_id) in checkpoints
+    ]
+    abandoned_user_ids = [
+        user_id
+        for user_id in user_ids
+        if user_id not in synced_user_ids
+        and checkpoints.get(_get_started_user_cache_key(user_id), 0) >= max_attempts
+    ]
+    log.bind(total_users=len(user_ids))
+    if abandoned_user_ids:
+        log.warning(
+            "Skipping users whose re-sync of RemoteRepository didn't finish.",
+            user_ids=abandoned_user_ids,
+            max_attempts=max_attempts,
+        )
+    pending_users = deque(
+        User.objects.filter(pk__in=user_ids)
+        .exclude(pk__in=synced_user_ids + abandoned_user_ids)
+        .order_by("pk")
+    )
+    log.info(
+        "Re-syncing RemoteRepository for a batch of users.",
+        pending_users=len(pending_users),
+    )
 
+    workers = settings.RTD_SYNC_REMOTE_REPOSITORIES_WORKERS
+    time_budget = settings.RTD_SYNC_REMOTE_REPOSITORIES_BATCH_TIME_BUDGET
+    synced_users = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {}
         try:
-            # NOTE: sync all the users/repositories in the same Celery process.
-            # Do not trigger a new task per user.
-            sync_remote_repositories(user.pk)
-        except Exception:
-            log.exception("There was a problem re-syncing RemoteRepository.")
+            while pending_users or futures:
+                while (
+                    pending_users
+                    and len(futures) < workers
+                    and time.monotonic() - start < time_budget
+                ):
+                    user = pending_users.popleft()
+                    _start_user_sync(user.pk)
+                    future = executor.submit(
+                        _sync_user_remote_repositories_in_thread, user
+                    )
+                    futures[future] = user
+                if not futures:
+                    break
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    user = futures.pop(future)
+                    cache.set(
+                        _get_synced_user_cache_key(user.pk),
+                        True,
+                        timeout=settings.RTD_SYNC_REMOTE_REPOSITORIES_CHECKPOINT_TIMEOUT,
+                    )
+                    synced_users += 1
+        except SoftTimeLimitExceeded:
+            # Move the users that weren't started to a new task right away,
+            # the ones in progress can still finish before the hard time limit.
+            log.warning(
+                "Time limit exceeded while re-syncing RemoteRepository for a batch of users.",
+                in_progress_users=len(futures),
+                remaining_users=len(pending_users),
+            )
+            if pending_users:
+                sync_users_remote_repositories.delay(
+                    [user.pk for user in pending_users]
+                )
+                pending_users.clear()
+
+    log.info(
+        "Finished re-syncing RemoteRepository for a batch of users.",
+        synced_users=synced_users,
+        remaining_users=len(pending_users),
+        duration=round(time.monotonic() - start, 2),
+    )
+    if pending_users:
+        sync_users_remote_repositories.delay([user.pk for user in pending_users])
 
 
 @app.task(queue="web")
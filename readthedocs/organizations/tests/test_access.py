@@ -1,8 +1,12 @@
+from unittest import mock
+
 import django_dynamic_fixture as fixture
 from django.contrib.auth.models import User
 from django.test import TestCase, override_settings
 
+from readthedocs.core.permissions import AdminPermission, AdminPermissionBase
 from readthedocs.invitations.models import Invitation
+from readthedocs.organizations.constants import ADMIN_ACCESS, READ_ONLY_ACCESS
 from readthedocs.organizations.models import Organization, OrganizationOwner, Team
 from readthedocs.projects.models import Project
 from readthedocs.rtd_tests.utils import create_user
@@ -249,3 +253,81 @@ class OrganizationNonmemberAccess(OrganizationAccessMixin, TestCase):
 
     def is_admin(self):
         return False
+
+
+@override_settings(RTD_ALLOW_ORGANIZATIONS=True)
+class AdminPermissionProjectsTests(TestCase):
+    def setUp(self):
+        self.user = fixture.get(User)
+        self.owned_project = fixture.get(Project)
+        self.admin_project = fixture.get(Project)
+        self.member_project = fixture.get(Project)
+        self.sso_project = fixture.get(Project)
+        fixture.get(Project)
+
+        fixture.get(
+            Organization,
+            owners=[self.user],
+            projects=[self.owned_project],
+        )
+        organization = fixture.get(
+            Organization,
+            projects=[self.admin_project, self.member_project],
+        )
+        fixture.get(
+            Team,
+            organization=organization,
+            access=ADMIN_ACCESS,
+            members=[self.user],
+            projects=[self.admin_project],
+        )
+        fixture.get(
+            Team,
+            organization=organization,
+            access=READ_ONLY_ACCESS,
+            members=[self.user],
+            projects=[self.admin_project, self.member_project],
+        )
+        self.sso_organization = fixture.get(
+            Organization,
+            owners=[self.user],
+            projects=[self.sso_project],
+        )
+        fixture.get(
+            Team,
+            organization=self.sso_organization,
+            access=ADMIN_ACCESS,
+            members=[self.user],
+            projects=[self.sso_project],
+        )
+
+    def test_projects(self):
+        with mock.patch.object(
+            AdminPermissionBase,
+            "has_sso_enabled",
+            side_effect=lambda obj, provider=None: obj == self.sso_organization,
+        ):
+            self.assertEqual(
+                set(AdminPermission.projects(self.user, admin=True)),
+                {self.owned_project, self.admin_project},
+            )
+            self.assertEqual(
+                set(AdminPermission.projects(self.user, member=True)),
+                {self.admin_project, self.member_project},
+            )
+            projects = AdminPermission.projects(self.user, admin=True, member=True)
+            self.assertEqual(
+                sorted(projects.values_list("pk", flat=True)),
+                sorted(
+                    [
+                        self.owned_project.pk,
+                        self.admin_project.pk,
+                        self.member_project.pk,
+                    ]
+                ),
+            )
+
+        self.assertIn(
+            self.sso_project, AdminPermission.projects(self.user, admin=True)
+        )
+        self.assertFalse(AdminPermission.projects(self.user))
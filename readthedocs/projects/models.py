@@ -3,6 +3,7 @@ import fnmatch
 import hashlib
 import hmac
 import os
+import time
 from shlex import quote
 from urllib.parse import urlparse
 
@@ -11,6 +12,7 @@ from allauth.socialaccount.providers import registry as allauth_registry
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericRelation
+from django.core.cache import cache
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.db.models import Prefetch
@@ -34,6 +36,7 @@ from readthedocs.builds.constants import (
 from readthedocs.core.history import ExtraHistoricalRecords
 from readthedocs.core.resolver import Resolver
 from readthedocs.core.utils import extract_valid_attributes_for_model, slugify
+from readthedocs.core.utils.cache import LocalLRUCache
 from readthedocs.core.utils.url import unsafe_join_url_path
 from readthedocs.domains.querysets import DomainQueryset
 from readthedocs.notifications.models import Notification as NewNotification
@@ -1367,6 +1370,36 @@ class Project(models.Model):
     def features(self):
         return Feature.objects.for_project(self)
 
+    def _get_feature_ids(self):
+        """
+        IDs of the feature flags of the project.
+
+        They are loaded with a single query, and shared with other processes
+        using the cache (see ``get_features_cache_key``).
+        They are also kept in the instance while the cache key doesn't change,
+        the versions in the key are kept in memory for a few seconds,
+        so checking several features doesn't hit the cache each time.
+        """
+        if not self.pk:
+            return set(self.features.values_list("feature_id", flat=True))
+
+        cache_key = get_features_cache_key(self)
+        cached = getattr(self, "_cached_feature_ids", None)
+        if cached and cached[0] == cache_key:
+            return cached[1]
+
+        feature_ids = cache.get(cache_key)
+        if feature_ids is None:
+            feature_ids = list(self.features.values_list("feature_id", flat=True))
+            cache.set(
+                cache_key,
+                feature_ids,
+                timeout=settings.RTD_PROJECT_FEATURES_CACHE_TIMEOUT,
+            )
+        feature_ids = set(feature_ids)
+        self._cached_feature_ids = (cache_key, feature_ids)
+        return feature_ids
+
     def has_feature(self, feature_id):
         """
         Does project have existing feature flag.
@@ -1375,7 +1408,7 @@ class Project(models.Model):
         we consider the project to have the flag. This is used for deprecating a
         feature or changing behavior for new projects
         """
-        return self.features.filter(feature_id=feature_id).exists()
+        return feature_id in self._get_feature_ids()
 
     def get_feature_value(self, feature, positive, negative):
         """
@@ -2120,6 +2153,83 @@ class Feature(models.Model):
         return dict(self.FEATURES).get(self.feature_id, self.feature_id)
 
 
+FEATURES_CACHE_VERSION_KEY = "project-features-version"
+
+# Versions of the cached features, kept in the memory of each process
+# (see ``get_features_cache_key``).
+_features_cache_versions = LocalLRUCache(
+    maxsize=settings.RTD_PROJECT_FEATURES_VERSION_LOCAL_SIZE,
+    ttl=settings.RTD_PROJECT_FEATURES_VERSION_LOCAL_TIMEOUT,
+)
+
+
+def _get_project_features_version_key(project_id):
+    return f"{FEATURES_CACHE_VERSION_KEY}-{project_id}"
+
+
+def _get_features_cache_versions(project_id):
+    versions = _features_cache_versions.get(project_id)
+    if versions is not None:
+        return versions
+
+    keys = [FEATURES_CACHE_VERSION_KEY, _get_project_features_version_key(project_id)]
+    cached = cache.get_many(keys)
+    for key in keys:
+        if key not in cached:
+            # Start from the current time, so keys from before the version
+            # was evicted from the cache aren't reused.
+            cache.add(key, time.time_ns(), timeout=None)
+            cached[key] = cache.get(key)
+    versions = tuple(cached[key] for key in keys)
+    _features_cache_versions.set(project_id, versions)
+    return versions
+
+
+def get_features_cache_key(project):
+    """
+    Get the key of the cached feature flags of `project`.
+
+    The key has two versions, one for each project,
+    increased when the features of the project change,
+    and a global one, increased when a feature with ``default_true``
+    or ``future_default_true`` changes, since they apply to several projects
+    (see ``invalidate_features_cache``).
+    Versions are kept in memory for ``RTD_PROJECT_FEATURES_VERSION_LOCAL_TIMEOUT`` seconds,
+    changes made by other processes are visible after that time.
+    The creation date of the project is part of the key since features depend on it.
+    """
+    global_version, project_version = _get_features_cache_versions(project.pk)
+    return "project-features-{project_id}-{pub_date}-{global_version}-{project_version}".format(
+        project_id=project.pk,
+        pub_date=project.pub_date.timestamp() if project.pub_date else "",
+        global_version=global_version,
+        project_version=project_version,
+    )
+
+
+def _incr_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def invalidate_features_cache(project_ids=None):
+    """
+    Invalidate the cached feature flags of the projects from `project_ids`.
+
+    If `project_ids` is ``None``, the feature flags of all projects are invalidated.
+    """
+    if project_ids is None:
+        _incr_version(FEATURES_CACHE_VERSION_KEY)
+        _features_cache_versions.clear()
+        return
+
+    for project_id in project_ids:
+        _incr_version(_get_project_features_version_key(project_id))
+        _features_cache_versions.delete(project_id)
+
+
 class EnvironmentVariable(TimeStampedModel, models.Model):
     name = models.CharField(
         max_length=128,
@@ -7,7 +7,8 @@ rebuilding documentation.
 import os
 import signal
 import socket
-import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 
 import structlog
@@ -790,7 +791,10 @@ class UpdateDocsTask(SyncRepositoryMixin, Task):
         # self.build_environment`` twice because it kills the container on
         # ``__exit__``
         self.data.build_director.create_build_environment()
-        with self.data.build_director.build_environment:
+        # The build tools mounted in the container are kept in the local cache
+        # until the container is killed.
+        build_tools_mounts = self.data.build_director.build_tools_mounts
+        with build_tools_mounts, self.data.build_director.build_environment:
             try:
                 if getattr(self.data.config.build, "commands", False):
                     self.update_build(state=BUILD_STATE_INSTALLING)
@@ -824,9 +828,11 @@ class UpdateDocsTask(SyncRepositoryMixin, Task):
         so this must be called before killing the container.
         """
         try:
-            return BuildDataCollector(
+            data = BuildDataCollector(
                 self.data.build_director.build_environment
             ).collect()
+            data["build_tools_cache"] = self.data.build_director.build_tools_cache_stats
+            return data
         except Exception:
             log.exception("Error while collecting build data")
 
@@ -903,84 +909,118 @@ class UpdateDocsTask(SyncRepositoryMixin, Task):
             elif artifact_type not in UNDELETABLE_ARTIFACT_TYPES:
                 types_to_delete.append(artifact_type)
 
-        # Upload formats
-        for media_type in types_to_copy:
-            from_path = self.data.project.artifact_path(
-                version=self.data.version.slug,
-                type_=media_type,
-            )
-            to_path = self.data.project.get_storage_path(
-                type_=media_type,
-                version_slug=self.data.version.slug,
-                include_file=False,
-                version_type=self.data.version.type,
+        # Upload and delete formats concurrently.
+        # If any of them fails, we wait for the others before failing the build.
+        with ThreadPoolExecutor(
+            max_workers=settings.RTD_BUILD_ARTIFACTS_UPLOAD_WORKERS
+        ) as executor:
+            futures = {
+                media_type: executor.submit(self._upload_artifacts, media_type)
+                for media_type in types_to_copy
+            }
+            futures.update(
+                {
+                    media_type: executor.submit(self._delete_artifacts, media_type)
+                    for media_type in types_to_delete
+                }
             )
+            artifacts_stats = {
+                media_type: future.result() for media_type, future in futures.items()
+            }
 
-            self._log_directory_size(from_path, media_type)
-
-            try:
-                build_media_storage.rclone_sync_directory(from_path, to_path)
-            except Exception as exc:
-                # NOTE: the exceptions reported so far are:
-                #  - botocore.exceptions:HTTPClientError
-                #  - botocore.exceptions:ClientError
-                #  - readthedocs.doc_builder.exceptions:BuildCancelled
-                log.exception(
-                    "Error copying to storage",
-                    media_type=media_type,
-                    from_path=from_path,
-                    to_path=to_path,
-                )
-                # Re-raise the exception to fail the build and handle it
-                # automatically at `on_failure`.
-                # It will clearly communicate the error to the user.
-                raise BuildAppError("Error uploading files to the storage.") from exc
-
-        # Delete formats
-        for media_type in types_to_delete:
-            media_path = self.data.version.project.get_storage_path(
-                type_=media_type,
-                version_slug=self.data.version.slug,
-                include_file=False,
-                version_type=self.data.version.type,
-            )
-            try:
-                build_media_storage.delete_directory(media_path)
-            except Exception as exc:
-                # NOTE: I didn't find any log line for this case yet
-                log.exception(
-                    "Error deleting files from storage",
-                    media_type=media_type,
-                    media_path=media_path,
-                )
-                # Re-raise the exception to fail the build and handle it
-                # automatically at `on_failure`.
-                # It will clearly communicate the error to the user.
-                raise BuildAppError("Error deleting files from storage.") from exc
+        # Record the time spent on each type as part of the build data.
+        if self.data.build_data:
+            self.data.build_data["artifacts"] = artifacts_stats
 
         log.info(
             "Store build artifacts finished.",
             time=(timezone.now() - time_before_store_build_artifacts).seconds,
+            artifacts=artifacts_stats,
         )
 
-    def _log_directory_size(self, directory, media_type):
+    def _upload_artifacts(self, media_type):
+        """
+        Upload the artifacts of `media_type` to storage.
+
+        :returns: a dictionary with the time spent (in seconds),
+         and the number of files and bytes of the artifacts.
+        """
+        from_path = self.data.project.artifact_path(
+            version=self.data.version.slug,
+            type_=media_type,
+        )
+        to_path = self.data.project.get_storage_path(
+            type_=media_type,
+            version_slug=self.data.version.slug,
+            include_file=False,
+            version_type=self.data.version.type,
+        )
+
+        start = time.monotonic()
         try:
-            output = subprocess.check_output(
-                ["du", "--summarize", "-m", "--", directory]
-            )
-            # The output is something like: "5\t/path/to/directory".
-            directory_size = int(output.decode().split()[0])
-            log.info(
-                "Build artifacts directory size.",
-                directory=directory,
-                size=directory_size,  # Size in mega bytes
+            stats = build_media_storage.rclone_sync_directory(from_path, to_path)
+        except Exception as exc:
+            # NOTE: the exceptions reported so far are:
+            #  - botocore.exceptions:HTTPClientError
+            #  - botocore.exceptions:ClientError
+            #  - readthedocs.doc_builder.exceptions:BuildCancelled
+            log.exception(
+                "Error copying to storage",
                 media_type=media_type,
+                from_path=from_path,
+                to_path=to_path,
             )
-        except Exception:
-            log.info(
-                "Error getting build artifacts directory size.",
-                exc_info=True,
+            # Re-raise the exception to fail the build and handle it
+            # automatically at `on_failure`.
+            # It will clearly communicate the error to the user.
+            raise BuildAppError("Error uploading files to the storage.") from exc
+
+        result = {
+            "action": "upload",
+            "time": round(time.monotonic() - start, 3),
+            "files": stats["files"],
+            "size": stats["bytes"],
+        }
+        log.info(
+            "Build artifacts uploaded.",
+            directory=from_path,
+            media_type=media_type,
+            size=result["size"] // (1024 * 1024),  # Size in mega bytes
+            time=result["time"],
+        )
+        return result
+
+    def _delete_artifacts(self, media_type):
+        """
+        Delete the artifacts of `media_type` from storage.
+
+        :returns: a dictionary with the time spent (in seconds).
+        """
+        media_path = self.data.version.project.get_storage_path(
+            type_=media_type,
+            version_slug=self.data.version.slug,
+            include_file=False,
+            version_type=self.data.version.type,
+        )
+        start = time.monotonic()
+        try:
+            build_media_storage.delete_directory(media_path)
+        except Exception as exc:
+            # NOTE: I didn't find any log line for this case yet
+            log.exception(
+                "Error deleting files from storage",
+                media_type=media_type,
+                media_path=media_path,
             )
+            # Re-raise the exception to fail the build and handle it
+            # automatically at `on_failure`.
+            # It will clearly communicate the error to the user.
+            raise BuildAppError("Error deleting files from storage.") from exc
+
+        return {
+            "action": "delete",
+            "time": round(time.monotonic() - start, 3),
+        }
 
     def send_notifications(self, version_pk, build_pk, event):
         """Send notifications to all subscribers of `event`."""
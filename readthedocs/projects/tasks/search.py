@@ -6,8 +6,8 @@ from readthedocs.builds.constants import BUILD_STATE_FINISHED
 from readthedocs.builds.models import Build, Version
 from readthedocs.projects.models import HTMLFile, Project
 from readthedocs.projects.signals import files_changed
-from readthedocs.search.documents import PageDocument
-from readthedocs.search.utils import index_objects, remove_indexed_files
+from readthedocs.search.pipeline import PageIndexingPipeline
+from readthedocs.search.utils import get_indexed_pages, remove_indexed_files
 from readthedocs.storage import build_media_storage
 from readthedocs.worker import app
 
@@ -211,16 +211,26 @@ def _create_imported_files_and_search_index(
     # and we neeed this id to be `None` when indexing the objects in ES.
     # ES will generate a unique id for each document.
     if html_files_to_index:
-        index_objects(
-            document=PageDocument,
-            objects=html_files_to_index,
+        # Pages that didn't change since the last sync aren't parsed and indexed again,
+        # they are only re-tagged with the new sync ID.
+        indexed_pages = get_indexed_pages(
+            project_slug=version.project.slug,
+            version_slug=version.slug,
+            index_name=search_index_name,
+        )
+        pipeline = PageIndexingPipeline(
+            version=version,
             index_name=search_index_name,
             # Pages are indexed in small chunks to avoid a
             # large payload that will probably timeout ES.
             chunk_size=100,
+            sync_id=sync_id,
+            indexed_pages=indexed_pages,
         )
+        pipeline.run(html_files_to_index)
 
-    # Remove old HTMLFiles from ElasticSearch
+    # Remove old HTMLFiles from ElasticSearch,
+    # this includes pages that were removed or changed since the last sync.
     remove_indexed_files(
         project_slug=version.project.slug,
         version_slug=version.slug,
@@ -50,6 +50,27 @@ def remove_build_storage_paths(paths):
         build_media_storage.delete_directory(storage_path)
 
 
+@app.task(queue="web")
+def update_sitemap(project_id):
+    """
+    Render the sitemap of the project and store it in the cache.
+
+    It's triggered when a build finishes,
+    so the next request to the sitemap doesn't have to generate it.
+
+    :param project_id: ID of the project to render the sitemap for
+    """
+    # Avoid circular import.
+    from readthedocs.projects.models import Project
+    from readthedocs.proxito.sitemap import render_sitemap
+
+    project = Project.objects.filter(pk=project_id).first()
+    if not project:
+        log.debug("Project not found, skipping sitemap update.", project_id=project_id)
+        return
+    render_sitemap(project)
+
+
 def clean_project_resources(project, version=None):
     """
     Delete all extra resources used by `version` of `project`.
@@ -174,6 +174,9 @@ class BuildEnvironmentMocker:
     def _mock_storage(self):
         self.patches['build_media_storage'] = mock.patch(
             'readthedocs.projects.tasks.builds.build_media_storage',
+            **{
+                "rclone_sync_directory.return_value": {"files": 1, "bytes": 1024},
+            },
         )
 
     def _mock_api(self):
@@ -205,6 +208,11 @@ class BuildEnvironmentMocker:
             status_code=201,
         )
 
+        self.requestsmock.post(
+            f'{settings.SLUMBER_API_HOST}/api/v2/command/bulk/',
+            status_code=201,
+        )
+
         self.requestsmock.patch(
             f'{settings.SLUMBER_API_HOST}/api/v2/build/{self.build.pk}/',
             status_code=201,
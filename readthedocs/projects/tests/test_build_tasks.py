@@ -606,7 +606,16 @@ class TestBuildTask(BuildEnvironmentBase):
         assert self.requests_mock.request_history[10].path == "/api/v2/revoke/"
 
         assert BuildData.objects.all().exists()
+        artifacts = BuildData.objects.get().data["artifacts"]
+        assert set(artifacts.keys()) == {"html", "json", "htmlzip", "pdf", "epub"}
+        assert artifacts["html"] == {
+            "action": "upload",
+            "time": mock.ANY,
+            "files": 1,
+            "size": 1024,
+        }
 
+        # Artifacts are uploaded concurrently, so the order isn't guaranteed.
         self.mocker.mocks["build_media_storage"].rclone_sync_directory.assert_has_calls(
             [
                 mock.call(mock.ANY, "html/project/latest"),
@@ -614,7 +623,8 @@ class TestBuildTask(BuildEnvironmentBase):
                 mock.call(mock.ANY, "htmlzip/project/latest"),
                 mock.call(mock.ANY, "pdf/project/latest"),
                 mock.call(mock.ANY, "epub/project/latest"),
-            ]
+            ],
+            any_order=True,
         )
         # TODO: find a directory to remove here :)
         # build_media_storage.delete_directory
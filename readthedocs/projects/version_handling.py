@@ -1,12 +1,20 @@
 """Project version handling."""
 import unicodedata
+from functools import lru_cache
 
+from django.core.cache import cache
 from packaging.version import InvalidVersion, Version
 
 from readthedocs.builds.constants import LATEST_VERBOSE_NAME, STABLE_VERBOSE_NAME, TAG
 from readthedocs.vcs_support.backends import backend_cls
 
+# Max number of parsed version strings kept in memory by each process.
+# Parsing is a pure function of the string, and the same names are parsed
+# over and over (footer, sitemap, stable version, etc).
+VERSION_PARSE_CACHE_SIZE = 50000
 
+
+@lru_cache(maxsize=VERSION_PARSE_CACHE_SIZE)
 def parse_version_failsafe(version_string):
     """
     Parse a version in string form and return Version object.
@@ -21,6 +29,10 @@ def parse_version_failsafe(version_string):
     :returns: version object created from a string object
 
     :rtype: packaging.version.Version
+
+    .. note::
+
+       Results are memoized, the returned objects are shared and must not be mutated.
     """
     if not isinstance(version_string, str):
         uni_version = version_string.decode("utf-8")
@@ -46,6 +58,7 @@ def parse_version_failsafe(version_string):
     return None
 
 
+@lru_cache(maxsize=VERSION_PARSE_CACHE_SIZE)
 def comparable_version(version_string, repo_type=None):
     """
     Can be used as ``key`` argument to ``sorted``.
@@ -158,3 +171,12 @@ def determine_stable_version(version_list):
         version_obj, comparable = versions[0]
         return version_obj
     return None
+
+
+def get_highest_version_cache_key(project_id):
+    return f"highest-version-{project_id}"
+
+
+def invalidate_highest_version(project_id):
+    """Remove the cached highest public version of the project (see ``get_version_compare_data``)."""
+    cache.delete(get_highest_version_cache_key(project_id))
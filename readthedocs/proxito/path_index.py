@@ -0,0 +1,129 @@
+"""
+In-memory index of the files of each version.
+
+Checking if a file exists in storage requires a request to the storage backend.
+Instead, we load the manifest saved when the files of a version were synced
+(see ``BuildMediaStorageMixin.rclone_sync_directory``),
+and keep a sorted list of its paths in memory, so checking if a file exists
+is a local lookup.
+
+Indexes are cached per process, and they are keyed by the hash of their manifest.
+The hash is checked again every ``RTD_PATH_INDEX_CHECK_INTERVAL`` seconds,
+so an index is reloaded shortly after the files of the version are synced,
+even if the build fails after that.
+"""
+
+import bisect
+import threading
+import time
+from collections import OrderedDict
+
+import structlog
+from django.conf import settings
+
+log = structlog.get_logger(__name__)
+
+
+class PathIndex:
+
+    """
+    Sorted list of the paths of all files from a directory.
+
+    :param manifest_hash: hash of the manifest the paths were loaded from.
+    """
+
+    def __init__(self, paths, manifest_hash=None):
+        self.paths = tuple(sorted(paths))
+        self.manifest_hash = manifest_hash
+
+    def __contains__(self, path):
+        path = path.lstrip("/")
+        position = bisect.bisect_left(self.paths, path)
+        return position < len(self.paths) and self.paths[position] == path
+
+    def __len__(self):
+        return len(self.paths)
+
+
+class PathIndexCache:
+
+    """
+    LRU cache of path indexes.
+
+    Directories without a manifest are cached as ``None`` as well,
+    so the storage is checked for a new manifest only once per interval.
+    The cache is limited by the number of indexes (``RTD_PATH_INDEX_CACHE_SIZE``)
+    and by the total number of paths (``RTD_PATH_INDEX_CACHE_MAX_PATHS``),
+    since the memory used by an index depends on the number of files of the version.
+    """
+
+    def __init__(self):
+        self._indexes = OrderedDict()
+        self._paths = 0
+        self._lock = threading.Lock()
+
+    def get(self, storage, storage_path):
+        """
+        Get the index of the files under `storage_path`.
+
+        :param storage: storage backend where the files are stored
+        :param storage_path: path to the directory in storage
+        :returns: a ``PathIndex`` or ``None`` if the directory doesn't have a manifest.
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._indexes.get(storage_path)
+            if cached:
+                self._indexes.move_to_end(storage_path)
+                checked_at, path_index = cached
+                if now - checked_at < settings.RTD_PATH_INDEX_CHECK_INTERVAL:
+                    return path_index
+
+        manifest_hash = storage.get_manifest_hash(storage_path)
+        if cached and manifest_hash is not None:
+            _, path_index = cached
+            if path_index is not None and path_index.manifest_hash == manifest_hash:
+                self._set(storage_path, now, path_index)
+                return path_index
+
+        path_index = None
+        if manifest_hash is not None:
+            manifest = storage.get_manifest(storage_path)
+            if manifest is not None:
+                path_index = PathIndex(
+                    (entry[0] for entry in manifest),
+                    manifest_hash=manifest_hash,
+                )
+        log.debug(
+            "Path index loaded.",
+            storage_path=storage_path,
+            files=len(path_index) if path_index is not None else None,
+        )
+        self._set(storage_path, now, path_index)
+        return path_index
+
+    def _set(self, storage_path, checked_at, path_index):
+        with self._lock:
+            previous = self._indexes.pop(storage_path, None)
+            if previous:
+                self._paths -= self._count_paths(previous[1])
+            self._indexes[storage_path] = (checked_at, path_index)
+            self._paths += self._count_paths(path_index)
+            # The index that was just set is kept, even if it's bigger than the limit.
+            while len(self._indexes) > 1 and (
+                len(self._indexes) > settings.RTD_PATH_INDEX_CACHE_SIZE
+                or self._paths > settings.RTD_PATH_INDEX_CACHE_MAX_PATHS
+            ):
+                _, (_, evicted) = self._indexes.popitem(last=False)
+                self._paths -= self._count_paths(evicted)
+
+    def _count_paths(self, path_index):
+        return len(path_index) if path_index is not None else 0
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+            self._paths = 0
+
+
+path_index_cache = PathIndexCache()
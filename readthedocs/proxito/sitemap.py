@@ -0,0 +1,251 @@
+"""
+Generation of the ``sitemap.xml`` of a project.
+
+The data of the sitemap is fetched with a fixed number of queries
+(independently of the number of versions and translations of the project),
+and the rendered sitemap is stored in the cache.
+The sitemap is re-generated when a build finishes,
+and invalidated when a version, translation or domain of the project changes.
+"""
+
+import hashlib
+import itertools
+
+import structlog
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from readthedocs.builds.constants import LATEST, STABLE
+from readthedocs.builds.models import Version
+from readthedocs.core.resolver import Resolver
+from readthedocs.core.utils.cache import LocalLRUCache
+from readthedocs.projects.models import Project
+from readthedocs.projects.templatetags.projects_tags import sort_version_aware
+
+log = structlog.get_logger(__name__)
+
+# Main project of each project, kept in memory for a short time,
+# so deleting many versions doesn't query the project of each one
+# (see ``invalidate_sitemap_of_version``).
+_main_language_project_ids = LocalLRUCache(maxsize=1000, ttl=60)
+_missing = object()
+
+
+def priorities_generator():
+    """
+    Generator returning ``priority`` needed by sitemap.xml.
+
+    It generates values from 1 to 0.1 by decreasing in 0.1 on each
+    iteration. After 0.1 is reached, it will keep returning 0.1.
+    """
+    priorities = [1, 0.9, 0.8, 0.7, 0.6, 0.5, 0.4, 0.3, 0.2]
+    yield from itertools.chain(priorities, itertools.repeat(0.1))
+
+
+def hreflang_formatter(lang):
+    """
+    sitemap hreflang should follow correct format.
+
+    Use hyphen instead of underscore in language and country value.
+    ref: https://en.wikipedia.org/wiki/Hreflang#Common_Mistakes
+    """
+    if "_" in lang:
+        return lang.replace("_", "-")
+    return lang
+
+
+def changefreqs_generator():
+    """
+    Generator returning ``changefreq`` needed by sitemap.xml.
+
+    It returns ``weekly`` on first iteration, then ``daily`` and then it
+    will return always ``monthly``.
+
+    We are using ``monthly`` as last value because ``never`` is too
+    aggressive. If the tag is removed and a branch is created with the same
+    name, we will want bots to revisit this.
+    """
+    changefreqs = ["weekly", "daily"]
+    yield from itertools.chain(changefreqs, itertools.repeat("monthly"))
+
+
+def get_sitemap_versions(project):
+    """
+    Get the list of versions to include in the sitemap of `project`.
+
+    The versions are sorted by using semantic versioning
+    prepending ``latest`` and ``stable`` (if they are enabled) at the beginning.
+    Following this order, the versions are assigned priorities and change
+    frequency. Starting from 1 and decreasing by 0.1 for priorities and starting
+    from daily, weekly to monthly for change frequency.
+
+    :returns: A list of dictionaries with the ``loc``, ``priority``,
+     ``changefreq``, ``languages`` and ``lastmod`` (if the version was built)
+     of each version, the list is empty if the project doesn't have public versions.
+    """
+    public_versions = list(
+        Version.internal.public(
+            project=project,
+            only_active=True,
+        )
+        .select_related("project")
+        .annotate(last_build_date=Max("builds__date"))
+    )
+    if not public_versions:
+        return []
+
+    sorted_versions = sort_version_aware(public_versions)
+
+    # This is a hack to swap the latest version with
+    # stable version to get the stable version first in the sitemap.
+    # We want stable with priority=1 and changefreq='weekly' and
+    # latest with priority=0.9 and changefreq='daily'
+    # More details on this: https://github.com/rtfd/readthedocs.org/issues/5447
+    if (
+        len(sorted_versions) >= 2
+        and sorted_versions[0].slug == LATEST
+        and sorted_versions[1].slug == STABLE
+    ):
+        sorted_versions[0], sorted_versions[1] = sorted_versions[1], sorted_versions[0]
+
+    # Fetch all the translated versions in a single query,
+    # mapped by their translation and slug.
+    translations = list(project.translations.all())
+    for translation in translations:
+        # Avoid a query per translation when resolving its URLs.
+        translation.main_language_project = project
+    translated_versions = {}
+    if translations:
+        queryset = Version.internal.public(only_active=True).filter(
+            project__in=translations,
+            slug__in=[version.slug for version in sorted_versions],
+        )
+        for translated_version in queryset:
+            translated_versions[
+                (translated_version.project_id, translated_version.slug)
+            ] = translated_version
+
+    # The resolver caches the domain of the last project resolved,
+    # so we resolve all versions from the same project together.
+    resolver = Resolver()
+    versions = []
+    for version, priority, changefreq in zip(
+        sorted_versions,
+        priorities_generator(),
+        changefreqs_generator(),
+    ):
+        element = {
+            "loc": resolver.resolve_version(project=project, version=version),
+            "priority": priority,
+            "changefreq": changefreq,
+            "languages": [],
+        }
+        # Version can be enabled, but not ``built`` yet. We want to show the
+        # link without a ``lastmod`` attribute
+        if version.last_build_date:
+            element["lastmod"] = version.last_build_date.isoformat()
+        versions.append(element)
+
+    for translation in translations:
+        for version, element in zip(sorted_versions, versions):
+            translated_version = translated_versions.get((translation.pk, version.slug))
+            if translated_version:
+                element["languages"].append(
+                    {
+                        "hreflang": hreflang_formatter(translation.language),
+                        "href": resolver.resolve_version(
+                            project=translation,
+                            version=translated_version,
+                        ),
+                    }
+                )
+
+    if translations:
+        # Add itself also as protocol requires
+        for element in versions:
+            element["languages"].append(
+                {
+                    "hreflang": project.language,
+                    "href": element["loc"],
+                }
+            )
+
+    return versions
+
+
+def _get_cache_key(project_id):
+    return f"sitemap-xml-{project_id}"
+
+
+def render_sitemap(project):
+    """
+    Render the sitemap of `project` and store it in the cache.
+
+    :returns: A dictionary with the ``content`` of the sitemap,
+     its ``etag`` and the date it was generated (``last_modified``),
+     or ``None`` if the project doesn't have public versions.
+    """
+    versions = get_sitemap_versions(project)
+    sitemap = None
+    if versions:
+        content = render_to_string("sitemap.xml", {"versions": versions})
+        sitemap = {
+            "content": content,
+            "etag": hashlib.md5(content.encode(), usedforsecurity=False).hexdigest(),
+            "last_modified": timezone.now(),
+        }
+    cache.set(
+        _get_cache_key(project.pk),
+        sitemap,
+        timeout=settings.RTD_SITEMAP_CACHE_TIMEOUT,
+    )
+    return sitemap
+
+
+def get_sitemap(project):
+    """Get the sitemap of `project` from the cache, or render it."""
+    sitemap = cache.get(_get_cache_key(project.pk), default=False)
+    if sitemap is False:
+        sitemap = render_sitemap(project)
+    return sitemap
+
+
+def invalidate_sitemap(*project_ids):
+    """Remove the sitemap of the given projects from the cache."""
+    cache.delete_many(
+        [_get_cache_key(project_id) for project_id in project_ids if project_id]
+    )
+
+
+def invalidate_sitemap_of_version(version):
+    """
+    Remove the sitemap of the project of `version` from the cache.
+
+    If the project is a translation, the sitemap of its main project
+    is also removed, since it links to the versions of its translations.
+    The project of the version is only used if it's already loaded,
+    otherwise only its main project is fetched, and kept in memory.
+    """
+    project_id = version.project_id
+    if Version.project.is_cached(version):
+        main_language_project_id = version.project.main_language_project_id
+    else:
+        main_language_project_id = _main_language_project_ids.get(
+            project_id, _missing
+        )
+        if main_language_project_id is _missing:
+            main_language_project_id = (
+                Project.objects.filter(pk=project_id)
+                .values_list("main_language_project_id", flat=True)
+                .first()
+            )
+    _main_language_project_ids.set(project_id, main_language_project_id)
+    invalidate_sitemap(project_id, main_language_project_id)
+
+
+def forget_main_language_project(project_id):
+    """Remove the main project of `project_id` kept in memory by ``invalidate_sitemap_of_version``."""
+    _main_language_project_ids.delete(project_id)
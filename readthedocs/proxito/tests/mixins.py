@@ -1,18 +1,27 @@
+from readthedocs.proxito.path_index import path_index_cache
 from readthedocs.proxito.tests.storage import BuildMediaStorageTest
 
 
 class MockStorageMixin:
 
     """
-    Mixin to controls ``BuildMediaStorageTests.exists`` method.
+    Mixin to controls ``BuildMediaStorageTests.exists`` and ``get_manifest`` methods.
 
-    This mixin provides a helper to update which files does exist in the storage
-    backend and reset them to an empty list on tear down.
+    This mixin provides helpers to update which files does exist in the storage
+    backend, and which directories have a manifest, and reset them on tear down.
     """
 
     def tearDown(self):
         super().tearDown()
         BuildMediaStorageTest._existing_files = []
+        BuildMediaStorageTest._manifests = {}
+        path_index_cache.clear()
 
     def _storage_exists(self, files):
         BuildMediaStorageTest._existing_files = files
+
+    def _storage_manifest(self, path, files):
+        BuildMediaStorageTest._manifests = {
+            **BuildMediaStorageTest._manifests,
+            path: [[file, 0, "", 0] for file in files],
+        }
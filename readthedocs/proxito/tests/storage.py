@@ -2,6 +2,9 @@
 Helper Django Storage class to use in El Proxito tests.
 """
 
+import hashlib
+import json
+
 from readthedocs.builds.storage import BuildMediaFileSystemStorage
 
 
@@ -11,7 +14,8 @@ class BuildMediaStorageTest(BuildMediaFileSystemStorage):
     Storage to use in El Proxito tests to have more control.
 
     Allow to specify when to return ``True`` or ``False`` depending if the file
-    does exist or not in the storage backend.
+    does exist or not in the storage backend,
+    and the manifest of each directory.
 
     Mocking ``get_storage_class`` is not always an option, since there are other
     methods that should keep working normally (``.url()``) and not be mocked.
@@ -24,3 +28,16 @@ class BuildMediaStorageTest(BuildMediaFileSystemStorage):
             return True
 
         return False
+
+    _manifests = {}
+
+    def get_manifest(self, path):
+        return self._manifests.get(path)
+
+    def get_manifest_hash(self, path):
+        manifest = self._manifests.get(path)
+        if manifest is None:
+            return None
+        return hashlib.md5(
+            json.dumps(manifest).encode(), usedforsecurity=False
+        ).hexdigest()
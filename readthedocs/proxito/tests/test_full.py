@@ -1192,6 +1192,106 @@ class TestAdditionalDocViews(BaseDocServing):
         self.assertEqual(response.status_code, 404)
         storage_open.assert_called_once_with("html/project/latest/404.html")
 
+    @override_settings(RTD_CUSTOM_404_CACHE_HITS_BATCH_SIZE=1)
+    @mock.patch("readthedocs.proxito.views.serve._custom_404_cache_hits", 0)
+    @mock.patch.object(BuildMediaFileSystemStorageTest, "open")
+    def test_custom_404_page_is_cached(self, storage_open):
+        storage_open().read.return_value = b"Custom 404 page"
+        storage_open.reset_mock()
+        get(
+            HTMLFile,
+            project=self.project,
+            version=self.version,
+            path="404.html",
+            name="404.html",
+        )
+        url = reverse(
+            "proxito_404_handler",
+            kwargs={"proxito_path": "/en/latest/not-found"},
+        )
+
+        for _ in range(3):
+            response = self.client.get(url, headers={"host": "project.readthedocs.io"})
+            self.assertEqual(response.status_code, 404)
+            self.assertEqual(response.content, b"Custom 404 page")
+        storage_open.assert_called_once_with("html/project/latest/404.html")
+        self.assertEqual(cache.get("custom-404-cache-hits"), 2)
+
+        # A new build invalidates the cached page.
+        self.version.save()
+        response = self.client.get(url, headers={"host": "project.readthedocs.io"})
+        self.assertEqual(response.content, b"Custom 404 page")
+        self.assertEqual(storage_open.call_count, 2)
+
+        # Big pages aren't cached.
+        self.version.save()
+        with override_settings(RTD_CUSTOM_404_CACHE_MAX_SIZE=10):
+            for _ in range(2):
+                response = self.client.get(
+                    url, headers={"host": "project.readthedocs.io"}
+                )
+                self.assertEqual(response.content, b"Custom 404 page")
+        self.assertEqual(storage_open.call_count, 4)
+
+    @override_settings(RTD_CUSTOM_404_CACHE_HITS_BATCH_SIZE=2)
+    @mock.patch("readthedocs.proxito.views.serve._custom_404_cache_hits", 0)
+    @mock.patch.object(BuildMediaFileSystemStorageTest, "open")
+    def test_custom_404_cache_hits_are_counted_in_batches(self, storage_open):
+        storage_open().read.return_value = b"Custom 404 page"
+        get(
+            HTMLFile,
+            project=self.project,
+            version=self.version,
+            path="404.html",
+            name="404.html",
+        )
+        url = reverse(
+            "proxito_404_handler",
+            kwargs={"proxito_path": "/en/latest/not-found"},
+        )
+        self.client.get(url, headers={"host": "project.readthedocs.io"})
+
+        self.client.get(url, headers={"host": "project.readthedocs.io"})
+        self.assertIsNone(cache.get("custom-404-cache-hits"))
+        self.client.get(url, headers={"host": "project.readthedocs.io"})
+        self.assertEqual(cache.get("custom-404-cache-hits"), 2)
+
+    @mock.patch.object(BuildMediaFileSystemStorageTest, "open")
+    def test_custom_404_cache_total_size_is_limited(self, storage_open):
+        storage_open().read.return_value = b"Custom 404 page"
+        storage_open.reset_mock()
+        get(
+            HTMLFile,
+            project=self.project,
+            version=self.version,
+            path="404.html",
+            name="404.html",
+        )
+        url = reverse(
+            "proxito_404_handler",
+            kwargs={"proxito_path": "/en/latest/not-found"},
+        )
+
+        # The total size was already reached by other pages.
+        cache.set("custom-404-cache-size", 100)
+        with override_settings(RTD_CUSTOM_404_CACHE_MAX_TOTAL_SIZE=100):
+            for _ in range(2):
+                response = self.client.get(
+                    url, headers={"host": "project.readthedocs.io"}
+                )
+                self.assertEqual(response.content, b"Custom 404 page")
+        self.assertEqual(storage_open.call_count, 2)
+
+        # Once the window ends, pages are cached again.
+        cache.delete("custom-404-cache-size")
+        with override_settings(RTD_CUSTOM_404_CACHE_MAX_TOTAL_SIZE=100):
+            for _ in range(2):
+                response = self.client.get(
+                    url, headers={"host": "project.readthedocs.io"}
+                )
+                self.assertEqual(response.content, b"Custom 404 page")
+        self.assertEqual(storage_open.call_count, 3)
+
     @mock.patch.object(BuildMediaFileSystemStorageTest, "open")
     def test_404_storage_serves_custom_404_sphinx_single_html(self, storage_open):
         self.project.versions.update(active=True, built=True)
@@ -1517,7 +1617,6 @@ class TestAdditionalDocViews(BaseDocServing):
             "/en/latest/not-found/",
         ]
         for path in paths:
-            storage_open.reset_mock()
             resp = self.client.get(
                 reverse(
                     "proxito_404_handler",
@@ -1526,7 +1625,8 @@ class TestAdditionalDocViews(BaseDocServing):
                 headers={"host": "project.readthedocs.io"},
             )
             self.assertEqual(resp.status_code, 404)
-            storage_open.assert_called_once()
+        # The custom 404 page is cached after the first request.
+        storage_open.assert_called_once()
 
         self.assertEqual(PageView.objects.all().count(), 2)
         version = self.project.versions.get(slug="latest")
@@ -0,0 +1,201 @@
+from unittest import mock
+
+import django_dynamic_fixture as fixture
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+
+from readthedocs.builds.models import Version
+from readthedocs.projects.constants import PUBLIC
+from readthedocs.projects.models import HTMLFile
+from readthedocs.proxito.path_index import PathIndex, path_index_cache
+from readthedocs.proxito.tests.storage import BuildMediaStorageTest
+
+from .base import BaseDocServing
+from .mixins import MockStorageMixin
+
+
+@override_settings(PUBLIC_DOMAIN="readthedocs.io")
+class TestPathIndex(MockStorageMixin, BaseDocServing):
+    def setUp(self):
+        super().setUp()
+        path_index_cache.clear()
+        cache.clear()
+        self._storage_manifest(
+            "html/project/latest",
+            [
+                "index.html",
+                "guides/index.html",
+                "install/README.html",
+                "404.html",
+                "robots.txt",
+                "_static/style.css",
+            ],
+        )
+
+    def _get(self, path):
+        return self.client.get(path, headers={"host": "project.readthedocs.io"})
+
+    def _get_404(self, path):
+        return self.client.get(
+            reverse("proxito_404_handler", kwargs={"proxito_path": path}),
+            headers={"host": "project.readthedocs.io"},
+        )
+
+    def test_path_index(self):
+        path_index = PathIndex(["b.html", "a/index.html", "a.html"])
+        self.assertEqual(len(path_index), 3)
+        self.assertIn("a.html", path_index)
+        self.assertIn("/a/index.html", path_index)
+        self.assertNotIn("a", path_index)
+        self.assertNotIn("c.html", path_index)
+
+    def test_serve_files_from_the_index(self):
+        response = self._get("/en/latest/guides/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            "/proxito/media/html/project/latest/guides/index.html",
+        )
+
+        # Missing files don't hit the storage.
+        response = self._get("/en/latest/missing.html")
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("X-Accel-Redirect", response)
+
+    def test_serve_files_without_index(self):
+        BuildMediaStorageTest._manifests = {}
+        response = self._get("/en/latest/missing.html")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            "/proxito/media/html/project/latest/missing.html",
+        )
+
+    def test_index_file_redirect_from_the_index(self):
+        # There are no HTMLFile objects, files are found from the index.
+        response = self._get_404("/en/latest/guides")
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["Location"], "/en/latest/guides/")
+
+        response = self._get_404("/en/latest/install/")
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["Location"], "/en/latest/install/README.html")
+        self.assertFalse(HTMLFile.objects.exists())
+
+    @mock.patch.object(BuildMediaStorageTest, "open")
+    def test_custom_404_page_from_the_index(self, storage_open):
+        storage_open().read.return_value = b"Custom 404 page"
+        storage_open.reset_mock()
+
+        response = self._get_404("/en/latest/missing.html")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.content, b"Custom 404 page")
+        storage_open.assert_called_once_with("html/project/latest/404.html")
+
+    @override_settings(RTD_PATH_INDEX_CHECK_INTERVAL=0)
+    @mock.patch.object(BuildMediaStorageTest, "open")
+    def test_custom_404_page_is_cached_until_the_manifest_changes(self, storage_open):
+        storage_open().read.return_value = b"Custom 404 page"
+        storage_open.reset_mock()
+        self._storage_manifest("html/project/latest", ["index.html"])
+
+        response = self._get_404("/en/latest/missing.html")
+        self.assertEqual(response.status_code, 404)
+        self.assertNotEqual(response.content, b"Custom 404 page")
+
+        # The version isn't updated if the build fails after syncing the files,
+        # the new 404 page is found anyway.
+        self._storage_manifest("html/project/latest", ["index.html", "404.html"])
+        for _ in range(2):
+            response = self._get_404("/en/latest/missing.html")
+            self.assertEqual(response.status_code, 404)
+            self.assertEqual(response.content, b"Custom 404 page")
+        storage_open.assert_called_once_with("html/project/latest/404.html")
+
+    def test_robots_txt_from_the_index(self):
+        response = self._get("/robots.txt")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            "/proxito/media/html/project/latest/robots.txt",
+        )
+
+        BuildMediaStorageTest._manifests = {"html/project/latest": []}
+        path_index_cache.clear()
+        response = self._get("/robots.txt")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Accel-Redirect", response)
+        self.assertContains(response, "User-agent: *")
+
+    @override_settings(RTD_PATH_INDEX_CHECK_INTERVAL=0)
+    @mock.patch.object(BuildMediaStorageTest, "get_manifest")
+    def test_index_is_cached_until_the_manifest_changes(self, get_manifest):
+        get_manifest.return_value = [["index.html", 0, "", 0]]
+
+        self._get("/en/latest/")
+        self._get("/en/latest/missing.html")
+        get_manifest.assert_called_once_with("html/project/latest")
+
+        self._storage_manifest("html/project/latest", ["index.html", "new.html"])
+        self._get("/en/latest/")
+        self.assertEqual(get_manifest.call_count, 2)
+
+    def test_index_is_reloaded_after_files_are_synced(self):
+        response = self._get("/en/latest/new.html")
+        self.assertEqual(response.status_code, 404)
+
+        # Files are synced again, the version isn't updated if the build fails after that.
+        self._storage_manifest("html/project/latest", ["index.html", "new.html"])
+        response = self._get("/en/latest/new.html")
+        self.assertEqual(response.status_code, 404)
+
+        # The manifest is checked again after ``RTD_PATH_INDEX_CHECK_INTERVAL``.
+        with override_settings(RTD_PATH_INDEX_CHECK_INTERVAL=0):
+            response = self._get("/en/latest/new.html")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            "/proxito/media/html/project/latest/new.html",
+        )
+
+    @override_settings(RTD_PATH_INDEX_CACHE_SIZE=1)
+    @mock.patch.object(BuildMediaStorageTest, "get_manifest_hash")
+    def test_least_recently_used_indexes_are_evicted(self, get_manifest_hash):
+        get_manifest_hash.return_value = None
+        fixture.get(
+            Version,
+            project=self.project,
+            slug="v1",
+            active=True,
+            built=True,
+            privacy_level=PUBLIC,
+        )
+        self._get("/en/latest/")
+        self._get("/en/v1/")
+        self._get("/en/latest/")
+        self.assertEqual(get_manifest_hash.call_count, 3)
+
+    @override_settings(RTD_PATH_INDEX_CACHE_MAX_PATHS=8)
+    @mock.patch.object(BuildMediaStorageTest, "get_manifest")
+    def test_indexes_are_evicted_when_there_are_too_many_paths(self, get_manifest):
+        get_manifest.side_effect = lambda storage_path: [
+            [f"{i}.html", 0, "", 0] for i in range(5)
+        ]
+        self._storage_manifest("html/project/v1", ["index.html"])
+        fixture.get(
+            Version,
+            project=self.project,
+            slug="v1",
+            active=True,
+            built=True,
+            privacy_level=PUBLIC,
+        )
+        self._get("/en/latest/")
+        self._get("/en/latest/")
+        self.assertEqual(get_manifest.call_count, 1)
+
+        # Both indexes together have more paths than the limit.
+        self._get("/en/v1/")
+        self._get("/en/latest/")
+        self.assertEqual(get_manifest.call_count, 3)
@@ -0,0 +1,166 @@
+from unittest import mock
+
+import django_dynamic_fixture as fixture
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from readthedocs.builds.constants import BUILD_STATE_FINISHED
+from readthedocs.builds.models import Build, Version
+from readthedocs.builds.signals import build_complete
+from readthedocs.projects.constants import PUBLIC
+from readthedocs.projects.models import Project
+from readthedocs.proxito.sitemap import get_sitemap_versions
+
+from .base import BaseDocServing
+
+
+@override_settings(PUBLIC_DOMAIN="readthedocs.io")
+class TestSitemap(BaseDocServing):
+    def _get_sitemap(self, **headers):
+        return self.client.get(
+            reverse("sitemap_xml"),
+            headers={"host": "project.readthedocs.io", **headers},
+        )
+
+    def _create_versions(self, project, count, start=0):
+        for i in range(start, start + count):
+            version = fixture.get(
+                Version,
+                project=project,
+                slug=f"v{i}",
+                verbose_name=f"v{i}",
+                privacy_level=PUBLIC,
+                active=True,
+            )
+            fixture.get(Build, project=project, version=version)
+
+    def test_number_of_queries_doesnt_depend_on_versions(self):
+        other_translation = fixture.get(
+            Project,
+            language="de",
+            privacy_level=PUBLIC,
+            main_language_project=self.project,
+        )
+        self._create_versions(self.project, 2)
+        self._create_versions(self.translation, 2)
+        project = Project.objects.get(pk=self.project.pk)
+        with CaptureQueriesContext(connection) as queries:
+            versions = get_sitemap_versions(project)
+        self.assertEqual(len(versions), 3)
+
+        self._create_versions(self.project, 20, start=2)
+        self._create_versions(self.translation, 20, start=2)
+        self._create_versions(other_translation, 20)
+        project = Project.objects.get(pk=self.project.pk)
+        with CaptureQueriesContext(connection) as more_queries:
+            versions = get_sitemap_versions(project)
+        self.assertEqual(len(versions), 23)
+        self.assertEqual(len(queries), len(more_queries))
+
+        element = next(
+            element for element in versions if element["loc"].endswith("/en/v10/")
+        )
+        self.assertIn("lastmod", element)
+        self.assertCountEqual(
+            [language["hreflang"] for language in element["languages"]],
+            ["es", "de", "en"],
+        )
+
+    def test_sitemap_is_cached(self):
+        response = self._get_sitemap()
+        self.assertEqual(response.status_code, 200)
+
+        with mock.patch(
+            "readthedocs.proxito.sitemap.get_sitemap_versions"
+        ) as get_sitemap_versions:
+            cached_response = self._get_sitemap()
+            get_sitemap_versions.assert_not_called()
+        self.assertEqual(cached_response.status_code, 200)
+        self.assertEqual(cached_response["Content-Type"], "application/xml")
+        self.assertEqual(cached_response.content, response.content)
+        self.assertEqual(cached_response["ETag"], response["ETag"])
+
+    def test_conditional_get(self):
+        response = self._get_sitemap()
+        self.assertEqual(response.status_code, 200)
+
+        response = self._get_sitemap(if_none_match=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+        response = self._get_sitemap(if_modified_since=response["Last-Modified"])
+        self.assertEqual(response.status_code, 304)
+
+        response = self._get_sitemap(if_none_match='"outdated"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_sitemap_is_invalidated_when_a_version_changes(self):
+        response = self._get_sitemap()
+        self.assertNotContains(response, "/en/new-version/")
+
+        fixture.get(
+            Version,
+            project=self.project,
+            slug="new-version",
+            verbose_name="new-version",
+            privacy_level=PUBLIC,
+            active=True,
+        )
+        response = self._get_sitemap()
+        self.assertContains(response, "/en/new-version/")
+
+        # Versions from translations are also included in the sitemap.
+        self.assertNotContains(response, "/es/new-version/")
+        fixture.get(
+            Version,
+            project=self.translation,
+            slug="new-version",
+            verbose_name="new-version",
+            privacy_level=PUBLIC,
+            active=True,
+        )
+        response = self._get_sitemap()
+        self.assertContains(response, "/es/new-version/")
+
+    def test_sitemap_is_invalidated_when_versions_are_deleted_in_bulk(self):
+        self._create_versions(self.project, 5)
+        self._create_versions(self.translation, 5)
+        versions = list(self.translation.versions.filter(slug__startswith="v"))
+        response = self._get_sitemap()
+        self.assertContains(response, "/es/v0/")
+
+        # The project of each version isn't fetched.
+        with CaptureQueriesContext(connection) as queries:
+            Version.objects.filter(pk__in=[version.pk for version in versions]).delete()
+        self.assertFalse(
+            [
+                query
+                for query in queries.captured_queries
+                if 'FROM "projects_project"' in query["sql"]
+            ]
+        )
+        response = self._get_sitemap()
+        self.assertNotContains(response, "/es/v0/")
+
+    def test_sitemap_is_rendered_when_a_build_finishes(self):
+        self._get_sitemap()
+        build = fixture.get(Build, project=self.project, version=self.version)
+
+        with mock.patch(
+            "readthedocs.proxito.sitemap.get_sitemap_versions",
+            return_value=[],
+        ) as get_sitemap_versions:
+            build_complete.send(
+                sender=Build,
+                build={
+                    "id": build.pk,
+                    "project": self.project.pk,
+                    "state": BUILD_STATE_FINISHED,
+                },
+            )
+            get_sitemap_versions.assert_called_once_with(self.project)
+            response = self._get_sitemap()
+            self.assertEqual(response.status_code, 404)
+            get_sitemap_versions.assert_called_once()
@@ -5,6 +5,7 @@ import structlog
 from django.conf import settings
 from django.core.exceptions import BadRequest
 from django.http import (
+    Http404,
     HttpResponse,
     HttpResponsePermanentRedirect,
     HttpResponseRedirect,
@@ -21,7 +22,9 @@ from readthedocs.builds.constants import INTERNAL
 from readthedocs.core.resolver import Resolver
 from readthedocs.projects.constants import MEDIA_TYPE_HTML
 from readthedocs.proxito.constants import RedirectType
+from readthedocs.proxito.path_index import path_index_cache
 from readthedocs.redirects.exceptions import InfiniteRedirectException
+from readthedocs.redirects.matcher import get_matching_redirect_with_path
 from readthedocs.storage import build_media_storage, staticfiles_storage
 from readthedocs.subscriptions.constants import TYPE_AUDIT_PAGEVIEWS
 from readthedocs.subscriptions.products import get_feature
@@ -54,7 +57,8 @@ class ServeDocsMixin:
         :param check_if_exists: If `True` we check if the file exists before trying
          to serve it. This will raisen an exception if the file doesn't exists.
          Useful to make sure were are serving a file that exists in storage,
-         checking if the file exists will make one additional request to the storage.
+         checking if the file exists will make one additional request to the storage
+         if the version doesn't have a path index.
         """
         base_storage_path = project.get_storage_path(
             type_=MEDIA_TYPE_HTML,
@@ -82,7 +86,18 @@ class ServeDocsMixin:
             # The request is malicious or malformed in this case.
             raise BadRequest("Invalid URL")
 
-        if check_if_exists and not build_media_storage.exists(storage_path):
+        path_index = path_index_cache.get(
+            storage=build_media_storage,
+            storage_path=base_storage_path,
+        )
+        if path_index is not None:
+            if storage_path.removeprefix(base_storage_path) not in path_index:
+                if check_if_exists:
+                    raise StorageFileNotFound
+                # Avoid a request to the storage for a file we know doesn't exist,
+                # the 404 handler will take care of it (index redirects, custom 404 pages).
+                raise Http404
+        elif check_if_exists and not build_media_storage.exists(storage_path):
             raise StorageFileNotFound
 
         self._track_pageview(
@@ -349,7 +364,8 @@ class ServeRedirectMixin:
         :returns: redirect response with the correct path
         :rtype: HttpResponseRedirect or HttpResponsePermanentRedirect
         """
-        redirect, redirect_path = project.redirects.get_matching_redirect_with_path(
+        redirect, redirect_path = get_matching_redirect_with_path(
+            project=project,
             language=language,
             version_slug=version_slug,
             filename=filename,
@@ -1,16 +1,19 @@
 """Views for doc serving."""
-import itertools
+import threading
 from urllib.parse import urlparse
 
 import structlog
 from django.conf import settings
+from django.core.cache import cache
 from django.http import Http404, HttpResponse, HttpResponseRedirect
 from django.shortcuts import get_object_or_404, render
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from django.views import View
 
 from readthedocs.analytics.models import PageView
 from readthedocs.api.mixins import CDNCacheTagsMixin
-from readthedocs.builds.constants import EXTERNAL, LATEST, STABLE
+from readthedocs.builds.constants import EXTERNAL
 from readthedocs.builds.models import Version
 from readthedocs.core.mixins import CDNCacheControlMixin
 from readthedocs.core.resolver import Resolver
@@ -26,7 +29,6 @@ from readthedocs.core.utils.extend import SettingsOverrideObject
 from readthedocs.core.utils.requests import is_suspicious_request
 from readthedocs.projects.constants import OLD_LANGUAGES_CODE_MAPPING, PRIVATE
 from readthedocs.projects.models import Domain, Feature, HTMLFile
-from readthedocs.projects.templatetags.projects_tags import sort_version_aware
 from readthedocs.proxito.constants import RedirectType
 from readthedocs.proxito.exceptions import (
     ContextualizedHttp404,
@@ -34,7 +36,9 @@ from readthedocs.proxito.exceptions import (
     ProjectTranslationHttp404,
     ProjectVersionHttp404,
 )
+from readthedocs.proxito.path_index import path_index_cache
 from readthedocs.proxito.redirects import canonical_redirect
+from readthedocs.proxito.sitemap import get_sitemap
 from readthedocs.proxito.views.mixins import (
     InvalidPathError,
     ServeDocsMixin,
@@ -46,6 +50,11 @@ from readthedocs.storage import build_media_storage
 
 log = structlog.get_logger(__name__)  # noqa
 
+# Custom 404 pages served from the cache by this process,
+# that weren't added to the shared counter yet.
+_custom_404_cache_hits = 0
+_custom_404_cache_hits_lock = threading.Lock()
+
 
 class ServePageRedirect(CDNCacheControlMixin, ServeRedirectMixin, ServeDocsMixin, View):
 
@@ -374,6 +383,11 @@ class ServeError404Base(CDNCacheControlMixin, ServeRedirectMixin, ServeDocsMixin
     This view is called by an internal nginx redirect when there is a 404.
     """
 
+    # Counter of custom 404 pages served from the cache instead of the storage.
+    custom_404_cache_hits_key = "custom-404-cache-hits"
+    # Total size of the custom 404 pages cached in the current window.
+    custom_404_cache_size_key = "custom-404-cache-size"
+
     def get(self, request, proxito_path):
         """
         Handler for 404 pages on subdomains.
@@ -568,6 +582,11 @@ class ServeError404Base(CDNCacheControlMixin, ServeRedirectMixin, ServeDocsMixin
 
         If a 404 page is found, we return a response with the content of that file,
         `None` otherwise.
+
+        The content of the 404 page of each version is cached until its files are synced again,
+        so most 404s don't need to read the page from storage
+        (the number of times this happens is counted in ``custom_404_cache_hits_key``).
+        The total size of the cached pages is limited (see ``_can_cache_custom_404``).
         """
         versions_404 = [version] if version and version.built else []
         if not version or version.slug != project.default_version:
@@ -580,48 +599,148 @@ class ServeError404Base(CDNCacheControlMixin, ServeRedirectMixin, ServeDocsMixin
         if not versions_404:
             return None
 
-        tryfiles = ["404.html", "404/index.html"]
-        available_404_files = list(
-            HTMLFile.objects.filter(
-                version__in=versions_404, path__in=tryfiles
-            ).values_list("version__slug", "path")
-        )
-        if not available_404_files:
-            return None
-
         for version_404 in versions_404:
             if not self.allowed_user(request, version_404):
                 continue
 
-            for tryfile in tryfiles:
-                if (version_404.slug, tryfile) not in available_404_files:
+            cache_key = self._get_custom_404_cache_key(project, version_404)
+            content = cache.get(cache_key, default=False)
+            if content is not False:
+                if content is None:
+                    # This version doesn't have a custom 404 page.
                     continue
-
-                storage_root_path = project.get_storage_path(
-                    type_="html",
-                    version_slug=version_404.slug,
-                    include_file=False,
-                    version_type=self.version_type,
-                )
-                storage_filename_path = build_media_storage.join(
-                    storage_root_path, tryfile
-                )
                 log.debug(
-                    "Serving custom 404.html page.",
+                    "Serving cached custom 404.html page.",
                     version_slug_404=version_404.slug,
-                    storage_filename_path=storage_filename_path,
                 )
-                try:
-                    content = build_media_storage.open(storage_filename_path).read()
-                    return HttpResponse(content, status=404)
-                except FileNotFoundError:
-                    log.warning(
-                        "File not found in storage. File out of sync with DB.",
-                        file=storage_filename_path,
+                self._count_custom_404_cache_hit()
+                return HttpResponse(content, status=404)
+
+            tryfile = self._get_custom_404_file(project, version_404)
+            if not tryfile:
+                if self._can_cache_custom_404(cache_key, b""):
+                    cache.set(
+                        cache_key,
+                        None,
+                        timeout=settings.RTD_CUSTOM_404_CACHE_NEGATIVE_TIMEOUT,
                     )
-                    return None
+                continue
+
+            storage_root_path = project.get_storage_path(
+                type_="html",
+                version_slug=version_404.slug,
+                include_file=False,
+                version_type=self.version_type,
+            )
+            storage_filename_path = build_media_storage.join(
+                storage_root_path, tryfile
+            )
+            log.debug(
+                "Serving custom 404.html page.",
+                version_slug_404=version_404.slug,
+                storage_filename_path=storage_filename_path,
+            )
+            try:
+                content = build_media_storage.open(storage_filename_path).read()
+            except FileNotFoundError:
+                log.warning(
+                    "File not found in storage. File out of sync with DB.",
+                    file=storage_filename_path,
+                )
+                return None
+            response = HttpResponse(content, status=404)
+            if self._can_cache_custom_404(cache_key, response.content):
+                cache.set(
+                    cache_key,
+                    response.content,
+                    timeout=settings.RTD_CUSTOM_404_CACHE_TIMEOUT,
+                )
+            return response
         return None
 
+    def _can_cache_custom_404(self, cache_key, content):
+        """
+        Check if the custom 404 page `content` can be cached.
+
+        Pages bigger than ``RTD_CUSTOM_404_CACHE_MAX_SIZE`` aren't cached.
+        The size of the cached pages (and their keys) is added up
+        in windows of ``RTD_CUSTOM_404_CACHE_TIMEOUT`` seconds,
+        once it reaches ``RTD_CUSTOM_404_CACHE_MAX_TOTAL_SIZE``
+        pages aren't cached until the window ends.
+        Pages expire after the same timeout,
+        so at most twice that size is cached at any time.
+        """
+        if len(content) > settings.RTD_CUSTOM_404_CACHE_MAX_SIZE:
+            return False
+        size = len(cache_key) + len(content)
+        if cache.add(
+            self.custom_404_cache_size_key,
+            size,
+            timeout=settings.RTD_CUSTOM_404_CACHE_TIMEOUT,
+        ):
+            return True
+        try:
+            total_size = cache.incr(self.custom_404_cache_size_key, size)
+        except ValueError:
+            # The window ended between both calls.
+            return False
+        return total_size <= settings.RTD_CUSTOM_404_CACHE_MAX_TOTAL_SIZE
+
+    def _count_custom_404_cache_hit(self):
+        """
+        Count a custom 404 page served from the cache.
+
+        Hits are counted in memory, and added to ``custom_404_cache_hits_key``
+        every ``RTD_CUSTOM_404_CACHE_HITS_BATCH_SIZE`` hits,
+        so serving a cached page doesn't write to the cache each time.
+        """
+        global _custom_404_cache_hits
+
+        with _custom_404_cache_hits_lock:
+            _custom_404_cache_hits += 1
+            if _custom_404_cache_hits < settings.RTD_CUSTOM_404_CACHE_HITS_BATCH_SIZE:
+                return
+            hits = _custom_404_cache_hits
+            _custom_404_cache_hits = 0
+        if not cache.add(self.custom_404_cache_hits_key, hits, timeout=None):
+            cache.incr(self.custom_404_cache_hits_key, hits)
+
+    def _get_custom_404_file(self, project, version):
+        """
+        Get the path of the custom 404 page of `version`.
+
+        We check for a 404.html or 404/index.html file.
+
+        :returns: The path of the 404 page relative to the root of the version,
+         or `None` if the version doesn't have a custom 404 page.
+        """
+        tryfiles = ["404.html", "404/index.html"]
+        path_index = self._get_path_index(project, version)
+        if path_index is not None:
+            available_404_files = [
+                tryfile for tryfile in tryfiles if tryfile in path_index
+            ]
+        else:
+            available_404_files = list(
+                HTMLFile.objects.filter(version=version, path__in=tryfiles).values_list(
+                    "path", flat=True
+                )
+            )
+        for tryfile in tryfiles:
+            if tryfile in available_404_files:
+                return tryfile
+        return None
+
+    def _get_custom_404_cache_key(self, project, version):
+        # The manifest changes each time the files of the version are synced,
+        # versions without a manifest are invalidated when they are built again.
+        path_index = self._get_path_index(project, version)
+        if path_index is not None:
+            files_version = path_index.manifest_hash
+        else:
+            files_version = version.modified.timestamp()
+        return f"custom-404-{self.version_type}-{version.pk}-{files_version}"
+
     def _get_index_file_redirect(self, request, project, version, filename, full_path):
         """
         Check if a file is a directory and redirect to its index/README file.
@@ -642,11 +761,17 @@ class ServeError404Base(CDNCacheControlMixin, ServeRedirectMixin, ServeDocsMixin
         tryfiles = [
             (filename.rstrip("/") + f"/{tryfile}").lstrip("/") for tryfile in tryfiles
         ]
-        available_index_files = list(
-            HTMLFile.objects.filter(version=version, path__in=tryfiles).values_list(
-                "path", flat=True
+        path_index = self._get_path_index(project, version)
+        if path_index is not None:
+            available_index_files = [
+                tryfile for tryfile in tryfiles if tryfile in path_index
+            ]
+        else:
+            available_index_files = list(
+                HTMLFile.objects.filter(version=version, path__in=tryfiles).values_list(
+                    "path", flat=True
+                )
             )
-        )
 
         for tryfile in tryfiles:
             if tryfile not in available_index_files:
@@ -673,6 +798,25 @@ class ServeError404Base(CDNCacheControlMixin, ServeRedirectMixin, ServeDocsMixin
 
         return None
 
+    def _get_path_index(self, project, version):
+        """
+        Get the index of the files of `version`.
+
+        Checking for files in the index avoids a query or a request to the storage.
+
+        :returns: a ``PathIndex``, or ``None`` if the version doesn't have an index.
+        """
+        storage_path = project.get_storage_path(
+            type_="html",
+            version_slug=version.slug,
+            include_file=False,
+            version_type=self.version_type,
+        )
+        return path_index_cache.get(
+            storage=build_media_storage,
+            storage_path=storage_path,
+        )
+
 
 class ServeError404(SettingsOverrideObject):
     _default_class = ServeError404Base
@@ -808,135 +952,43 @@ class ServeSitemapXMLBase(CDNCacheControlMixin, CDNCacheTagsMixin, View):
 
     def get(self, request):
         """
-        Generate and serve a ``sitemap.xml`` for a particular ``project``.
+        Serve the ``sitemap.xml`` for a particular ``project``.
 
         The sitemap is generated from all the ``active`` and public versions of
-        ``project``. These versions are sorted by using semantic versioning
-        prepending ``latest`` and ``stable`` (if they are enabled) at the beginning.
-
-        Following this order, the versions are assigned priorities and change
-        frequency. Starting from 1 and decreasing by 0.1 for priorities and starting
-        from daily, weekly to monthly for change frequency.
+        ``project``, see ``readthedocs.proxito.sitemap.get_sitemap_versions``.
+        It's pre-rendered when a build finishes, and stored in the cache.
 
         If the project doesn't have any public version, the view raises ``Http404``.
 
+        Responds with a 304 if the client already has the current sitemap
+        (using the ``If-None-Match`` or ``If-Modified-Since`` headers).
+
         :param request: Django request object
-        :param project: Project instance to generate the sitemap
 
-        :returns: response with the ``sitemap.xml`` template rendered
+        :returns: response with the ``sitemap.xml`` content
 
         :rtype: django.http.HttpResponse
         """
-        # pylint: disable=too-many-locals
-
-        def priorities_generator():
-            """
-            Generator returning ``priority`` needed by sitemap.xml.
-
-            It generates values from 1 to 0.1 by decreasing in 0.1 on each
-            iteration. After 0.1 is reached, it will keep returning 0.1.
-            """
-            priorities = [1, 0.9, 0.8, 0.7, 0.6, 0.5, 0.4, 0.3, 0.2]
-            yield from itertools.chain(priorities, itertools.repeat(0.1))
-
-        def hreflang_formatter(lang):
-            """
-            sitemap hreflang should follow correct format.
-
-            Use hyphen instead of underscore in language and country value.
-            ref: https://en.wikipedia.org/wiki/Hreflang#Common_Mistakes
-            """
-            if '_' in lang:
-                return lang.replace('_', '-')
-            return lang
-
-        def changefreqs_generator():
-            """
-            Generator returning ``changefreq`` needed by sitemap.xml.
-
-            It returns ``weekly`` on first iteration, then ``daily`` and then it
-            will return always ``monthly``.
-
-            We are using ``monthly`` as last value because ``never`` is too
-            aggressive. If the tag is removed and a branch is created with the same
-            name, we will want bots to revisit this.
-            """
-            changefreqs = ['weekly', 'daily']
-            yield from itertools.chain(changefreqs, itertools.repeat('monthly'))
-
         project = request.unresolved_domain.project
-        public_versions = Version.internal.public(
-            project=project,
-            only_active=True,
-        )
-        if not public_versions.exists():
+        sitemap = get_sitemap(project)
+        if not sitemap:
             raise Http404()
 
-        sorted_versions = sort_version_aware(public_versions)
-
-        # This is a hack to swap the latest version with
-        # stable version to get the stable version first in the sitemap.
-        # We want stable with priority=1 and changefreq='weekly' and
-        # latest with priority=0.9 and changefreq='daily'
-        # More details on this: https://github.com/rtfd/readthedocs.org/issues/5447
-        if (len(sorted_versions) >= 2 and sorted_versions[0].slug == LATEST and
-                sorted_versions[1].slug == STABLE):
-            sorted_versions[0], sorted_versions[1] = sorted_versions[1], sorted_versions[0]
-
-        versions = []
-        for version, priority, changefreq in zip(
-                sorted_versions,
-                priorities_generator(),
-                changefreqs_generator(),
-        ):
-            element = {
-                'loc': version.get_subdomain_url(),
-                'priority': priority,
-                'changefreq': changefreq,
-                'languages': [],
-            }
-
-            # Version can be enabled, but not ``built`` yet. We want to show the
-            # link without a ``lastmod`` attribute
-            last_build = version.builds.order_by('-date').first()
-            if last_build:
-                element['lastmod'] = last_build.date.isoformat()
-
-            resolver = Resolver()
-            if project.translations.exists():
-                for translation in project.translations.all():
-                    translated_version = (
-                        Version.internal.public(project=translation)
-                        .filter(slug=version.slug)
-                        .first()
-                    )
-                    if translated_version:
-                        href = resolver.resolve_version(
-                            project=translation,
-                            version=translated_version,
-                        )
-                        element['languages'].append({
-                            'hreflang': hreflang_formatter(translation.language),
-                            'href': href,
-                        })
-
-                # Add itself also as protocol requires
-                element['languages'].append({
-                    'hreflang': project.language,
-                    'href': element['loc'],
-                })
-
-            versions.append(element)
-
-        context = {
-            'versions': versions,
-        }
-        return render(
+        etag = quote_etag(sitemap["etag"])
+        last_modified = int(sitemap["last_modified"].timestamp())
+        response = get_conditional_response(
             request,
-            'sitemap.xml',
-            context,
-            content_type='application/xml',
+            etag=etag,
+            last_modified=last_modified,
         )
+        if response is None:
+            response = HttpResponse(
+                sitemap["content"],
+                content_type="application/xml",
+            )
+        response.headers["ETag"] = etag
+        response.headers["Last-Modified"] = http_date(last_modified)
+        return response
 
     def _get_project(self):
         # Method used by the CDNCacheTagsMixin class.
@@ -0,0 +1,263 @@
+"""
+Compiled redirect matcher.
+
+Matching a path against the redirects of a project using the database
+requires an annotated query per request (and another one for forced redirects),
+and the ``F()`` comparisons can't make use of an index.
+
+Instead, we compile all redirects from a project into a table
+of hash maps (for exact matches) and prefix tries (for wildcard matches),
+this table is stored in the cache and it's rebuilt
+when a redirect from the project is saved or deleted.
+"""
+
+from uuid import uuid4
+
+import structlog
+from django.conf import settings
+from django.core.cache import cache
+
+from readthedocs.redirects.constants import (
+    CLEAN_URL_TO_HTML_REDIRECT,
+    EXACT_REDIRECT,
+    HTML_TO_CLEAN_URL_REDIRECT,
+    PAGE_REDIRECT,
+)
+from readthedocs.redirects.querysets import RedirectQuerySet
+
+log = structlog.get_logger(__name__)
+
+
+class PrefixTrie:
+
+    """
+    Character trie that maps prefixes to a sorted list of ranks.
+
+    Each node is a dictionary of characters to child nodes,
+    the ranks of the prefixes ending at a node are stored under the ``""`` key.
+    """
+
+    __slots__ = ("root",)
+
+    def __init__(self):
+        self.root = {}
+
+    def insert(self, prefix, rank):
+        node = self.root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node.setdefault("", []).append(rank)
+
+    def iter_matches(self, value):
+        """Yield the list of ranks of all prefixes of `value`."""
+        node = self.root
+        if "" in node:
+            yield node[""]
+        for char in value:
+            node = node.get(char)
+            if node is None:
+                return
+            if "" in node:
+                yield node[""]
+
+
+class CompiledRedirects:
+
+    """
+    All enabled redirects of a project compiled into lookup tables.
+
+    Redirects are identified by their rank (their index in the
+    ``position`` ordering of the project's redirects),
+    so the redirect with the lowest rank that matches a path wins,
+    as it happens when querying the database.
+    """
+
+    __slots__ = (
+        "pks",
+        "forced",
+        "page_exact",
+        "page_prefixes",
+        "exact_exact",
+        "exact_prefixes",
+        "clean_url_to_html",
+        "html_to_clean_url",
+    )
+
+    def __init__(self, redirects):
+        """
+        Compile the given redirects.
+
+        :param redirects: Iterable of tuples with the
+         ``pk``, ``redirect_type``, ``from_url``, ``from_url_without_rest`` and ``force``
+         fields of each redirect, sorted by their position.
+        """
+        self.pks = []
+        self.forced = []
+        self.page_exact = {}
+        self.page_prefixes = PrefixTrie()
+        self.exact_exact = {}
+        self.exact_prefixes = PrefixTrie()
+        self.clean_url_to_html = []
+        self.html_to_clean_url = []
+
+        for rank, redirect in enumerate(redirects):
+            pk, redirect_type, from_url, from_url_without_rest, force = redirect
+            self.pks.append(pk)
+            self.forced.append(bool(force))
+            if redirect_type == PAGE_REDIRECT:
+                if from_url_without_rest is None:
+                    self.page_exact.setdefault(from_url, []).append(rank)
+                else:
+                    self.page_prefixes.insert(from_url_without_rest, rank)
+            elif redirect_type == EXACT_REDIRECT:
+                if from_url_without_rest is None:
+                    self.exact_exact.setdefault(from_url, []).append(rank)
+                else:
+                    self.exact_prefixes.insert(from_url_without_rest, rank)
+            elif redirect_type == CLEAN_URL_TO_HTML_REDIRECT:
+                self.clean_url_to_html.append(rank)
+            elif redirect_type == HTML_TO_CLEAN_URL_REDIRECT:
+                self.html_to_clean_url.append(rank)
+
+    @property
+    def has_forced(self):
+        return any(self.forced)
+
+    def _first_rank(self, ranks, forced_only):
+        for rank in ranks:
+            if not forced_only or self.forced[rank]:
+                return rank
+        return None
+
+    def match(self, filename, path, forced_only=False):
+        """
+        Get the pk of the first redirect that matches the given filename and path.
+
+        This follows the same rules as
+        ``RedirectQuerySet.get_matching_redirect_with_path``.
+
+        :param filename: The filename being served.
+        :param path: The whole path from the request.
+        :returns: The pk of the matching redirect or ``None``.
+        """
+        normalized_filename = RedirectQuerySet._normalize_path(filename)
+        normalized_path = RedirectQuerySet._normalize_path(path)
+        filename_without_trailling_slash = normalized_filename.rstrip("/")
+        path_without_trailling_slash = normalized_path.rstrip("/")
+
+        candidates = [
+            self.exact_exact.get(path_without_trailling_slash, ()),
+            *self.exact_prefixes.iter_matches(normalized_path),
+        ]
+        if filename:
+            candidates.append(self.page_exact.get(filename_without_trailling_slash, ()))
+            candidates.extend(self.page_prefixes.iter_matches(filename))
+            if filename not in ["/index.html", "/"]:
+                if filename.endswith(("/index.html", "/")):
+                    candidates.append(self.clean_url_to_html)
+                elif filename.endswith(".html"):
+                    candidates.append(self.html_to_clean_url)
+
+        best = None
+        for ranks in candidates:
+            rank = self._first_rank(ranks, forced_only)
+            if rank is not None and (best is None or rank < best):
+                best = rank
+        if best is None:
+            return None
+        return self.pks[best]
+
+
+def _get_version_key(project_id):
+    return f"redirects-version-{project_id}"
+
+
+def _get_table_key(project_id, version):
+    return f"redirects-compiled-{project_id}-{version}"
+
+
+def _get_version(project_id):
+    """
+    Get the current version of the compiled redirects of the project.
+
+    If the version was evicted from the cache, a new one is generated,
+    so we never end up using a stale table.
+    """
+    key = _get_version_key(project_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_compiled_redirects(project_id):
+    """Bump the version of the compiled redirects of the project."""
+    cache.set(_get_version_key(project_id), uuid4().hex, timeout=None)
+
+
+def get_compiled_redirects(project):
+    """Get the compiled redirects of the project from the cache, or build them."""
+    version = _get_version(project.pk)
+    key = _get_table_key(project.pk, version)
+    compiled = cache.get(key)
+    if compiled is None:
+        # Redirects are sorted by their position (default ordering of the model).
+        # TODO: use filter(enabled=True) once we have removed the null option from the field.
+        redirects = project.redirects.exclude(enabled=False).values_list(
+            "pk",
+            "redirect_type",
+            "from_url",
+            "from_url_without_rest",
+            "force",
+        )
+        compiled = CompiledRedirects(redirects)
+        cache.set(key, compiled, timeout=settings.RTD_REDIRECTS_COMPILED_CACHE_TIMEOUT)
+        log.debug(
+            "Compiled redirects.",
+            project_slug=project.slug,
+            version=version,
+            redirects=len(compiled.pks),
+        )
+    return compiled
+
+
+def get_matching_redirect_with_path(
+    project, filename, path=None, language=None, version_slug=None, forced_only=False
+):
+    """
+    Get the matching redirect with the path to redirect to.
+
+    Same as ``RedirectQuerySet.get_matching_redirect_with_path``,
+    but using the compiled redirects of the project,
+    the database is only hit to fetch the matching redirect.
+
+    :returns: A tuple with the matching redirect and new path.
+    """
+    compiled = get_compiled_redirects(project)
+    if forced_only and not compiled.has_forced:
+        return None, None
+
+    pk = compiled.match(filename=filename, path=path, forced_only=forced_only)
+    if pk is None:
+        return None, None
+
+    redirect = project.redirects.select_related("project").filter(pk=pk).first()
+    if not redirect:
+        # The redirect was deleted after the table was compiled.
+        invalidate_compiled_redirects(project.pk)
+        return project.redirects.get_matching_redirect_with_path(
+            filename=filename,
+            path=path,
+            language=language,
+            version_slug=version_slug,
+            forced_only=forced_only,
+        )
+
+    new_path = redirect.get_redirect_path(
+        filename=RedirectQuerySet._normalize_path(filename),
+        path=RedirectQuerySet._normalize_path(path),
+        language=language,
+        version_slug=version_slug,
+    )
+    return redirect, new_path
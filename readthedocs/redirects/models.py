@@ -18,6 +18,7 @@ from readthedocs.redirects.constants import (
     PAGE_REDIRECT,
     TYPE_CHOICES,
 )
+from readthedocs.redirects.matcher import invalidate_compiled_redirects
 from readthedocs.redirects.validators import validate_redirect
 
 from .querysets import RedirectQuerySet
@@ -150,10 +151,12 @@ class Redirect(models.Model):
 
         self._position_manager.change_position_before_save(self)
         super().save(*args, **kwargs)
+        invalidate_compiled_redirects(self.project_id)
 
     def delete(self, *args, **kwargs):
         super().delete(*args, **kwargs)
         self._position_manager.change_position_after_delete(self)
+        invalidate_compiled_redirects(self.project_id)
 
     def normalize_from_url(self, path):
         """
@@ -136,7 +136,8 @@ class RedirectQuerySet(models.QuerySet):
             return redirect, new_path
         return None, None
 
-    def _normalize_path(self, path):
+    @staticmethod
+    def _normalize_path(path):
         r"""
         Normalize path.
 
@@ -0,0 +1,203 @@
+import timeit
+
+import pytest
+from django.test import TestCase
+from django_dynamic_fixture import get
+
+from readthedocs.projects.models import Project
+from readthedocs.redirects.constants import (
+    CLEAN_URL_TO_HTML_REDIRECT,
+    EXACT_REDIRECT,
+    HTML_TO_CLEAN_URL_REDIRECT,
+    PAGE_REDIRECT,
+)
+from readthedocs.redirects.matcher import (
+    get_compiled_redirects,
+    get_matching_redirect_with_path,
+)
+from readthedocs.redirects.models import Redirect
+
+
+class CompiledRedirectsTests(TestCase):
+    # Tuples of (filename, path) to match against.
+    paths = [
+        ("/", "/en/latest/"),
+        ("/index.html", "/en/latest/index.html"),
+        ("/install.html", "/en/latest/install.html"),
+        ("/install/", "/en/latest/install/"),
+        ("/install/index.html", "/en/latest/install/index.html"),
+        ("/guides/setup.html", "/en/latest/guides/setup.html"),
+        ("/guides/", "/en/latest/guides/"),
+        ("/api/module.html", "/en/latest/api/module.html"),
+        ("/api", "/en/latest/api"),
+        ("/forced/page.html", "/en/latest/forced/page.html"),
+        ("/image.png", "/en/latest/image.png"),
+        ("", "/old/path.html"),
+        ("", "/old/path/"),
+        ("", "/exact/"),
+        ("", "/unknown.html"),
+    ]
+
+    def setUp(self):
+        self.project = get(Project, slug="project")
+
+    def _create_redirects(self):
+        redirects = [
+            dict(redirect_type=PAGE_REDIRECT, from_url="/install.html"),
+            dict(redirect_type=PAGE_REDIRECT, from_url="/guides/*"),
+            dict(redirect_type=PAGE_REDIRECT, from_url="/api/*", enabled=False),
+            dict(redirect_type=PAGE_REDIRECT, from_url="/api"),
+            dict(redirect_type=PAGE_REDIRECT, from_url="/forced/*", force=True),
+            dict(redirect_type=EXACT_REDIRECT, from_url="/old/*"),
+            dict(redirect_type=EXACT_REDIRECT, from_url="/old/path.html"),
+            dict(redirect_type=EXACT_REDIRECT, from_url="/exact/", force=True),
+            dict(redirect_type=EXACT_REDIRECT, from_url="/en/latest/install/"),
+            dict(redirect_type=CLEAN_URL_TO_HTML_REDIRECT),
+            dict(redirect_type=HTML_TO_CLEAN_URL_REDIRECT),
+        ]
+        for position, redirect in enumerate(redirects):
+            get(
+                Redirect,
+                project=self.project,
+                to_url="/new/:splat",
+                position=position,
+                **redirect,
+            )
+
+    def _assert_same_matches(self):
+        for filename, path in self.paths:
+            for forced_only in [False, True]:
+                expected = self.project.redirects.get_matching_redirect_with_path(
+                    filename=filename,
+                    path=path,
+                    forced_only=forced_only,
+                )
+                result = get_matching_redirect_with_path(
+                    project=self.project,
+                    filename=filename,
+                    path=path,
+                    forced_only=forced_only,
+                )
+                self.assertEqual(result, expected, (filename, path, forced_only))
+
+    def test_matches_are_the_same_as_the_sql_query(self):
+        self._create_redirects()
+        self._assert_same_matches()
+
+    def test_position_is_respected(self):
+        self._create_redirects()
+        redirect = get(
+            Redirect,
+            project=self.project,
+            redirect_type=PAGE_REDIRECT,
+            from_url="/*",
+            to_url="/all/:splat",
+            position=0,
+        )
+        result, _ = get_matching_redirect_with_path(
+            project=self.project,
+            filename="/install.html",
+            path="/en/latest/install.html",
+        )
+        self.assertEqual(result, redirect)
+        self._assert_same_matches()
+
+    def test_table_is_rebuilt_on_changes(self):
+        self._create_redirects()
+        get_compiled_redirects(self.project)
+
+        redirect = self.project.redirects.get(from_url="/install.html")
+        redirect.enabled = False
+        redirect.save()
+        self._assert_same_matches()
+
+        self.project.redirects.get(from_url="/guides/*").delete()
+        self._assert_same_matches()
+
+    def test_no_queries_without_matches(self):
+        self._create_redirects()
+        get_compiled_redirects(self.project)
+        with self.assertNumQueries(0):
+            result = get_matching_redirect_with_path(
+                project=self.project,
+                filename="/image.png",
+                path="/en/latest/image.png",
+            )
+        self.assertEqual(result, (None, None))
+
+        # One query to fetch the matching redirect,
+        # and another one from the resolver to build the new path.
+        with self.assertNumQueries(2):
+            result, _ = get_matching_redirect_with_path(
+                project=self.project,
+                filename="/install.html",
+                path="/en/latest/install.html",
+            )
+        self.assertEqual(result.from_url, "/install.html")
+
+    def test_many_redirects_are_matched_without_queries(self):
+        """Lookups that don't match don't query the database, no matter the number of redirects."""
+        for i in range(300):
+            get(
+                Redirect,
+                project=self.project,
+                redirect_type=PAGE_REDIRECT,
+                from_url=f"/page-{i}.html",
+                to_url=f"/new-page-{i}.html",
+                position=i,
+            )
+        get_compiled_redirects(self.project)
+
+        with self.assertNumQueries(0):
+            for filename, path in self.paths:
+                result, _ = get_matching_redirect_with_path(
+                    project=self.project, filename=filename, path=path
+                )
+                self.assertIsNone(result)
+
+        result, _ = get_matching_redirect_with_path(
+            project=self.project,
+            filename="/page-299.html",
+            path="/en/latest/page-299.html",
+        )
+        self.assertEqual(result.to_url, "/new-page-299.html")
+        self._assert_same_matches()
+
+    @pytest.mark.benchmark
+    def test_benchmark_compiled_matcher_against_sql(self):
+        """
+        Compare the time of the compiled matcher with the SQL query.
+
+        The SQL query runs against SQLite here, the difference is bigger
+        with a database over the network.
+        """
+        for i in range(300):
+            get(
+                Redirect,
+                project=self.project,
+                redirect_type=PAGE_REDIRECT,
+                from_url=f"/page-{i}.html",
+                to_url=f"/new-page-{i}.html",
+                position=i,
+            )
+        get_compiled_redirects(self.project)
+
+        def run_sql():
+            for filename, path in self.paths:
+                self.project.redirects.get_matching_redirect_with_path(
+                    filename=filename, path=path
+                )
+
+        def run_compiled():
+            for filename, path in self.paths:
+                get_matching_redirect_with_path(
+                    project=self.project, filename=filename, path=path
+                )
+
+        sql_time = timeit.timeit(run_sql, number=20)
+        compiled_time = timeit.timeit(run_compiled, number=20)
+        print(
+            f"Redirect matching: sql={sql_time:.4f}s compiled={compiled_time:.4f}s "
+            f"({len(self.paths) * 20} lookups, 300 redirects)"
+        )
+        self.assertLess(compiled_time, sql_time)
@@ -7,6 +7,12 @@ class BuildMediaFileSystemStorageTest(BuildMediaFileSystemStorage):
     def exists(self, *args, **kargs):
         return True
 
+    def get_manifest(self, *args, **kwargs):
+        return None
+
+    def get_manifest_hash(self, *args, **kwargs):
+        return None
+
 
 class StaticFileSystemStorageTest(BuildMediaFileSystemStorageTest):
     internal_redirect_root_path = "proxito-static"
@@ -974,6 +974,100 @@ class APITests(TestCase):
         self.assertEqual(response.status_code, 201)
         self.assertEqual(BuildCommandResult.objects.count(), 1)
 
+    def test_build_commands_bulk(self):
+        project = get(
+            Project,
+            language="en",
+        )
+        version = project.versions.first()
+        build = Build.objects.create(project=project, version=version)
+        other_build = Build.objects.create(project=get(Project))
+
+        client = APIClient()
+        _, build_api_key = BuildAPIKey.objects.create_key(project)
+        client.credentials(HTTP_AUTHORIZATION=f"Token {build_api_key}")
+
+        now = timezone.now()
+        commands = [
+            {
+                "build": build.pk,
+                "command": f"echo {i}",
+                "output": f"{i}",
+                "exit_code": 0,
+                "start_time": now + datetime.timedelta(seconds=i),
+                "end_time": now + datetime.timedelta(seconds=i + 1),
+            }
+            for i in range(3)
+        ]
+        response = client.post("/api/v2/command/bulk/", commands, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {"created": 3, "updated": 0})
+        self.assertEqual(
+            list(build.commands.values_list("command", flat=True)),
+            ["echo 0", "echo 1", "echo 2"],
+        )
+
+        # Existing commands are updated.
+        commands[0]["output"] = "updated"
+        response = client.post("/api/v2/command/bulk/", commands, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {"created": 0, "updated": 3})
+        self.assertEqual(build.commands.count(), 3)
+        self.assertEqual(build.commands.first().output, "updated")
+
+        # Commands from builds of other projects aren't allowed.
+        commands[0]["build"] = other_build.pk
+        commands[0]["start_time"] = now - datetime.timedelta(seconds=10)
+        response = client.post("/api/v2/command/bulk/", commands, format="json")
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(BuildCommandResult.objects.count(), 3)
+
+        # Normal users can't use this endpoint.
+        client = APIClient()
+        client.force_authenticate(user=get(User))
+        response = client.post("/api/v2/command/bulk/", commands, format="json")
+        self.assertEqual(response.status_code, 403)
+
+    def test_build_commands_bulk_running_command(self):
+        project = get(
+            Project,
+            language="en",
+        )
+        version = project.versions.first()
+        build = Build.objects.create(project=project, version=version)
+
+        client = APIClient()
+        _, build_api_key = BuildAPIKey.objects.create_key(project)
+        client.credentials(HTTP_AUTHORIZATION=f"Token {build_api_key}")
+
+        start_time = timezone.now()
+        command = {
+            "build": build.pk,
+            "command": "make html",
+            "output": "Running...",
+            "exit_code": None,
+            "start_time": start_time,
+            "end_time": None,
+        }
+        response = client.post("/api/v2/command/bulk/", [command], format="json")
+        self.assertEqual(response.status_code, 201)
+        result = build.commands.get()
+        self.assertIsNone(result.exit_code)
+        self.assertIsNone(result.run_time)
+
+        # The command is updated when it finishes.
+        command.update(
+            output="Running...\nDone.",
+            exit_code=0,
+            end_time=start_time + datetime.timedelta(seconds=10),
+        )
+        response = client.post("/api/v2/command/bulk/", [command], format="json")
+        self.assertEqual(response.data, {"created": 0, "updated": 1})
+        result = build.commands.get()
+        self.assertEqual(result.output, "Running...\nDone.")
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.run_time, 10)
+
     def test_build_commands_read_only_endpoints_for_normal_user(self):
         user_normal = get(User, is_staff=False)
         user_admin = get(User, is_staff=True)
@@ -10,7 +10,9 @@ from readthedocs.builds.constants import (
     SEMVER_VERSIONS,
     TAG,
 )
+from readthedocs.api.v2.utils import run_automation_rules
 from readthedocs.builds.models import (
+    AutomationRuleMatch,
     RegexAutomationRule,
     Version,
     VersionAutomationRule,
@@ -93,6 +95,7 @@ class TestRegexAutomationRules:
             action=VersionAutomationRule.ACTIVATE_VERSION_ACTION,
             version_type=version_type,
         )
+        assert rule.get_matcher()(version)[0] is result
         assert rule.run(version) is result
         assert rule.matches.all().count() == (1 if result else 0)
 
@@ -366,6 +369,104 @@ class TestRegexAutomationRules:
         assert match.action == VersionAutomationRule.ACTIVATE_VERSION_ACTION
         assert match.match_arg == '^test'
 
+    def test_run_automation_rules_in_bulk(self, trigger_build):
+        versions = [
+            get(
+                Version,
+                verbose_name=f"v1.{i}",
+                project=self.project,
+                active=False,
+                hidden=False,
+                privacy_level=PRIVATE,
+                type=TAG,
+                built=False,
+            )
+            for i in range(5)
+        ]
+        branch = get(
+            Version,
+            verbose_name="v1.x",
+            project=self.project,
+            active=False,
+            type=BRANCH,
+            built=False,
+        )
+        get(
+            RegexAutomationRule,
+            project=self.project,
+            priority=0,
+            match_arg=r"^v1\.[0-3]$",
+            action=VersionAutomationRule.ACTIVATE_VERSION_ACTION,
+            version_type=TAG,
+        )
+        get(
+            RegexAutomationRule,
+            project=self.project,
+            priority=1,
+            match_arg=r"^v1\.[34]$",
+            action=VersionAutomationRule.HIDE_VERSION_ACTION,
+            version_type=TAG,
+        )
+        get(
+            RegexAutomationRule,
+            project=self.project,
+            priority=2,
+            match_arg=r"^v1\.[02]$",
+            action=VersionAutomationRule.MAKE_VERSION_PUBLIC_ACTION,
+            version_type=TAG,
+        )
+        get(
+            RegexAutomationRule,
+            project=self.project,
+            priority=3,
+            match_arg=r"^v1\.2$",
+            action=VersionAutomationRule.SET_DEFAULT_VERSION_ACTION,
+            version_type=TAG,
+        )
+        get(
+            RegexAutomationRule,
+            project=self.project,
+            priority=4,
+            # Bad regex
+            match_arg=r"*",
+            action=VersionAutomationRule.HIDE_VERSION_ACTION,
+            version_type=TAG,
+        )
+
+        run_automation_rules(
+            self.project,
+            added_versions={version.slug for version in versions} | {branch.slug},
+            deleted_active_versions=set(),
+        )
+
+        for version in versions:
+            version.refresh_from_db()
+        branch.refresh_from_db()
+        self.project.refresh_from_db()
+
+        assert [version.active for version in versions] == [True] * 5
+        assert [version.hidden for version in versions] == [
+            False,
+            False,
+            False,
+            True,
+            True,
+        ]
+        assert [version.privacy_level for version in versions] == [
+            PUBLIC,
+            PRIVATE,
+            PUBLIC,
+            PRIVATE,
+            PRIVATE,
+        ]
+        assert not branch.active
+        assert self.project.default_version == versions[2].slug
+        # Only one build is triggered per activated version.
+        assert trigger_build.call_count == 5
+        assert AutomationRuleMatch.objects.filter(
+            rule__project=self.project
+        ).count() == 9
+
 
 @pytest.mark.django_db
 class TestAutomationRuleManager:
@@ -1,4 +1,5 @@
 import os
+import tempfile
 import textwrap
 from os.path import exists
 from unittest import mock
@@ -6,7 +7,7 @@ from unittest.mock import Mock, patch
 
 import django_dynamic_fixture as fixture
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from readthedocs.builds.constants import BRANCH, EXTERNAL, TAG
 from readthedocs.builds.models import Version
@@ -22,10 +23,14 @@ from readthedocs.rtd_tests.utils import (
     make_test_git,
     make_test_hg,
 )
+from readthedocs.vcs_support.mirrors import evict_mirrors
 
 
 # Avoid trying to save the commands via the API
-@mock.patch("readthedocs.doc_builder.environments.BuildCommand.save", mock.MagicMock())
+@mock.patch(
+    "readthedocs.doc_builder.environments.BaseBuildEnvironment.record_command",
+    mock.MagicMock(),
+)
 class TestGitBackend(TestCase):
     def setUp(self):
         git_repo = make_test_git()
@@ -358,9 +363,107 @@ class TestGitBackend(TestCase):
         # from the above clone+fetch
         repo.checkout("master")
 
+    def test_update_with_mirror(self):
+        mirrors_path = tempfile.mkdtemp()
+        create_git_branch(self.project.repo, "develop")
+        with override_settings(RTD_GIT_MIRRORS_PATH=mirrors_path):
+            repo = self.project.vcs_repo(
+                environment=self.build_environment,
+                version_type=BRANCH,
+                version_identifier="develop",
+            )
+            mirror_path = repo.get_mirror_path()
+            self.assertTrue(mirror_path.startswith(mirrors_path))
+
+            code, _, _ = repo.update()
+            self.assertEqual(code, 0)
+            repo.checkout("develop")
+            self.assertEqual(
+                repo.commit,
+                get_git_latest_commit_hash(self.project.repo, "develop").decode(),
+            )
+
+            # The mirror has the objects of the default branch and the version.
+            self.assertTrue(os.path.exists(os.path.join(mirror_path, "HEAD")))
+            self.assertTrue(
+                os.path.exists(
+                    os.path.join(mirror_path, "refs", "mirror", "heads", "develop")
+                )
+            )
+            # The clone doesn't depend on the mirror.
+            self.assertFalse(
+                os.path.exists(
+                    os.path.join(repo.working_dir, ".git/objects/info/alternates")
+                )
+            )
+            code, _, _ = repo.run("git", "fsck", "--connectivity-only", record=False)
+            self.assertEqual(code, 0)
+            # The size of the mirror is recorded for the eviction.
+            self.assertTrue(os.path.exists(f"{mirror_path}.size"))
+
+            # Update again from the existing mirror.
+            repo.make_clean_working_dir()
+            code, _, _ = repo.update()
+            self.assertEqual(code, 0)
+            repo.checkout("develop")
+
+    def test_update_with_mirror_external_version(self):
+        mirrors_path = tempfile.mkdtemp()
+        version = fixture.get(Version, project=self.project, type=EXTERNAL, active=True)
+        with override_settings(RTD_GIT_MIRRORS_PATH=mirrors_path):
+            repo = self.project.vcs_repo(
+                verbose_name=version.verbose_name,
+                version_type=version.type,
+                environment=self.build_environment,
+            )
+            self.assertIsNone(repo.get_mirror_path())
+            repo.update()
+        self.assertEqual(os.listdir(mirrors_path), [])
+
+    def test_evict_mirrors(self):
+        mirrors_path = tempfile.mkdtemp()
+        with override_settings(
+            RTD_GIT_MIRRORS_PATH=mirrors_path, RTD_GIT_MIRRORS_MAX_SIZE=0
+        ):
+            repo = self.project.vcs_repo(environment=self.build_environment)
+            mirror_path = repo.get_mirror_path()
+            repo.update()
+            # The mirror used by the build is kept.
+            self.assertTrue(os.path.exists(mirror_path))
+
+            evict_mirrors()
+            self.assertFalse(os.path.exists(mirror_path))
+            self.assertFalse(os.path.exists(f"{mirror_path}.lock"))
+            self.assertFalse(os.path.exists(f"{mirror_path}.size"))
+
+            # The mirror is created again on the next build.
+            repo.make_clean_working_dir()
+            code, _, _ = repo.update()
+            self.assertEqual(code, 0)
+            self.assertTrue(os.path.exists(os.path.join(mirror_path, "HEAD")))
+
+    def test_update_with_broken_mirror(self):
+        mirrors_path = tempfile.mkdtemp()
+        with override_settings(RTD_GIT_MIRRORS_PATH=mirrors_path):
+            repo = self.project.vcs_repo(environment=self.build_environment)
+            mirror_path = repo.get_mirror_path()
+            os.makedirs(mirror_path)
+            # Not a Git repository.
+            with open(os.path.join(mirror_path, "HEAD"), "w") as fd:
+                fd.write("broken")
+
+            code, _, _ = repo.update()
+            self.assertEqual(code, 0)
+            # The content is removed, but the directory is kept.
+            self.assertTrue(os.path.isdir(mirror_path))
+            self.assertEqual(os.listdir(mirror_path), [])
+
 
 # Avoid trying to save the commands via the API
-@mock.patch("readthedocs.doc_builder.environments.BuildCommand.save", mock.MagicMock())
+@mock.patch(
+    "readthedocs.doc_builder.environments.BaseBuildEnvironment.record_command",
+    mock.MagicMock(),
+)
 class TestHgBackend(TestCase):
     def setUp(self):
         hg_repo = make_test_hg()
@@ -1,13 +1,16 @@
+import hashlib
 import os
 import shutil
 import tempfile
 from pathlib import Path
+from unittest import mock
 
 import pytest
 from django.core.exceptions import SuspiciousFileOperation
 from django.test import TestCase, override_settings
 
 from readthedocs.builds.storage import BuildMediaFileSystemStorage
+from readthedocs.storage.s3_storage import S3BuildMediaStorageMixin
 
 files_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'files')
 
@@ -51,6 +54,62 @@ class TestBuildMediaStorage(TestCase):
         self.assertFalse(self.storage.exists("files/test-symlink.html"))
         self.assertFalse(self.storage.exists("files/dir-symlink"))
 
+    def test_copy_directory_skips_unchanged_files(self):
+        tmp_files_dir = Path(tempfile.mkdtemp()) / "files"
+        shutil.copytree(files_dir, tmp_files_dir, symlinks=True)
+        total_bytes = sum(
+            path.stat().st_size
+            for path in tmp_files_dir.rglob("*")
+            if path.is_file() and not path.is_symlink()
+        )
+
+        with override_settings(DOCROOT=tmp_files_dir):
+            stats = self.storage.copy_directory(tmp_files_dir, "files")
+        self.assertEqual(stats, {"files": 6, "bytes": total_bytes, "skipped_files": 0})
+
+        with override_settings(DOCROOT=tmp_files_dir):
+            stats = self.storage.copy_directory(tmp_files_dir, "files")
+        self.assertEqual(stats, {"files": 0, "bytes": 0, "skipped_files": 6})
+
+        # Same size, different content.
+        content = (tmp_files_dir / "conf.py").read_text()
+        (tmp_files_dir / "conf.py").write_text(content[::-1])
+        with override_settings(DOCROOT=tmp_files_dir):
+            stats = self.storage.copy_directory(tmp_files_dir, "files")
+        self.assertEqual(stats, {"files": 1, "bytes": len(content), "skipped_files": 5})
+        with self.storage.open("files/conf.py", "r") as fd:
+            self.assertEqual(fd.read(), content[::-1])
+
+    @mock.patch("readthedocs.builds.storage.time.sleep")
+    def test_copy_directory_retries_failed_uploads(self, sleep):
+        save = self.storage.save
+        failures = []
+
+        def flaky_save(name, content):
+            if name == "files/test.html" and not failures:
+                failures.append(name)
+                raise OSError("Connection reset")
+            return save(name, content)
+
+        with mock.patch.object(self.storage, "save", side_effect=flaky_save):
+            with override_settings(DOCROOT=files_dir):
+                stats = self.storage.copy_directory(files_dir, "files")
+
+        self.assertEqual(failures, ["files/test.html"])
+        self.assertEqual(stats["files"], 6)
+        self.assertTrue(self.storage.exists("files/test.html"))
+        sleep.assert_called_once_with(1)
+
+    @override_settings(RTD_BUILD_MEDIA_COPY_RETRIES=1)
+    @mock.patch("readthedocs.builds.storage.time.sleep")
+    def test_copy_directory_fails_after_retries(self, sleep):
+        with mock.patch.object(
+            self.storage, "save", side_effect=OSError("Connection reset")
+        ):
+            with override_settings(DOCROOT=files_dir):
+                with pytest.raises(OSError, match="Connection reset"):
+                    self.storage.copy_directory(files_dir, "files")
+
     def test_sync_directory(self):
         tmp_files_dir = os.path.join(tempfile.mkdtemp(), 'files')
         shutil.copytree(files_dir, tmp_files_dir, symlinks=True)
@@ -223,3 +282,167 @@ class TestBuildMediaStorage(TestCase):
         with override_settings(DOCROOT=tmp_docroot):
             with pytest.raises(SuspiciousFileOperation, match="outside the docroot"):
                 self.storage.rclone_sync_directory(tmp_dir, "files")
+
+
+class TestBuildMediaStorageManifest(TestCase):
+    def setUp(self):
+        self.test_media_dir = tempfile.mkdtemp()
+        self.storage = BuildMediaFileSystemStorage(location=self.test_media_dir)
+        # rclone isn't available when running the tests,
+        # we emulate the sync by copying the files.
+        self.storage._rclone = mock.Mock()
+        self.storage._rclone.sync.side_effect = self.storage.copy_directory
+
+    def tearDown(self):
+        shutil.rmtree(self.test_media_dir, ignore_errors=True)
+
+    def _sync(self, destination="files"):
+        with override_settings(DOCROOT=files_dir):
+            self.storage.rclone_sync_directory(files_dir, destination)
+
+    def test_manifest_is_saved_on_sync(self):
+        self.assertIsNone(self.storage.get_manifest("files"))
+        self._sync()
+
+        manifest = self.storage.get_manifest("files")
+        self.assertEqual(
+            [entry[0] for entry in manifest],
+            [
+                "404.html",
+                "api.fjson",
+                "api/index.html",
+                "conf.py",
+                "index.html",
+                "test.html",
+            ],
+        )
+        path, size, file_hash, _ = manifest[-1]
+        content = Path(files_dir, path).read_bytes()
+        self.assertEqual(size, len(content))
+        self.assertEqual(file_hash, hashlib.md5(content).hexdigest())
+
+        # The manifest isn't stored inside the synced directory.
+        self.assertTrue(self.storage.exists("manifests/files.json"))
+        self.assertNotIn("files.json", self.storage.listdir("files")[1])
+
+    def test_manifest_hash(self):
+        self.assertIsNone(self.storage.get_manifest_hash("files"))
+        self._sync()
+        manifest_hash = self.storage.get_manifest_hash("files")
+        self.assertEqual(
+            manifest_hash,
+            hashlib.md5(
+                Path(self.test_media_dir, "manifests/files.json").read_bytes()
+            ).hexdigest(),
+        )
+
+    def test_walk_with_manifest(self):
+        self._sync()
+        with mock.patch.object(self.storage, "listdir") as listdir:
+            output = list(self.storage.walk("files"))
+            listdir.assert_not_called()
+
+        self.assertEqual(
+            output,
+            [
+                (
+                    "files",
+                    ["api"],
+                    ["404.html", "api.fjson", "conf.py", "index.html", "test.html"],
+                ),
+                ("files/api", [], ["index.html"]),
+            ],
+        )
+
+    def test_delete_directory_with_manifest(self):
+        self._sync()
+        with mock.patch.object(self.storage, "listdir") as listdir:
+            self.storage.delete_directory("files/")
+            listdir.assert_not_called()
+
+        self.assertFalse(self.storage.exists("files/test.html"))
+        self.assertFalse(self.storage.exists("files/api/index.html"))
+        self.assertIsNone(self.storage.get_manifest("files"))
+
+    def test_delete_parent_directory_deletes_manifests(self):
+        self._sync("html/project/latest")
+        self._sync("html/project/stable")
+
+        self.storage.delete_directory("html/project")
+        self.assertFalse(self.storage.exists("html/project/latest/index.html"))
+        self.assertFalse(self.storage.exists("html/project/stable/index.html"))
+        self.assertIsNone(self.storage.get_manifest("html/project/latest"))
+        self.assertIsNone(self.storage.get_manifest("html/project/stable"))
+
+    def test_failed_sync_removes_manifest(self):
+        self._sync()
+        self.storage._rclone.sync.side_effect = Exception("Sync failed")
+        with pytest.raises(Exception, match="Sync failed"):
+            self._sync()
+        self.assertIsNone(self.storage.get_manifest("files"))
+
+    def test_files_are_hashed_once_on_sync(self):
+        with mock.patch.object(
+            self.storage, "_get_file_hash", wraps=self.storage._get_file_hash
+        ) as get_file_hash:
+            self._sync()
+        self.assertEqual(
+            get_file_hash.call_count, len(self.storage.get_manifest("files"))
+        )
+
+
+class TestS3BuildMediaStorage(TestCase):
+    class Storage(S3BuildMediaStorageMixin):
+        bucket_name = "media"
+
+    def test_delete_files_in_batches(self):
+        storage = self.Storage()
+        bucket = mock.Mock()
+        bucket.delete_objects.return_value = {}
+        paths = [f"html/project/latest/{i}.html" for i in range(2500)]
+        with mock.patch.object(self.Storage, "bucket", bucket):
+            storage.delete_files(iter(paths))
+
+        calls = bucket.delete_objects.call_args_list
+        self.assertEqual(
+            [len(call.kwargs["Delete"]["Objects"]) for call in calls],
+            [1000, 1000, 500],
+        )
+        self.assertEqual(
+            calls[0].kwargs["Delete"]["Objects"][0],
+            {"Key": "html/project/latest/0.html"},
+        )
+
+    def test_get_checksum(self):
+        storage = self.Storage()
+        connection = mock.Mock()
+        head_object = connection.meta.client.head_object
+        with mock.patch.object(self.Storage, "connection", connection):
+            head_object.return_value = {
+                "ETag": '"d41d8cd98f00b204e9800998ecf8427e"',
+                "ContentLength": 10,
+            }
+            self.assertEqual(
+                storage.get_checksum("html/project/latest/index.html"),
+                (10, "d41d8cd98f00b204e9800998ecf8427e"),
+            )
+            head_object.assert_called_once_with(
+                Bucket="media", Key="html/project/latest/index.html"
+            )
+
+            # Multipart upload, without the hash from rclone.
+            head_object.return_value = {"ETag": '"abc-2"', "ContentLength": 10}
+            self.assertEqual(
+                storage.get_checksum("html/project/latest/index.html"), (10, None)
+            )
+
+            # Multipart upload, with the hash from rclone.
+            head_object.return_value = {
+                "ETag": '"abc-2"',
+                "ContentLength": 10,
+                "Metadata": {"md5chksum": "1B2M2Y8AsgTpgAmY7PhCfg=="},
+            }
+            self.assertEqual(
+                storage.get_checksum("html/project/latest/index.html"),
+                (10, "d41d8cd98f00b204e9800998ecf8427e"),
+            )
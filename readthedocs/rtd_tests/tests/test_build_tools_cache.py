@@ -0,0 +1,127 @@
+import os
+import time
+from datetime import datetime
+from unittest import mock
+
+from readthedocs.doc_builder.build_tools_cache import BuildToolsCache
+
+
+def _populate(size):
+    def populate(path):
+        os.makedirs(os.path.join(path, "3.10.0", "bin"))
+        with open(os.path.join(path, "3.10.0", "bin", "python"), "wb") as fd:
+            fd.write(b"x" * size)
+
+    return populate
+
+
+class TestBuildToolsCache:
+    def test_get_key(self):
+        storage = mock.MagicMock()
+        storage.size.return_value = 100
+        storage.get_modified_time.return_value = datetime(2023, 1, 1)
+        key = BuildToolsCache.get_key(storage, "ubuntu-22.04-python-3.10.0.tar.gz")
+        assert key.startswith("ubuntu-22.04-python-3.10.0-")
+
+        # A tarball uploaded again gets a different key.
+        storage.get_modified_time.return_value = datetime(2023, 1, 2)
+        assert key != BuildToolsCache.get_key(
+            storage, "ubuntu-22.04-python-3.10.0.tar.gz"
+        )
+
+    def test_fetch(self, tmp_path):
+        cache = BuildToolsCache(path=str(tmp_path / "cache"), max_size=1024)
+        populate = mock.Mock(side_effect=_populate(100))
+
+        destination = tmp_path / "build-1"
+        hit, size = cache.fetch("python-3.10.0", str(destination), populate)
+        assert (hit, size) == (False, 100)
+        assert (destination / "3.10.0" / "bin" / "python").read_bytes() == b"x" * 100
+        populate.assert_called_once()
+
+        destination = tmp_path / "build-2"
+        hit, size = cache.fetch("python-3.10.0", str(destination), populate)
+        assert (hit, size) == (True, 100)
+        assert (destination / "3.10.0" / "bin" / "python").read_bytes() == b"x" * 100
+        populate.assert_called_once()
+
+        # Files are copied from the cache,
+        # a build modifying them doesn't modify the cache.
+        python = destination / "3.10.0" / "bin" / "python"
+        assert python.stat().st_nlink == 1
+        with open(python, "ab") as fd:
+            fd.write(b"poisoned")
+        destination = tmp_path / "build-3"
+        cache.fetch("python-3.10.0", str(destination), populate)
+        assert (destination / "3.10.0" / "bin" / "python").read_bytes() == b"x" * 100
+
+        # No temporary directories are left behind.
+        assert sorted(os.listdir(cache.path)) == [
+            ".lock",
+            "python-3.10.0",
+            "python-3.10.0.lock",
+            "python-3.10.0.size",
+        ]
+
+    def test_evict_least_recently_used(self, tmp_path):
+        cache = BuildToolsCache(path=str(tmp_path / "cache"), max_size=250)
+
+        cache.fetch("python-3.8", str(tmp_path / "build-1"), _populate(100))
+        cache.fetch("python-3.9", str(tmp_path / "build-2"), _populate(100))
+        os.utime(os.path.join(cache.path, "python-3.8"), (1, 1))
+        os.utime(os.path.join(cache.path, "python-3.9"), (2, 2))
+
+        # Use python-3.8, so python-3.9 becomes the least recently used.
+        hit, _ = cache.fetch("python-3.8", str(tmp_path / "build-3"), _populate(100))
+        assert hit
+
+        cache.fetch("python-3.10", str(tmp_path / "build-4"), _populate(100))
+        entries = sorted(
+            entry for entry in os.listdir(cache.path) if not entry.startswith(".")
+        )
+        assert entries == [
+            "python-3.10",
+            "python-3.10.lock",
+            "python-3.10.size",
+            "python-3.8",
+            "python-3.8.lock",
+            "python-3.8.size",
+        ]
+
+    def test_entry_bigger_than_cache_is_kept(self, tmp_path):
+        cache = BuildToolsCache(path=str(tmp_path / "cache"), max_size=50)
+        hit, size = cache.fetch("python-3.10", str(tmp_path / "build"), _populate(100))
+        assert (hit, size) == (False, 100)
+        assert os.path.isdir(os.path.join(cache.path, "python-3.10"))
+
+    def test_mounted_entry_is_not_evicted(self, tmp_path):
+        cache = BuildToolsCache(path=str(tmp_path / "cache"), max_size=150)
+
+        with cache.mount("python-3.9", _populate(100)) as (hit, size, path):
+            assert (hit, size) == (False, 100)
+            assert path == os.path.join(cache.path, "python-3.9")
+
+            # The entry is in use, it isn't removed to make space for the new one.
+            cache.fetch("python-3.10", str(tmp_path / "build"), _populate(100))
+            assert os.path.isdir(path)
+
+        # The entry isn't in use anymore.
+        cache.fetch("python-3.11", str(tmp_path / "build"), _populate(100))
+        assert not os.path.exists(path)
+        assert not os.path.exists(f"{path}.size")
+        assert not os.path.exists(f"{path}.lock")
+
+    def test_evict_stale_temporary_directories(self, tmp_path):
+        cache = BuildToolsCache(path=str(tmp_path / "cache"), max_size=1024)
+        os.makedirs(cache.path)
+        stale_path = os.path.join(cache.path, ".tmp-stale")
+        os.makedirs(stale_path)
+        old = time.time() - cache.tmp_max_age - 1
+        os.utime(stale_path, (old, old))
+        # Another build could be populating this one.
+        recent_path = os.path.join(cache.path, ".tmp-recent")
+        os.makedirs(recent_path)
+
+        cache.fetch("python-3.10", str(tmp_path / "build"), _populate(100))
+        assert not os.path.exists(stale_path)
+        assert os.path.isdir(recent_path)
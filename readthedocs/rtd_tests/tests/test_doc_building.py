@@ -4,6 +4,7 @@ from unittest import mock
 from unittest.mock import Mock, PropertyMock, patch
 
 import pytest
+from django.conf import settings
 from django.test import TestCase, override_settings
 from django_dynamic_fixture import get
 from docker.errors import APIError as DockerAPIError
@@ -11,11 +12,13 @@ from docker.errors import APIError as DockerAPIError
 from readthedocs.builds.models import Version
 from readthedocs.doc_builder.environments import (
     BuildCommand,
+    CommandOutputBuffer,
     DockerBuildCommand,
     DockerBuildEnvironment,
     LocalBuildEnvironment,
+    get_max_output_size,
 )
-from readthedocs.doc_builder.exceptions import BuildAppError
+from readthedocs.doc_builder.exceptions import BuildAppError, BuildUserError
 from readthedocs.projects.models import Project
 
 DUMMY_BUILD_ID = 123
@@ -58,17 +61,167 @@ class TestLocalBuildEnvironment(TestCase):
 
         command = build_env.commands[0]
         self.assertEqual(command.exit_code, 0)
-        api_client.command.post.assert_called_once_with(
-            {
-                "build": mock.ANY,
-                "command": command.get_command(),
-                "output": command.output,
-                "exit_code": 0,
-                "start_time": command.start_time,
-                "end_time": command.end_time,
-            }
+        api_client.command.bulk.post.assert_called_once_with(
+            [
+                {
+                    "build": mock.ANY,
+                    "command": command.get_command(),
+                    "output": command.output,
+                    "exit_code": 0,
+                    "start_time": command.start_time,
+                    "end_time": command.end_time,
+                }
+            ]
+        )
+        api_client.command.post.assert_not_called()
+
+    @override_settings(RTD_BUILD_COMMANDS_BATCH_SIZE=3)
+    def test_record_commands_in_bulk(self):
+        api_client = mock.MagicMock()
+        project = get(Project)
+        build_env = LocalBuildEnvironment(
+            project=project,
+            build={
+                "id": 1,
+            },
+            api_client=api_client,
+        )
+
+        with build_env:
+            for _ in range(4):
+                command = BuildCommand("true", build_env=build_env, cwd="/tmp")
+                command.run()
+                build_env.record_command(command)
+            # The first 3 commands are saved together.
+            api_client.command.bulk.post.assert_called_once()
+            self.assertEqual(len(api_client.command.bulk.post.call_args[0][0]), 3)
+
+        # The last command is saved when exiting the environment.
+        self.assertEqual(api_client.command.bulk.post.call_count, 2)
+        self.assertEqual(len(api_client.command.bulk.post.call_args[0][0]), 1)
+        api_client.command.post.assert_not_called()
+
+    def test_record_commands_run_in_bulk(self):
+        api_client = mock.MagicMock()
+        project = get(Project)
+        build_env = LocalBuildEnvironment(
+            project=project,
+            build={
+                "id": 1,
+            },
+            api_client=api_client,
+        )
+
+        with build_env:
+            for _ in range(3):
+                build_env.run("true", cwd="/tmp")
+            api_client.command.bulk.post.assert_not_called()
+
+        # All commands are saved together when exiting the environment.
+        api_client.command.bulk.post.assert_called_once()
+        self.assertEqual(len(api_client.command.bulk.post.call_args[0][0]), 3)
+
+    @override_settings(RTD_BUILD_COMMANDS_FLUSH_INTERVAL=0)
+    def test_record_commands_flush_interval(self):
+        api_client = mock.MagicMock()
+        project = get(Project)
+        build_env = LocalBuildEnvironment(
+            project=project,
+            build={
+                "id": 1,
+            },
+            api_client=api_client,
+        )
+
+        with build_env:
+            build_env.run("true", cwd="/tmp")
+            build_env.run("true", cwd="/tmp")
+            self.assertEqual(api_client.command.bulk.post.call_count, 2)
+
+    def test_record_commands_size_includes_error(self):
+        api_client = mock.MagicMock()
+        project = get(Project)
+        build_env = LocalBuildEnvironment(
+            project=project,
+            build={
+                "id": 1,
+            },
+            api_client=api_client,
         )
 
+        with build_env:
+            command = BuildCommand("true", build_env=build_env, cwd="/tmp")
+            command.run()
+            command.error = "error"
+            build_env.record_command(command)
+            self.assertEqual(
+                build_env._pending_commands_size,
+                len(command.output.encode()) + len(b"error"),
+            )
+
+    @override_settings(RTD_BUILD_COMMAND_OUTPUT_SAVE_INTERVAL=0.1)
+    def test_save_output_while_running(self):
+        api_client = mock.MagicMock()
+        project = get(Project)
+        build_env = LocalBuildEnvironment(
+            project=project,
+            build={
+                "id": 1,
+            },
+            api_client=api_client,
+        )
+
+        with build_env:
+            build_env.run("/bin/sh", "-c", "echo one; sleep 1; echo two", cwd="/tmp")
+
+        requests = [call[0][0] for call in api_client.command.bulk.post.call_args_list]
+        # The output is saved while the command runs,
+        # and the command is saved again when it finishes.
+        running = [command for commands in requests[:-1] for command in commands]
+        self.assertEqual(running[0]["output"], "one\n")
+        for command in running:
+            self.assertIsNone(command["exit_code"])
+            self.assertIsNone(command["end_time"])
+        [command] = requests[-1]
+        self.assertEqual(command["output"], "one\ntwo\n")
+        self.assertEqual(command["exit_code"], 0)
+        self.assertEqual(command["start_time"], running[0]["start_time"])
+
+    def test_dont_save_output_while_running_if_not_recorded(self):
+        api_client = mock.MagicMock()
+        project = get(Project)
+        build_env = LocalBuildEnvironment(
+            project=project,
+            build={
+                "id": 1,
+            },
+            api_client=api_client,
+        )
+
+        with override_settings(RTD_BUILD_COMMAND_OUTPUT_SAVE_INTERVAL=0.1):
+            with build_env:
+                build_env.run(
+                    "/bin/sh", "-c", "echo one; sleep 0.5", cwd="/tmp", record=False
+                )
+        api_client.command.bulk.post.assert_not_called()
+
+    def test_exit_doesnt_hide_the_build_exception(self):
+        api_client = mock.MagicMock()
+        api_client.command.bulk.post.side_effect = Exception("API error")
+        project = get(Project)
+        build_env = LocalBuildEnvironment(
+            project=project,
+            build={
+                "id": 1,
+            },
+            api_client=api_client,
+        )
+
+        with pytest.raises(BuildUserError):
+            with build_env:
+                build_env.run("false", cwd="/tmp")
+        api_client.command.bulk.post.assert_called_once()
+
 
 # TODO: translate these tests into
 # `readthedocs/projects/tests/test_docker_environment.py`. I've started the
@@ -99,7 +252,7 @@ class TestDockerBuildEnvironment(TestCase):
             {
                 "inspect_container.return_value": {"State": {"Running": True}},
                 "exec_create.return_value": {"Id": b"container-foobar"},
-                "exec_start.return_value": b"This is the return",
+                "exec_start.return_value": [b"This is the return"],
                 "exec_inspect.return_value": {"ExitCode": 0},
             },
         )
@@ -153,7 +306,7 @@ class TestDockerBuildEnvironment(TestCase):
                     {"State": {"Running": False, "ExitCode": 42}},
                 ],
                 "exec_create.return_value": {"Id": b"container-foobar"},
-                "exec_start.return_value": b"This is the return",
+                "exec_start.return_value": [b"This is the return"],
                 "exec_inspect.return_value": {"ExitCode": 0},
             },
         )
@@ -296,22 +449,65 @@ class TestBuildCommand(TestCase):
         for output, sanitized in checks:
             self.assertEqual(cmd.sanitize_output(output), sanitized)
 
-    @patch("subprocess.Popen")
-    def test_unicode_output(self, mock_subprocess):
+    def test_unicode_output(self):
         """Unicode output from command."""
-        mock_process = Mock(
-            **{
-                "communicate.return_value": (SAMPLE_UTF8_BYTES, b""),
-            }
+        cmd = BuildCommand(["printf", SAMPLE_UNICODE], cwd="/tmp")
+        cmd.run()
+        self.assertEqual(
+            cmd.output,
+            "H\xe9r\xc9 \xee\xdf s\xf6m\xea \xfcn\xef\xe7\xf3\u2202\xe9",
         )
-        mock_subprocess.return_value = mock_process
 
-        cmd = BuildCommand(["echo", "test"], cwd="/tmp/foobar")
+    @override_settings(
+        RTD_BUILD_COMMAND_OUTPUT_CHUNK_SIZE=1024,
+        RTD_BUILD_COMMAND_OUTPUT_HEAD_SIZE=10,
+        RTD_BUILD_COMMAND_OUTPUT_TAIL_SIZE=20,
+    )
+    def test_big_output(self):
+        """Only the beginning and the end of the output are kept."""
+        cmd = BuildCommand(
+            [
+                "/bin/bash",
+                "-c",
+                "echo START; head -c 1000000 /dev/zero | tr '\\0' a; echo; echo END",
+            ],
+            demux=True,
+        )
         cmd.run()
+        self.assertTrue(cmd.successful)
         self.assertEqual(
             cmd.output,
-            "H\xe9r\xc9 \xee\xdf s\xf6m\xea \xfcn\xef\xe7\xf3\u2202\xe9",
+            # stdout and stderr are read separately,
+            # so each one gets half of the space.
+            "START"
+            "\n\n.. (truncated) ...\n"
+            "Output is too big. Truncated 999996 bytes.\n\n\n"
+            "aaaaa\nEND\n",
         )
+        self.assertEqual(cmd.error, "")
+
+    def test_default_output_fits_in_an_api_request(self):
+        self.assertLess(
+            settings.RTD_BUILD_COMMAND_OUTPUT_HEAD_SIZE
+            + settings.RTD_BUILD_COMMAND_OUTPUT_TAIL_SIZE,
+            get_max_output_size(),
+        )
+
+    def test_command_output_buffer(self):
+        buffer = CommandOutputBuffer(head_size=5, tail_size=7)
+        for chunk in [b"abc", b"defgh", b"ijklmnop", b"qrs"]:
+            buffer.write(chunk)
+        self.assertEqual(
+            buffer.getvalue(),
+            b"abcde"
+            b"\n\n.. (truncated) ...\n"
+            b"Output is too big. Truncated 7 bytes.\n\n\n"
+            b"mnopqrs",
+        )
+
+        buffer = CommandOutputBuffer(head_size=5, tail_size=7)
+        buffer.write(b"hello world")
+        self.assertEqual(buffer.getvalue(), b"hello world")
 
 
 # TODO: translate this tests once we have DockerBuildEnvironment properly
@@ -351,7 +547,7 @@ class TestDockerBuildCommand(TestCase):
             "docker_client",
             {
                 "exec_create.return_value": {"Id": b"container-foobar"},
-                "exec_start.return_value": SAMPLE_UTF8_BYTES,
+                "exec_start.return_value": [SAMPLE_UTF8_BYTES],
                 "exec_inspect.return_value": {"ExitCode": 0},
             },
         )
@@ -374,7 +570,7 @@ class TestDockerBuildCommand(TestCase):
             "docker_client",
             {
                 "exec_create.return_value": {"Id": b"container-foobar"},
-                "exec_start.return_value": b"Killed\n",
+                "exec_start.return_value": [b"Killed\n"],
                 "exec_inspect.return_value": {"ExitCode": 137},
             },
         )
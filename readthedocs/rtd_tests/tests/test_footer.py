@@ -3,19 +3,24 @@ from unittest import mock
 import pytest
 from django.contrib.auth.models import User
 from django.contrib.sessions.backends.base import SessionBase
+from django.core.cache import cache
 from django.http import HttpResponse
 from django.test import TestCase, override_settings
 from django.urls import reverse
 from django_dynamic_fixture import get
 from rest_framework.test import APIRequestFactory
 
-from readthedocs.api.v2.views.footer_views import get_version_compare_data
+from readthedocs.api.v2.views.footer_views import (
+    NO_HIGHEST_VERSION,
+    get_version_compare_data,
+)
 from readthedocs.builds.constants import BRANCH, EXTERNAL, LATEST, TAG
 from readthedocs.builds.models import Version
 from readthedocs.core.middleware import ReadTheDocsSessionMiddleware
 from readthedocs.organizations.models import Organization
 from readthedocs.projects.constants import GITHUB_BRAND, GITLAB_BRAND, PRIVATE, PUBLIC
 from readthedocs.projects.models import Project
+from readthedocs.projects.version_handling import get_highest_version_cache_key
 from readthedocs.subscriptions.constants import TYPE_CNAME
 from readthedocs.subscriptions.products import RTDProductFeature
 
@@ -469,6 +474,78 @@ class TestVersionCompareFooter(TestCase):
         }
         self.assertDictEqual(valid_data, returned_data)
 
+    def test_highest_version_is_cached(self):
+        base_version = self.pip.versions.get(slug="0.8")
+        valid_data = {
+            "project": "Version 0.8.1 of Pip (19)",
+            "url": "https://pip.readthedocs.io/en/0.8.1/",
+            "slug": "0.8.1",
+            "version": "0.8.1",
+            "is_highest": False,
+        }
+        self.assertDictEqual(
+            valid_data, get_version_compare_data(self.pip, base_version)
+        )
+
+        # The versions of the project aren't sorted again.
+        with mock.patch(
+            "readthedocs.api.v2.views.footer_views.highest_version"
+        ) as highest_version:
+            self.assertDictEqual(
+                valid_data, get_version_compare_data(self.pip, base_version)
+            )
+            highest_version.assert_not_called()
+
+        # Creating a version invalidates the cache.
+        version = get(
+            Version,
+            project=self.pip,
+            verbose_name="1.0.0",
+            slug="1.0.0",
+            identifier="1.0.0",
+            type=TAG,
+            active=True,
+            built=True,
+            privacy_level=PUBLIC,
+        )
+        returned_data = get_version_compare_data(self.pip, base_version)
+        self.assertEqual(returned_data["slug"], "1.0.0")
+
+        # Making it private invalidates the cache.
+        version.privacy_level = PRIVATE
+        version.save()
+        returned_data = get_version_compare_data(self.pip, base_version)
+        self.assertEqual(returned_data["slug"], "0.8.1")
+
+    def test_cached_highest_version_is_checked(self):
+        base_version = self.pip.versions.get(slug="0.8")
+        returned_data = get_version_compare_data(self.pip, base_version)
+        self.assertEqual(returned_data["slug"], "0.8.1")
+
+        # Updates in bulk don't invalidate the cache,
+        # but a version that isn't built anymore isn't returned.
+        self.pip.versions.filter(slug="0.8.1").update(built=False)
+        returned_data = get_version_compare_data(self.pip, base_version)
+        self.assertEqual(returned_data["slug"], "0.8")
+
+    def test_project_without_highest_version_is_cached(self):
+        self.pip.versions.update(built=False)
+        base_version = self.pip.versions.get(slug="0.8")
+        returned_data = get_version_compare_data(self.pip, base_version)
+        self.assertEqual(returned_data["project"], "None")
+        self.assertEqual(
+            cache.get(get_highest_version_cache_key(self.pip.pk)),
+            NO_HIGHEST_VERSION,
+        )
+
+        with mock.patch(
+            "readthedocs.api.v2.views.footer_views.highest_version"
+        ) as highest_version:
+            self.assertEqual(
+                get_version_compare_data(self.pip, base_version), returned_data
+            )
+            highest_version.assert_not_called()
+
 
 @pytest.mark.proxito
 @override_settings(
@@ -510,7 +587,8 @@ class TestFooterPerformance(TestCase):
 
         # Second time we don't create a new page view,
         # this shouldn't impact the number of queries.
-        with self.assertNumQueries(self.EXPECTED_QUERIES):
+        # The highest version is cached, so we only need to fetch it.
+        with self.assertNumQueries(self.EXPECTED_QUERIES - 1):
             response = self.client.get(self.url, headers={"host": self.host})
             self.assertContains(response, "0.8.1")
 
@@ -1,3 +1,5 @@
+import copy
+
 import django_dynamic_fixture as fixture
 import requests_mock
 from allauth.socialaccount.models import SocialAccount, SocialToken
@@ -298,6 +300,54 @@ class GitHubOAuthSyncTests(TestCase):
         self.assertEqual(len(remote_repositories), 1)
         self.assertEqual(RemoteRepositoryRelation.objects.count(), 2)
 
+    @requests_mock.Mocker(kw="mock_request")
+    def test_sync_repositories_multiple_pages(self, mock_request):
+        second_repository = copy.deepcopy(self.payload_user_repos[0])
+        second_repository["id"] = 22222
+        second_repository["name"] = "other-repository"
+        second_repository["full_name"] = "organization/other-repository"
+        second_repository["permissions"]["admin"] = True
+        mock_request.get(
+            "https://api.github.com/user/repos",
+            json=self.payload_user_repos,
+            headers={
+                "Link": '<https://api.github.com/user/repos?page=2>; rel="next"',
+            },
+        )
+        mock_request.get(
+            "https://api.github.com/user/repos?page=2",
+            json=[second_repository],
+        )
+
+        remote_repositories = self.service.sync_repositories()
+
+        self.assertEqual(
+            [r.full_name for r in remote_repositories],
+            ["organization/repository", "organization/other-repository"],
+        )
+        self.assertEqual(RemoteRepository.objects.count(), 2)
+        self.assertEqual(RemoteRepositoryRelation.objects.count(), 2)
+        self.assertTrue(
+            RemoteRepositoryRelation.objects.get(
+                remote_repository__remote_id="22222"
+            ).admin
+        )
+        self.assertEqual(self.service.stats["api_calls"], 2)
+        self.assertEqual(self.service.stats["repositories"], 2)
+
+        # Syncing again updates the existing objects.
+        second_repository["description"] = "Updated"
+        second_repository["permissions"]["admin"] = False
+        self.service.sync_repositories()
+
+        self.assertEqual(RemoteRepository.objects.count(), 2)
+        self.assertEqual(RemoteRepositoryRelation.objects.count(), 2)
+        relation = RemoteRepositoryRelation.objects.get(
+            remote_repository__remote_id="22222"
+        )
+        self.assertFalse(relation.admin)
+        self.assertEqual(relation.remote_repository.description, "Updated")
+
     @requests_mock.Mocker(kw="mock_request")
     def test_sync_organizations(self, mock_request):
         payload = [
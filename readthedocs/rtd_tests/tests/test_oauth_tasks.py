@@ -6,15 +6,20 @@ from allauth.socialaccount.providers.bitbucket_oauth2.views import (
 )
 from allauth.socialaccount.providers.github.views import GitHubOAuth2Adapter
 from allauth.socialaccount.providers.gitlab.views import GitLabOAuth2Adapter
+from celery.exceptions import SoftTimeLimitExceeded
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
 from django_dynamic_fixture import get
 
 from readthedocs.builds.models import Version
 from readthedocs.oauth.services.base import SyncServiceError
 from readthedocs.oauth.tasks import (
+    sync_active_users_remote_repositories,
     sync_remote_repositories,
     sync_remote_repositories_organizations,
+    sync_users_remote_repositories,
 )
 from readthedocs.organizations.models import Organization, OrganizationOwner
 from readthedocs.projects.models import Project
@@ -116,3 +121,71 @@ class SyncRemoteRepositoriesTests(TestCase):
             args=[self.user.pk],
             countdown=0,
         )
+
+    @patch("readthedocs.oauth.tasks.sync_users_remote_repositories")
+    def test_sync_active_users_remote_repositories(
+        self, mock_sync_users_remote_repositories
+    ):
+        self.user.last_login = timezone.now()
+        self.user.save()
+        # Users without connected accounts aren't synced.
+        get(User, last_login=timezone.now())
+
+        sync_active_users_remote_repositories()
+        mock_sync_users_remote_repositories.delay.assert_called_once_with(
+            [self.user.pk]
+        )
+
+    @patch("readthedocs.oauth.tasks._sync_user_remote_repositories")
+    def test_sync_users_remote_repositories_skips_synced_users(
+        self, mock_sync_user_remote_repositories
+    ):
+        cache.clear()
+        mock_sync_user_remote_repositories.return_value = set()
+        user_2 = get(User)
+        # This user was synced by a previous delivery of the same batch.
+        cache.set(f"oauth-sync-remote-repositories-synced-{user_2.pk}", True)
+
+        sync_users_remote_repositories([self.user.pk, user_2.pk])
+        mock_sync_user_remote_repositories.assert_called_once_with(self.user)
+        self.assertTrue(
+            cache.get(f"oauth-sync-remote-repositories-synced-{self.user.pk}")
+        )
+
+    @override_settings(RTD_SYNC_REMOTE_REPOSITORIES_MAX_ATTEMPTS=2)
+    @patch("readthedocs.oauth.tasks._sync_user_remote_repositories")
+    def test_sync_users_remote_repositories_skips_abandoned_users(
+        self, mock_sync_user_remote_repositories
+    ):
+        cache.clear()
+        mock_sync_user_remote_repositories.return_value = set()
+        user_2 = get(User)
+        # The sync of this user was started by two previous deliveries
+        # of the same batch, and it never finished.
+        cache.set(f"oauth-sync-remote-repositories-started-{user_2.pk}", 2)
+
+        sync_users_remote_repositories([self.user.pk, user_2.pk])
+        mock_sync_user_remote_repositories.assert_called_once_with(self.user)
+        self.assertEqual(
+            cache.get(f"oauth-sync-remote-repositories-started-{self.user.pk}"), 1
+        )
+        self.assertIsNone(
+            cache.get(f"oauth-sync-remote-repositories-synced-{user_2.pk}")
+        )
+
+    @override_settings(RTD_SYNC_REMOTE_REPOSITORIES_WORKERS=1)
+    @patch("readthedocs.oauth.tasks.wait")
+    @patch("readthedocs.oauth.tasks._sync_user_remote_repositories")
+    def test_sync_users_remote_repositories_soft_time_limit(
+        self, mock_sync_user_remote_repositories, mock_wait
+    ):
+        cache.clear()
+        mock_sync_user_remote_repositories.return_value = set()
+        mock_wait.side_effect = SoftTimeLimitExceeded
+        user_2 = get(User)
+
+        with patch.object(sync_users_remote_repositories, "delay") as delay:
+            sync_users_remote_repositories([self.user.pk, user_2.pk])
+        # The user that wasn't started is moved to a new task.
+        delay.assert_called_once_with([user_2.pk])
+        mock_sync_user_remote_repositories.assert_called_once_with(self.user)
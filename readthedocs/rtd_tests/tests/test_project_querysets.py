@@ -1,4 +1,5 @@
 from datetime import timedelta
+from unittest import mock
 
 import django_dynamic_fixture as fixture
 from django.contrib.auth.models import User
@@ -292,3 +293,60 @@ class FeatureQuerySetTests(TestCase):
             [feature],
             ordered=False,
         )
+
+    def test_has_feature_is_cached(self):
+        project = fixture.get(Project, main_language_project=None)
+        feature = fixture.get(Feature, projects=[project])
+
+        with self.assertNumQueries(1):
+            self.assertTrue(project.has_feature(feature.feature_id))
+            self.assertFalse(project.has_feature("another-feature"))
+
+        # Other instances of the project use the shared cache.
+        project = Project.objects.get(pk=project.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(project.has_feature(feature.feature_id))
+
+        # The cache is invalidated when the feature changes,
+        # instances that already checked their features see the change.
+        feature.projects.remove(project)
+        self.assertFalse(project.has_feature(feature.feature_id))
+
+        feature.default_true = True
+        feature.add_date = project.pub_date + timedelta(days=1)
+        feature.save()
+        self.assertTrue(project.has_feature(feature.feature_id))
+
+    def test_has_feature_doesnt_read_the_cache_version_each_time(self):
+        project = fixture.get(Project, main_language_project=None)
+        feature = fixture.get(Feature, projects=[project])
+        self.assertTrue(project.has_feature(feature.feature_id))
+
+        with mock.patch("readthedocs.projects.models.cache") as cache:
+            self.assertTrue(project.has_feature(feature.feature_id))
+            self.assertFalse(project.has_feature("another-feature"))
+        cache.get.assert_not_called()
+        cache.get_many.assert_not_called()
+
+    def test_feature_changes_only_invalidate_its_projects(self):
+        project = fixture.get(Project, main_language_project=None)
+        another_project = fixture.get(Project, main_language_project=None)
+        feature = fixture.get(Feature, projects=[project])
+        self.assertTrue(project.has_feature(feature.feature_id))
+        self.assertFalse(another_project.has_feature(feature.feature_id))
+
+        another_feature = fixture.get(Feature)
+        another_feature.projects.add(another_project)
+        self.assertTrue(another_project.has_feature(another_feature.feature_id))
+        # The cached features of the first project are still valid.
+        with self.assertNumQueries(0):
+            self.assertFalse(project.has_feature(another_feature.feature_id))
+
+        # The relation can be changed from the project too.
+        project.feature_set.clear()
+        self.assertFalse(project.has_feature(feature.feature_id))
+        with self.assertNumQueries(0):
+            self.assertTrue(another_project.has_feature(another_feature.feature_id))
+
+        another_feature.delete()
+        self.assertFalse(another_project.has_feature(another_feature.feature_id))
@@ -1,10 +1,15 @@
+import time
 from unittest import mock
 
+import pytest
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django_dynamic_fixture import get
 
+from readthedocs.api.v2.utils import delete_versions_from_db, sync_versions_to_db
 from readthedocs.builds.constants import BRANCH, EXTERNAL, LATEST, STABLE, TAG
 from readthedocs.builds.models import (
     RegexAutomationRule,
@@ -14,6 +19,7 @@ from readthedocs.builds.models import (
 from readthedocs.builds.tasks import sync_versions_task
 from readthedocs.organizations.models import Organization, OrganizationOwner
 from readthedocs.projects.models import Project
+from readthedocs.proxito.sitemap import forget_main_language_project
 
 
 @mock.patch("readthedocs.core.utils.trigger_build", mock.MagicMock())
@@ -912,6 +918,160 @@ class TestSyncVersions(TestCase):
             1,
         )
 
+    def test_new_versions_with_conflicting_slugs(self):
+        get(
+            Version,
+            project=self.pip,
+            identifier="1!0",
+            verbose_name="1!0",
+            slug="1-0",
+            type=TAG,
+        )
+        tags_data = [
+            {
+                "identifier": "1!0",
+                "verbose_name": "1!0",
+            },
+            {
+                "identifier": "1%0",
+                "verbose_name": "1%0",
+            },
+            {
+                "identifier": "1?0",
+                "verbose_name": "1?0",
+            },
+        ]
+        sync_versions_task(
+            self.pip.pk,
+            branches_data=[],
+            tags_data=tags_data,
+        )
+        self.assertEqual(
+            dict(
+                self.pip.versions.filter(verbose_name__startswith="1").values_list(
+                    "verbose_name", "slug"
+                )
+            ),
+            {"1!0": "1-0", "1%0": "1-0_a", "1?0": "1-0_b"},
+        )
+
+    def test_sync_many_versions(self):
+        """
+        Sync a synthetic repository with 10k tags.
+
+        Versions are created, updated, and deleted in bulk.
+        """
+        tags_data = [
+            {
+                "identifier": f"{i:040x}",
+                "verbose_name": f"v{i}",
+            }
+            for i in range(10000)
+        ]
+
+        added = sync_versions_to_db(project=self.pip, versions=tags_data, type=TAG)
+        self.assertEqual(len(added), 10000)
+        self.assertEqual(
+            self.pip.versions.filter(type=TAG, verbose_name__startswith="v").count(),
+            10000,
+        )
+
+        # Change the identifier of all tags.
+        for tag in tags_data:
+            tag["identifier"] = tag["identifier"][::-1]
+        added = sync_versions_to_db(project=self.pip, versions=tags_data, type=TAG)
+        self.assertEqual(added, set())
+        self.assertEqual(
+            self.pip.versions.get(slug="v1").identifier,
+            tags_data[1]["identifier"],
+        )
+
+        # Remove half of the tags from the repository,
+        # active versions are kept.
+        self.pip.versions.filter(slug__in=["v1", "v3"]).update(active=True)
+        deleted_active_versions = delete_versions_from_db(
+            project=self.pip,
+            tags_data=tags_data[::2],
+            branches_data=[],
+        )
+        self.assertTrue({"v1", "v3"}.issubset(deleted_active_versions))
+        self.assertEqual(
+            self.pip.versions.filter(type=TAG, verbose_name__startswith="v").count(),
+            5002,
+        )
+
+    def test_delete_many_versions_doesnt_fetch_their_project(self):
+        tags_data = [
+            {
+                "identifier": f"{i:040x}",
+                "verbose_name": f"v{i}",
+            }
+            for i in range(50)
+        ]
+        sync_versions_to_db(project=self.pip, versions=tags_data, type=TAG)
+        forget_main_language_project(self.pip.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            delete_versions_from_db(
+                project=self.pip,
+                tags_data=[],
+                branches_data=[],
+            )
+        self.assertFalse(self.pip.versions.filter(verbose_name__startswith="v").exists())
+        self.assertFalse(
+            [
+                query
+                for query in queries.captured_queries
+                if 'FROM "projects_project"' in query["sql"]
+            ]
+        )
+
+    @pytest.mark.benchmark
+    def test_benchmark_sync_many_versions(self):
+        """
+        Measure the sync of a synthetic repository with 10k tags.
+
+        Versions are created and updated in batches, not one query per version.
+        The queries run against SQLite here, it limits the number of rows per query,
+        so batches are smaller than ``RTD_SYNC_VERSIONS_BATCH_SIZE``.
+        """
+        tags_data = [
+            {
+                "identifier": f"{i:040x}",
+                "verbose_name": f"v{i}",
+            }
+            for i in range(10000)
+        ]
+        max_queries = len(tags_data) // 20
+
+        start = time.perf_counter()
+        with CaptureQueriesContext(connection) as create_queries:
+            sync_versions_to_db(project=self.pip, versions=tags_data, type=TAG)
+        create_time = time.perf_counter() - start
+
+        for tag in tags_data:
+            tag["identifier"] = tag["identifier"][::-1]
+        start = time.perf_counter()
+        with CaptureQueriesContext(connection) as update_queries:
+            sync_versions_to_db(project=self.pip, versions=tags_data, type=TAG)
+        update_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        delete_versions_from_db(
+            project=self.pip,
+            tags_data=tags_data[::2],
+            branches_data=[],
+        )
+        delete_time = time.perf_counter() - start
+
+        print(
+            f"Version sync: create={create_time:.4f}s ({len(create_queries)} queries) "
+            f"update={update_time:.4f}s ({len(update_queries)} queries) "
+            f"delete={delete_time:.4f}s ({len(tags_data)} tags)"
+        )
+        self.assertLess(len(create_queries), max_queries)
+        self.assertLess(len(update_queries), max_queries)
+
     @mock.patch("readthedocs.builds.tasks.run_automation_rules")
     def test_automation_rules_are_triggered_for_new_versions(
         self, run_automation_rules
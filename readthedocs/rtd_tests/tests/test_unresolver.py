@@ -1,3 +1,5 @@
+from unittest import mock
+
 import django_dynamic_fixture as fixture
 import pytest
 from django.test import override_settings
@@ -11,14 +13,17 @@ from readthedocs.core.unresolver import (
     InvalidExternalVersionError,
     InvalidPathForVersionedProjectError,
     InvalidSchemeError,
+    InvalidSubdomainError,
     SuspiciousHostnameError,
     TranslationNotFoundError,
     TranslationWithoutVersionError,
     VersionNotFoundError,
     unresolve,
+    unresolver,
+    unresolver_cache,
 )
 from readthedocs.projects.constants import SINGLE_VERSION_WITHOUT_TRANSLATIONS
-from readthedocs.projects.models import Domain
+from readthedocs.projects.models import Domain, Project
 from readthedocs.rtd_tests.tests.test_resolver import ResolverBase
 
 
@@ -377,3 +382,126 @@ class UnResolverTests(ResolverBase):
         for url in invalid_urls:
             with pytest.raises(InvalidSchemeError):
                 unresolve(url)
+
+
+@override_settings(
+    PUBLIC_DOMAIN="readthedocs.io",
+    RTD_EXTERNAL_VERSION_DOMAIN="dev.readthedocs.build",
+)
+@pytest.mark.proxito
+class UnresolverCacheTests(ResolverBase):
+    def setUp(self):
+        super().setUp()
+        unresolver_cache.clear()
+
+    def test_public_domain_is_cached(self):
+        unresolver.unresolve_domain("pip.readthedocs.io")
+        self.assertEqual(unresolver_cache.stats["misses"], 1)
+
+        unresolved_domain = unresolver.unresolve_domain("pip.readthedocs.io")
+        self.assertEqual(unresolved_domain.project, self.pip)
+        self.assertEqual(unresolver_cache.stats["local_hits"], 1)
+
+        # The shared cache is used when the local cache is empty.
+        unresolver_cache._local.clear()
+        unresolved_domain = unresolver.unresolve_domain("pip.readthedocs.io")
+        self.assertEqual(unresolved_domain.project, self.pip)
+        self.assertEqual(unresolver_cache.stats["shared_hits"], 1)
+
+    def test_stats_are_logged(self):
+        with override_settings(RTD_UNRESOLVER_CACHE_STATS_INTERVAL=0), mock.patch(
+            "readthedocs.core.unresolver.log"
+        ) as log:
+            unresolver.unresolve_domain("pip.readthedocs.io")
+        log.info.assert_called_once_with(
+            "Unresolver cache stats.",
+            local_hits=0,
+            shared_hits=0,
+            misses=1,
+            seconds=0,
+        )
+        # Counters are reset after being logged.
+        self.assertEqual(unresolver_cache.stats["misses"], 0)
+
+    def test_cache_key_depends_on_the_models(self):
+        key = unresolver_cache.get_project_key("pip")
+        self.assertIn(unresolver_cache.schema_version, key)
+        with mock.patch.object(
+            Project._meta, "concrete_fields", Project._meta.concrete_fields[:-1]
+        ):
+            self.assertNotEqual(
+                unresolver_cache._get_schema_version(),
+                unresolver_cache.schema_version,
+            )
+
+    def test_custom_domain_is_cached(self):
+        domain = fixture.get(
+            Domain,
+            domain="docs.foobar.com",
+            project=self.pip,
+        )
+        unresolver.unresolve_domain("docs.foobar.com")
+        unresolved_domain = unresolver.unresolve_domain("docs.foobar.com")
+        self.assertEqual(unresolved_domain.project, self.pip)
+        self.assertEqual(unresolved_domain.domain, domain)
+        self.assertEqual(unresolver_cache.stats["misses"], 1)
+        self.assertEqual(unresolver_cache.stats["local_hits"], 1)
+
+        domain.delete()
+        with pytest.raises(InvalidCustomDomainError):
+            unresolver.unresolve_domain("docs.foobar.com")
+
+    def test_unknown_hosts_are_cached(self):
+        with pytest.raises(InvalidSubdomainError):
+            unresolver.unresolve_domain("foo.readthedocs.io")
+        with self.assertNumQueries(0):
+            with pytest.raises(InvalidSubdomainError):
+                unresolver.unresolve_domain("foo.readthedocs.io")
+
+        with pytest.raises(InvalidCustomDomainError):
+            unresolver.unresolve_domain("docs.foobar.com")
+        with self.assertNumQueries(0):
+            with pytest.raises(InvalidCustomDomainError):
+                unresolver.unresolve_domain("docs.foobar.com")
+
+        # Creating the objects invalidates the negative results.
+        project = fixture.get(Project, slug="foo", main_language_project=None)
+        domain = fixture.get(Domain, domain="docs.foobar.com", project=self.pip)
+        self.assertEqual(
+            unresolver.unresolve_domain("foo.readthedocs.io").project, project
+        )
+        self.assertEqual(unresolver.unresolve_domain("docs.foobar.com").domain, domain)
+
+    def test_cache_hits_dont_query_the_database(self):
+        fixture.get(Domain, domain="docs.foobar.com", project=self.pip)
+        unresolver.unresolve_domain("pip.readthedocs.io")
+        unresolver.unresolve_domain("docs.foobar.com")
+
+        with self.assertNumQueries(0):
+            unresolved_domain = unresolver.unresolve_domain("pip.readthedocs.io")
+            self.assertEqual(unresolved_domain.project, self.pip)
+            unresolved_domain = unresolver.unresolve_domain("docs.foobar.com")
+            self.assertEqual(unresolved_domain.project, self.pip)
+
+        # Each hit returns a new instance of the cached object.
+        unresolved_domain.project.slug = "foo"
+        unresolved_domain = unresolver.unresolve_domain("docs.foobar.com")
+        self.assertEqual(unresolved_domain.project.slug, "pip")
+
+    def test_renamed_project_is_not_served_from_cache(self):
+        unresolver.unresolve_domain("pip.readthedocs.io")
+        self.pip.slug = "pip-new"
+        self.pip.save()
+        with pytest.raises(InvalidSubdomainError):
+            unresolver.unresolve_domain("pip.readthedocs.io")
+        self.assertEqual(
+            unresolver.unresolve_domain("pip-new.readthedocs.io").project, self.pip
+        )
+
+    def test_updated_project_is_not_served_from_cached_domain(self):
+        fixture.get(Domain, domain="docs.foobar.com", project=self.pip)
+        unresolver.unresolve_domain("docs.foobar.com")
+        self.pip.custom_prefix = "/prefix/"
+        self.pip.save()
+        unresolved_domain = unresolver.unresolve_domain("docs.foobar.com")
+        self.assertEqual(unresolved_domain.project.custom_prefix, "/prefix/")
@@ -105,6 +105,17 @@ class VersionSlugFieldTests(TestCase):
         self.assertEqual(field.uniquifying_suffix(26), "_ba")
         self.assertEqual(field.uniquifying_suffix(52), "_ca")
 
+    def test_create_slugs(self):
+        field = Version._meta.get_field("slug")
+        slugs = field.create_slugs(
+            model_cls=Version,
+            contents=["1!0", "1%0", "releases/1.0", "-", "1?0"],
+            existing_slugs=["1-0", "unknown"],
+        )
+        self.assertEqual(
+            slugs, ["1-0_a", "1-0_b", "releases-1.0", "unknown_a", "1-0_c"]
+        )
+
     def test_unicode(self):
         version = Version.objects.create(
             verbose_name="camión",
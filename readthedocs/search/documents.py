@@ -89,6 +89,8 @@ class PageDocument(RTDDocTypeMixin, Document):
     path = fields.KeywordField(attr='processed_json.path')
     full_path = fields.KeywordField(attr='path')
     rank = fields.IntegerField()
+    # Hash of the content of the page, used to skip re-indexing unchanged pages.
+    content_hash = fields.KeywordField()
 
     # Searchable content
     title = fields.TextField(
@@ -117,6 +119,11 @@ class PageDocument(RTDDocTypeMixin, Document):
             return 0
         return html_file.rank
 
+    def prepare_content_hash(self, html_file):
+        # This isn't a field from the model,
+        # it's only set when indexing the pages from a build.
+        return getattr(html_file, 'content_hash', None)
+
     def get_queryset(self):
         """Don't include ignored files and delisted projects."""
         queryset = super().get_queryset()
@@ -14,6 +14,9 @@ log = structlog.get_logger(__name__)
 class GenericParser:
     # Limit that matches the ``index.mapping.nested_objects.limit`` ES setting.
     max_inner_documents = 10000
+    # Increase it when the parser changes its output,
+    # so unchanged pages are parsed and indexed again.
+    parser_version = 1
 
     def __init__(self, version):
         self.version = version
@@ -395,8 +398,17 @@ class GenericParser:
             ],
         }
         """
+        content = self._get_page_content(page)
+        return self.parse_content(page, content)
+
+    def parse_content(self, page, content):
+        """
+        Get the parsed JSON for search indexing from the content of the page.
+
+        Same as ``parse``, but the content of the page is given,
+        this allows us to fetch and parse pages in different stages.
+        """
         try:
-            content = self._get_page_content(page)
             if content:
                 return self._process_content(page, content)
         except Exception:
@@ -0,0 +1,282 @@
+"""
+Pipelined indexing of pages into the search index.
+
+Pages go through three stages:
+
+- Fetch: the content of the page is read from storage, using a pool of threads,
+  since this is mostly waiting on the network.
+  Pages with the same content hash (and rank) as the already indexed ones
+  skip the next stages, they are only re-tagged with the new sync ID.
+- Parse: the content is parsed with ``GenericParser``, using a pool of processes,
+  so pages are parsed in parallel while other pages are being fetched and indexed.
+  Parsing holds the GIL, threads don't parse in parallel.
+  We use ``billiard`` (Celery's fork of ``multiprocessing``),
+  since the processes of Celery's prefork workers are daemonic,
+  and ``multiprocessing`` doesn't allow them to have children.
+- Index: parsed pages are sent to ES in chunks as soon as they are ready.
+
+The number of pages in the pipeline at any given time is limited,
+so memory usage doesn't depend on the number of pages of the version.
+"""
+
+import hashlib
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import billiard
+import structlog
+from django.conf import settings
+from django_elasticsearch_dsl.apps import DEDConfig
+
+from readthedocs.search.documents import PageDocument
+from readthedocs.search.parsers import GenericParser
+from readthedocs.search.utils import index_objects, retag_indexed_files
+
+log = structlog.get_logger(__name__)
+
+
+def _timed(function, *args):
+    start = time.monotonic()
+    result = function(*args)
+    return result, time.monotonic() - start
+
+
+# Parser used by the processes of the parse pool (see ``_init_parse_process``).
+_process_parser = None
+
+
+def _init_parse_process(parser):
+    global _process_parser
+    _process_parser = parser
+
+
+def _parse_in_process(page, content):
+    return _timed(_process_parser.parse_content, page, content)
+
+
+def _run_inline(function, *args):
+    """Run `function` in the current thread, and return a completed future."""
+    future = Future()
+    try:
+        future.set_result(function(*args))
+    except Exception as exc:  # noqa
+        future.set_exception(exc)
+    return future
+
+
+class PageIndexingPipeline:
+
+    """
+    Fetch, parse and index pages from a version.
+
+    :param version: Version the pages belong to.
+    :param index_name: Name of the ES index, the default one is used if ``None``.
+    :param chunk_size: Number of pages to send to ES in each request.
+    :param sync_id: ID of the current sync, used to re-tag unchanged pages.
+    :param indexed_pages: Dictionary of paths to a tuple of (content_hash, rank)
+     of the pages that are already indexed, unchanged pages aren't indexed again.
+    """
+
+    def __init__(
+        self, version, index_name=None, chunk_size=100, sync_id=None, indexed_pages=None
+    ):
+        self.version = version
+        self.index_name = index_name
+        self.chunk_size = chunk_size
+        self.sync_id = sync_id
+        self.indexed_pages = indexed_pages or {}
+        self.unchanged_paths = []
+        self.fetch_workers = settings.RTD_SEARCH_INDEXING_FETCH_WORKERS
+        self.parse_workers = settings.RTD_SEARCH_INDEXING_PARSE_WORKERS
+        # We need at least one chunk of pages in flight.
+        self.max_in_flight = max(
+            settings.RTD_SEARCH_INDEXING_MAX_IN_FLIGHT, self.chunk_size
+        )
+        self.parser = GenericParser(version)
+        self.document = PageDocument()
+        self.stats = {
+            "pages": 0,
+            "unchanged_pages": 0,
+            "fetch_seconds": 0.0,
+            "parse_seconds": 0.0,
+            "index_seconds": 0.0,
+        }
+
+    def _get_parse_pool(self):
+        """
+        Get the pool of processes for the parse stage.
+
+        Processes are forked, they get a copy of the parser of the pipeline.
+        If there are no parse workers, pages are parsed in the current thread.
+        """
+        if self.parse_workers:
+            return billiard.Pool(
+                processes=self.parse_workers,
+                initializer=_init_parse_process,
+                initargs=(self.parser,),
+            )
+        return None
+
+    def _fetch(self, page):
+        return _timed(self._fetch_content, page)
+
+    def _fetch_content(self, page):
+        """
+        Get the content of the page and its hash.
+
+        The hash includes the version of the parser and the documentation type,
+        since they change the result of parsing the same content.
+        """
+        content = self.parser._get_page_content(page)
+        content_hash = None
+        if content:
+            parser_version = self.parser.parser_version
+            doctype = self.version.documentation_type
+            content_hash = hashlib.sha256(
+                f"{parser_version}:{doctype}:{content}".encode()
+            ).hexdigest()
+        return content, content_hash
+
+    def _is_unchanged(self, html_file):
+        indexed_page = self.indexed_pages.get(html_file.path)
+        if not indexed_page or not html_file.content_hash:
+            return False
+        return indexed_page == (
+            html_file.content_hash,
+            self.document.prepare_rank(html_file),
+        )
+
+    def _index(self, html_files):
+        start = time.monotonic()
+        index_objects(
+            document=PageDocument,
+            objects=html_files,
+            index_name=self.index_name,
+            chunk_size=self.chunk_size,
+        )
+        self.stats["index_seconds"] += time.monotonic() - start
+
+    def run(self, html_files):
+        """
+        Index all `html_files`.
+
+        The parsed content of each page is set as the ``processed_json``
+        attribute of the ``HTMLFile`` object before indexing it.
+        """
+        if not DEDConfig.autosync_enabled():
+            log.info("Autosync disabled, skipping searh indexing.")
+            return
+
+        start = time.monotonic()
+        parse_pool = self._get_parse_pool()
+        fetch_executor = ThreadPoolExecutor(max_workers=self.fetch_workers)
+        try:
+            self._run(
+                html_files=iter(html_files),
+                fetch_executor=fetch_executor,
+                parse_pool=parse_pool,
+            )
+        finally:
+            fetch_executor.shutdown(cancel_futures=True)
+            if parse_pool:
+                parse_pool.terminate()
+                parse_pool.join()
+
+        if self.unchanged_paths:
+            retag_indexed_files(
+                project_slug=self.version.project.slug,
+                version_slug=self.version.slug,
+                paths=self.unchanged_paths,
+                sync_id=self.sync_id,
+                index_name=self.index_name,
+            )
+        self._log_stats(total_seconds=time.monotonic() - start)
+
+    def _submit_parse(self, parse_pool, page, content):
+        if parse_pool:
+            future = Future()
+            parse_pool.apply_async(
+                _parse_in_process,
+                (page, content),
+                callback=future.set_result,
+                error_callback=future.set_exception,
+            )
+            return future
+        return _run_inline(_timed, self.parser.parse_content, page, content)
+
+    def _run(self, html_files, fetch_executor, parse_pool):
+        fetching = deque()
+        parsing = deque()
+        ready = []
+        exhausted = False
+        while True:
+            # Fill the pipeline with new pages to fetch.
+            while not exhausted and (
+                len(fetching) + len(parsing) + len(ready) < self.max_in_flight
+            ):
+                html_file = next(html_files, None)
+                if html_file is None:
+                    exhausted = True
+                    break
+                fetching.append(
+                    (html_file, fetch_executor.submit(self._fetch, html_file.path))
+                )
+
+            if not fetching and not parsing:
+                break
+
+            # Move the oldest fetched page to the parse stage,
+            # this blocks only if the page is still being fetched.
+            if fetching:
+                html_file, future = fetching.popleft()
+                (content, content_hash), elapsed = future.result()
+                self.stats["fetch_seconds"] += elapsed
+                html_file.content_hash = content_hash
+                if self._is_unchanged(html_file):
+                    self.unchanged_paths.append(html_file.path)
+                    self.stats["unchanged_pages"] += 1
+                else:
+                    parsing.append(
+                        (
+                            html_file,
+                            self._submit_parse(parse_pool, html_file.path, content),
+                        )
+                    )
+
+            # Collect the pages that were parsed, if there is nothing left to fetch
+            # we wait for all pages being parsed.
+            while parsing and (parsing[0][1].done() or not fetching):
+                html_file, future = parsing.popleft()
+                processed_json, elapsed = future.result()
+                self.stats["parse_seconds"] += elapsed
+                # Avoid parsing the page again when indexing it.
+                html_file.processed_json = processed_json
+                ready.append(html_file)
+                self.stats["pages"] += 1
+
+                if len(ready) >= self.chunk_size:
+                    self._index(ready)
+                    ready = []
+
+        if ready:
+            self._index(ready)
+
+    def _log_stats(self, total_seconds):
+        pages = self.stats["pages"]
+
+        def docs_per_second(seconds):
+            return round(pages / seconds, 2) if seconds else None
+
+        log.info(
+            "Pages indexed.",
+            pages=pages,
+            unchanged_pages=self.stats["unchanged_pages"],
+            total_seconds=round(total_seconds, 2),
+            docs_per_second=docs_per_second(total_seconds),
+            fetch_docs_per_second=docs_per_second(self.stats["fetch_seconds"]),
+            parse_docs_per_second=docs_per_second(self.stats["parse_seconds"]),
+            index_docs_per_second=docs_per_second(self.stats["index_seconds"]),
+            fetch_workers=self.fetch_workers,
+            parse_workers=self.parse_workers,
+        )
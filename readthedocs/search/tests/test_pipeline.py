@@ -0,0 +1,190 @@
+import os
+import time
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from django_dynamic_fixture import get
+
+from readthedocs.projects.constants import MKDOCS
+from readthedocs.projects.models import HTMLFile, Project
+from readthedocs.search.parsers import GenericParser
+from readthedocs.search.pipeline import PageIndexingPipeline
+
+data_path = Path(__file__).parent.resolve() / "data"
+
+
+@pytest.mark.django_db
+@pytest.mark.search
+class TestPageIndexingPipeline:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        self.project = get(
+            Project,
+            slug="test",
+            main_language_project=None,
+        )
+        self.version = self.project.versions.first()
+        settings.ELASTICSEARCH_DSL_AUTOSYNC = True
+        settings.RTD_SEARCH_INDEXING_MAX_IN_FLIGHT = 3
+        self.pages = {
+            path.name: path.read_text()
+            for path in (data_path / "sphinx/in").glob("*.html")
+        }
+
+    def _get_page_content(self, page):
+        return self.pages.get(page)
+
+    # Pages are parsed in a pool of processes by default,
+    # or in the current thread when there are no parse workers.
+    @pytest.mark.parametrize("parse_workers", [2, 0])
+    @mock.patch("readthedocs.search.pipeline.index_objects")
+    @mock.patch.object(GenericParser, "_get_page_content")
+    def test_pages_are_parsed_and_indexed_in_chunks(
+        self, get_page_content, index_objects, parse_workers, settings
+    ):
+        settings.RTD_SEARCH_INDEXING_PARSE_WORKERS = parse_workers
+        get_page_content.side_effect = self._get_page_content
+        indexed = []
+        index_objects.side_effect = lambda objects, **kwargs: indexed.append(
+            list(objects)
+        )
+
+        html_files = [
+            HTMLFile(project=self.project, version=self.version, path=page, name=page)
+            for page in sorted(self.pages) + ["missing.html"]
+        ]
+        pipeline = PageIndexingPipeline(version=self.version, chunk_size=2)
+        pipeline.run(html_files)
+
+        assert [len(chunk) for chunk in indexed] == [2, 2, 2, 2]
+        assert [html_file for chunk in indexed for html_file in chunk] == html_files
+        assert pipeline.stats["pages"] == len(html_files)
+
+        parser = GenericParser(self.version)
+        for html_file in html_files:
+            expected = parser.parse_content(
+                html_file.path, self.pages.get(html_file.path)
+            )
+            assert html_file.processed_json == expected
+
+    @mock.patch("readthedocs.search.pipeline.index_objects")
+    @mock.patch.object(GenericParser, "_get_page_content")
+    def test_autosync_disabled(self, get_page_content, index_objects, settings):
+        settings.ELASTICSEARCH_DSL_AUTOSYNC = False
+        html_files = [
+            HTMLFile(project=self.project, version=self.version, path=page, name=page)
+            for page in self.pages
+        ]
+        PageIndexingPipeline(version=self.version).run(html_files)
+        get_page_content.assert_not_called()
+        index_objects.assert_not_called()
+
+    @mock.patch("readthedocs.search.pipeline.retag_indexed_files")
+    @mock.patch("readthedocs.search.pipeline.index_objects")
+    @mock.patch.object(GenericParser, "_get_page_content")
+    def test_unchanged_pages_are_retagged(
+        self, get_page_content, index_objects, retag_indexed_files
+    ):
+        get_page_content.side_effect = self._get_page_content
+        indexed = []
+        index_objects.side_effect = lambda objects, **kwargs: indexed.extend(objects)
+
+        html_files = [
+            HTMLFile(project=self.project, version=self.version, path=page, name=page)
+            for page in sorted(self.pages)
+        ]
+        pipeline = PageIndexingPipeline(version=self.version, sync_id=2)
+        pipeline.run(html_files)
+        assert len(indexed) == len(html_files)
+        retag_indexed_files.assert_not_called()
+
+        # Simulate a new sync, where only one page changed its content,
+        # and another one changed its rank.
+        indexed_pages = {
+            html_file.path: (html_file.content_hash, 0) for html_file in indexed
+        }
+        indexed_pages["page.html"] = ("changed", 0)
+        html_files = [
+            HTMLFile(
+                project=self.project,
+                version=self.version,
+                path=page,
+                name=page,
+                rank=2 if page == "toctree.html" else 0,
+            )
+            for page in sorted(self.pages)
+        ]
+        indexed = []
+        pipeline = PageIndexingPipeline(
+            version=self.version, sync_id=3, indexed_pages=indexed_pages
+        )
+        pipeline.run(html_files)
+
+        assert [html_file.path for html_file in indexed] == [
+            "page.html",
+            "toctree.html",
+        ]
+        unchanged_paths = sorted(set(self.pages) - {"page.html", "toctree.html"})
+        retag_indexed_files.assert_called_once_with(
+            project_slug=self.project.slug,
+            version_slug=self.version.slug,
+            paths=unchanged_paths,
+            sync_id=3,
+            index_name=None,
+        )
+
+    @mock.patch("readthedocs.search.pipeline.index_objects")
+    @mock.patch.object(GenericParser, "_get_page_content")
+    def test_content_hash_depends_on_the_parser_and_doctype(
+        self, get_page_content, index_objects
+    ):
+        get_page_content.side_effect = self._get_page_content
+        pipeline = PageIndexingPipeline(version=self.version)
+        content, content_hash = pipeline._fetch_content("page.html")
+        assert content == self.pages["page.html"]
+
+        with mock.patch.object(GenericParser, "parser_version", 2):
+            _, other_content_hash = pipeline._fetch_content("page.html")
+        assert other_content_hash != content_hash
+
+        self.version.documentation_type = MKDOCS
+        _, other_content_hash = pipeline._fetch_content("page.html")
+        assert other_content_hash != content_hash
+
+    @pytest.mark.benchmark
+    @mock.patch("readthedocs.search.pipeline.index_objects")
+    @mock.patch.object(GenericParser, "_get_page_content")
+    def test_parse_workers_speedup(self, get_page_content, index_objects, settings):
+        settings.RTD_SEARCH_INDEXING_MAX_IN_FLIGHT = 500
+        pages = sorted(self.pages)
+        # Pages ~10 times bigger than the test pages, and enough of them
+        # to make the cost of starting the processes negligible.
+        contents = {page: self.pages[page] * 10 for page in pages}
+        get_page_content.side_effect = lambda page: contents[page.split("/")[-1]]
+
+        def run(parse_workers):
+            settings.RTD_SEARCH_INDEXING_PARSE_WORKERS = parse_workers
+            html_files = [
+                HTMLFile(
+                    project=self.project,
+                    version=self.version,
+                    path=f"{i}/{page}",
+                    name=page,
+                )
+                for i in range(200)
+                for page in pages
+            ]
+            start = time.monotonic()
+            PageIndexingPipeline(version=self.version).run(html_files)
+            return time.monotonic() - start
+
+        workers = len(os.sched_getaffinity(0))
+        inline_seconds = run(0)
+        pool_seconds = run(workers)
+        print(
+            f"Parsed {200 * len(pages)} pages in {inline_seconds:.2f}s inline, "
+            f"{pool_seconds:.2f}s with {workers} processes."
+        )
+        if workers > 1:
+            assert pool_seconds < inline_seconds
@@ -2,9 +2,12 @@ import time
 
 import pytest
 from django.urls import reverse
+from django_dynamic_fixture import get
 
 from readthedocs.builds.constants import LATEST, STABLE
+from readthedocs.projects.models import HTMLFile
 from readthedocs.search import utils
+from readthedocs.search.documents import PageDocument
 from readthedocs.search.tests.utils import get_search_query_from_project_file
 
 
@@ -66,3 +69,78 @@ class TestSearchUtils:
         for project in ["pipeline", "docs"]:
             for version in [LATEST, STABLE]:
                 assert self.has_results(api_client, project, version)
+
+    def get_indexed_paths(self, project_slug, version_slug):
+        search = (
+            PageDocument.search()
+            .filter("term", project=project_slug)
+            .filter("term", version=version_slug)
+        )
+        return {result.full_path for result in search.scan()}
+
+    def test_get_indexed_pages(self, all_projects):
+        project = "kuma"
+
+        # Pages indexed without a content hash aren't included.
+        assert utils.get_indexed_pages(project, LATEST) == {}
+
+        html_file, another_html_file = HTMLFile.objects.filter(
+            project__slug=project, version__slug=LATEST
+        )
+        html_file.content_hash = "abc"
+        PageDocument().update(html_file)
+        another_html_file.content_hash = "def"
+        PageDocument().update(another_html_file)
+        assert utils.get_indexed_pages(project, LATEST) == {
+            html_file.path: ("abc", PageDocument().prepare_rank(html_file)),
+            another_html_file.path: (
+                "def",
+                PageDocument().prepare_rank(another_html_file),
+            ),
+        }
+
+        # Pages indexed more than once aren't included.
+        duplicated_html_file = get(
+            HTMLFile,
+            project=html_file.project,
+            version=html_file.version,
+            name=html_file.name,
+            path=html_file.path,
+            build=1,
+        )
+        duplicated_html_file.content_hash = "abc"
+        PageDocument().update(duplicated_html_file)
+        assert utils.get_indexed_pages(project, LATEST) == {
+            another_html_file.path: (
+                "def",
+                PageDocument().prepare_rank(another_html_file),
+            ),
+        }
+
+    def test_retag_indexed_files(self, all_projects):
+        project = "kuma"
+        html_file, removed_html_file = HTMLFile.objects.filter(
+            project__slug=project, version__slug=LATEST
+        )
+
+        utils.retag_indexed_files(
+            project_slug=project,
+            version_slug=LATEST,
+            paths=[html_file.path],
+            sync_id=2,
+        )
+        # Pages that weren't re-tagged are deleted right after.
+        utils.remove_indexed_files(
+            project_slug=project,
+            version_slug=LATEST,
+            sync_id=2,
+        )
+        # Deletion of indices from ES happens async,
+        # so we need to wait a little before checking for results.
+        time.sleep(1)
+
+        assert self.get_indexed_paths(project, LATEST) == {html_file.path}
+        assert self.get_indexed_paths(project, STABLE) == {
+            html_file.path,
+            removed_html_file.path,
+        }
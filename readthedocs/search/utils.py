@@ -4,6 +4,7 @@ import structlog
 from django.utils import timezone
 from django_elasticsearch_dsl.apps import DEDConfig
 from django_elasticsearch_dsl.registries import registry
+from elasticsearch_dsl import UpdateByQuery
 
 from readthedocs.search.documents import PageDocument
 
@@ -64,7 +65,9 @@ def remove_indexed_files(
             documents = documents.filter("term", version=version_slug)
         if sync_id:
             documents = documents.exclude("term", build=sync_id)
-        documents.delete()
+        # Don't abort if a page was updated while deleting,
+        # the rest of the pages should be deleted anyway.
+        documents.params(conflicts="proceed").delete()
     except Exception:
         log.exception("Unable to delete a subset of files. Continuing.")
 
@@ -73,6 +76,91 @@ def remove_indexed_files(
         document._index._name = old_index_name
 
 
+def get_indexed_pages(project_slug, version_slug, index_name=None):
+    """
+    Get the content hash and rank of the pages indexed for a version.
+
+    Pages that are indexed more than once (e.g. from an interrupted sync),
+    or that were indexed before we started storing their content hash
+    are excluded, so they are always re-indexed.
+
+    :returns: A dictionary of paths to a tuple of (content_hash, rank).
+    """
+    if not DEDConfig.autosync_enabled():
+        return {}
+
+    document = PageDocument
+    old_index_name = document._index._name
+    if index_name:
+        document._index._name = index_name
+
+    pages = {}
+    duplicated = set()
+    try:
+        search = (
+            document()
+            .search()
+            .filter("term", project=project_slug)
+            .filter("term", version=version_slug)
+            .source(["full_path", "content_hash", "rank"])
+        )
+        for result in search.scan():
+            path = result.full_path
+            if path in pages:
+                duplicated.add(path)
+            pages[path] = (result.to_dict().get("content_hash"), result.rank)
+    except Exception:
+        log.exception("Unable to fetch indexed pages, all pages will be re-indexed.")
+        pages = {}
+    finally:
+        # Restore the old index name.
+        if index_name:
+            document._index._name = old_index_name
+
+    return {
+        path: page for path, page in pages.items() if path not in duplicated and page[0]
+    }
+
+
+def retag_indexed_files(
+    project_slug, version_slug, paths, sync_id, index_name=None, chunk_size=1000
+):
+    """
+    Update the sync ID of already indexed pages.
+
+    This is used for pages that didn't change since the last sync,
+    so they aren't deleted by ``remove_indexed_files``.
+    """
+    if not DEDConfig.autosync_enabled() or not paths:
+        return
+
+    document = PageDocument
+    old_index_name = document._index._name
+    if index_name:
+        document._index._name = index_name
+
+    try:
+        for start in range(0, len(paths), chunk_size):
+            (
+                UpdateByQuery(using=document._get_using(), index=document._index._name)
+                .filter("term", project=project_slug)
+                .filter("term", version=version_slug)
+                .filter("terms", full_path=paths[start : start + chunk_size])
+                .script(
+                    source="ctx._source.build = params.sync_id",
+                    params={"sync_id": sync_id},
+                )
+                # Refresh the index, so the re-tagged pages
+                # aren't deleted by ``remove_indexed_files`` right after.
+                .params(conflicts="proceed", refresh=True)
+                .execute()
+            )
+    finally:
+        # Restore the old index name.
+        if index_name:
+            document._index._name = old_index_name
+
+
 def _get_index(indices, index_name):
     """
     Get Index from all the indices.
@@ -142,6 +142,11 @@ class CommunityBaseSettings(Settings):
     RTD_BUILDS_RETRY_DELAY = 5 * 60  # seconds
     RTD_BUILD_STATUS_API_NAME = 'docs/readthedocs'
     RTD_ANALYTICS_DEFAULT_RETENTION_DAYS = 30 * 3
+    # Count page views in the cache and flush them to the database periodically,
+    # see readthedocs.analytics.buffer.
+    RTD_ANALYTICS_BUFFER_PAGE_VIEWS = True
+    RTD_ANALYTICS_BUFFER_BUCKET_SECONDS = 60
+    RTD_ANALYTICS_BUFFER_MAX_KEYS = 100000
     RTD_AUDITLOGS_DEFAULT_RETENTION_DAYS = 30 * 3
 
     # Number of days the validation process for a domain will be retried.
@@ -155,6 +160,130 @@ class CommunityBaseSettings(Settings):
 
     RTD_ENFORCE_BROWNOUTS_FOR_DEPRECATIONS = False
 
+    # Cache for the project/domain objects looked up by the unresolver.
+    # The local cache lives in the memory of each proxito process.
+    # Entries are invalidated on save/delete, changes made without
+    # triggering signals (QuerySet.update()) are visible after the timeout.
+    RTD_UNRESOLVER_CACHE_TIMEOUT = 60 * 10  # seconds
+    RTD_UNRESOLVER_CACHE_NEGATIVE_TIMEOUT = 60 * 5  # seconds
+    RTD_UNRESOLVER_CACHE_LOCAL_TIMEOUT = 10  # seconds
+    RTD_UNRESOLVER_CACHE_LOCAL_SIZE = 10000
+    # Each process logs the hits and misses of the cache every this number of seconds.
+    RTD_UNRESOLVER_CACHE_STATS_INTERVAL = 60 * 5  # seconds
+
+    # Timeout of the compiled redirects of a project,
+    # they are also invalidated when a redirect changes.
+    RTD_REDIRECTS_COMPILED_CACHE_TIMEOUT = 60 * 60 * 24  # seconds
+
+    # Timeout of the rendered sitemap.xml of a project,
+    # it's re-generated when a build finishes.
+    RTD_SITEMAP_CACHE_TIMEOUT = 60 * 60 * 24  # seconds
+
+    # Max number of versions with their path index cached in memory
+    # by each proxito process, and max number of paths of all their indexes.
+    RTD_PATH_INDEX_CACHE_SIZE = 1000
+    RTD_PATH_INDEX_CACHE_MAX_PATHS = 1000000
+    # Seconds before checking if the manifest of a cached path index changed,
+    # files synced to storage are found in the index after this time.
+    RTD_PATH_INDEX_CHECK_INTERVAL = 10
+
+    # Timeout of the cached custom 404 pages of a version,
+    # they are also invalidated when the files of the version are synced again.
+    # Versions without a custom 404 page are cached for a shorter time.
+    # Pages bigger than the max size aren't cached,
+    # and pages aren't cached once the total size cached during the timeout is reached.
+    # Hits are added to the shared counter in batches.
+    RTD_CUSTOM_404_CACHE_TIMEOUT = 60 * 60 * 24  # seconds
+    RTD_CUSTOM_404_CACHE_NEGATIVE_TIMEOUT = 60 * 5  # seconds
+    RTD_CUSTOM_404_CACHE_MAX_SIZE = 256 * 1024  # bytes
+    RTD_CUSTOM_404_CACHE_MAX_TOTAL_SIZE = 64 * 1024 * 1024  # bytes
+    RTD_CUSTOM_404_CACHE_HITS_BATCH_SIZE = 100
+
+    # Search indexing pipeline.
+    # Threads used to fetch pages from storage,
+    # processes used to parse them (0 to parse them in the same process),
+    # and max number of pages being processed at the same time.
+    RTD_SEARCH_INDEXING_FETCH_WORKERS = 8
+    RTD_SEARCH_INDEXING_PARSE_WORKERS = 2
+    RTD_SEARCH_INDEXING_MAX_IN_FLIGHT = 500
+
+    # Threads used to upload files from ``BuildMediaStorageMixin.copy_directory``,
+    # and number of times each upload is retried.
+    RTD_BUILD_MEDIA_COPY_WORKERS = 8
+    RTD_BUILD_MEDIA_COPY_RETRIES = 3
+
+    # Number of versions created, updated or deleted per query when syncing versions.
+    RTD_SYNC_VERSIONS_BATCH_SIZE = 500
+
+    # Active users are re-synced weekly in batches of users,
+    # the users of each batch are synced concurrently by a pool of threads.
+    # Users that weren't started when the time budget of the batch runs out
+    # are moved to a new task, and users already synced are skipped
+    # if the batch is re-delivered.
+    # Users whose sync was started ``MAX_ATTEMPTS`` times without finishing
+    # (e.g. it hangs until the worker is killed) are skipped too.
+    RTD_SYNC_REMOTE_REPOSITORIES_BATCH_SIZE = 100
+    RTD_SYNC_REMOTE_REPOSITORIES_WORKERS = 8
+    RTD_SYNC_REMOTE_REPOSITORIES_BATCH_TIME_BUDGET = 30 * 60  # seconds
+    RTD_SYNC_REMOTE_REPOSITORIES_CHECKPOINT_TIMEOUT = 60 * 60 * 12  # seconds
+    RTD_SYNC_REMOTE_REPOSITORIES_MAX_ATTEMPTS = 3
+
+    # Calls to the API of a VCS provider wait for the rate limit of the token to be reset
+    # when it has less than this number of requests remaining.
+    RTD_OAUTH_RATE_LIMIT_MIN_REMAINING = 50
+    RTD_OAUTH_RATE_LIMIT_MAX_WAIT = 5 * 60  # seconds
+
+    # Timeout of the cached feature flags of a project,
+    # they are also invalidated when a feature changes.
+    # The versions of the cache are kept in the memory of each process
+    # for a few seconds, other processes see the changes after that time.
+    RTD_PROJECT_FEATURES_CACHE_TIMEOUT = 60 * 60 * 24  # seconds
+    RTD_PROJECT_FEATURES_VERSION_LOCAL_TIMEOUT = 5  # seconds
+    RTD_PROJECT_FEATURES_VERSION_LOCAL_SIZE = 10000
+
+    # Timeout of the cached highest public version of a project (used by the footer),
+    # it's also invalidated when a version of the project changes.
+    RTD_HIGHEST_VERSION_CACHE_TIMEOUT = 60 * 60  # seconds
+
+    # Output of build commands is read in chunks,
+    # and only the beginning and the end of the output are kept in memory
+    # (split between stdout and stderr when they are read separately).
+    # They should fit in a request to the API (``DATA_UPLOAD_MAX_MEMORY_SIZE``).
+    # The output is saved while the command runs every ``SAVE_INTERVAL`` seconds.
+    RTD_BUILD_COMMAND_OUTPUT_CHUNK_SIZE = 64 * 1024  # bytes
+    RTD_BUILD_COMMAND_OUTPUT_HEAD_SIZE = 256 * 1024  # bytes
+    RTD_BUILD_COMMAND_OUTPUT_TAIL_SIZE = 1536 * 1024  # bytes
+    RTD_BUILD_COMMAND_OUTPUT_SAVE_INTERVAL = 5  # seconds
+
+    # Build commands are saved in bulk via the API,
+    # after this number of commands or when the oldest one has been waiting for this time.
+    # They are also saved at the end of each phase of the build.
+    RTD_BUILD_COMMANDS_BATCH_SIZE = 50
+    RTD_BUILD_COMMANDS_FLUSH_INTERVAL = 5  # seconds
+
+    # Number of artifact types (html, pdf, etc) uploaded to or deleted from
+    # the storage at the same time at the end of a build.
+    RTD_BUILD_ARTIFACTS_UPLOAD_WORKERS = 4
+
+    # Build tools downloaded from ``build_tools_storage`` are kept extracted
+    # on the builder's disk, up to this size, so they aren't downloaded on each build.
+    # Tools are mounted read-only in the Docker build container,
+    # other environments copy them from the cache, with a reflink if the filesystem
+    # of the path and ``DOCROOT`` supports it.
+    # Set it to ``None`` to disable the cache.
+    @property
+    def RTD_BUILD_TOOLS_CACHE_PATH(self):
+        return os.path.join(self.DOCROOT, ".build-tools")
+
+    RTD_BUILD_TOOLS_CACHE_MAX_SIZE = 5 * 1024 * 1024 * 1024  # bytes
+
+    # Git repositories are fetched into a bare mirror on the builder's disk,
+    # and clones borrow objects from it, so only new objects are downloaded.
+    # Mirrors are removed when they exceed this size, least recently used first.
+    # Set the path to enable the mirrors (disabled by default).
+    RTD_GIT_MIRRORS_PATH = None
+    RTD_GIT_MIRRORS_MAX_SIZE = 20 * 1024 * 1024 * 1024  # bytes
+
     @property
     def RTD_DEFAULT_FEATURES(self):
         # Features listed here will be available to users that don't have a
@@ -493,6 +622,11 @@ class CommunityBaseSettings(Settings):
             'schedule': crontab(minute=27, hour='*/6'),
             'options': {'queue': 'web'},
         },
+        'every-minute-flush-page-views': {
+            'task': 'readthedocs.analytics.tasks.flush_page_views',
+            'schedule': crontab(),
+            'options': {'queue': 'web'},
+        },
         'every-day-delete-old-buildata-models': {
             'task': 'readthedocs.telemetry.tasks.delete_old_build_data',
             'schedule': crontab(minute=0, hour=2),
@@ -942,6 +1076,10 @@ class CommunityBaseSettings(Settings):
     RTD_EMBED_API_DEFAULT_REQUEST_TIMEOUT = 1
     RTD_EMBED_API_DOMAIN_RATE_LIMIT = 50
     RTD_EMBED_API_DOMAIN_RATE_LIMIT_TIMEOUT = 60
+    # The content of each fragment requested from a page is cached,
+    # until the version is built again (or the timeout expires).
+    RTD_EMBED_API_CONTENT_CACHE_TIMEOUT = 60 * 60 * 24
+    RTD_EMBED_API_CONTENT_CACHE_MAX_SIZE = 512 * 1024  # characters
 
     RTD_SPAM_THRESHOLD_DONT_SHOW_ADS = 100
     RTD_SPAM_THRESHOLD_DENY_ON_ROBOTS = 200
@@ -24,6 +24,12 @@ class CommunityTestSettings(CommunityBaseSettings):
 
     CELERY_ALWAYS_EAGER = True
 
+    # Write page views directly to the database.
+    RTD_ANALYTICS_BUFFER_PAGE_VIEWS = False
+
+    # Don't keep build tools on disk between tests.
+    RTD_BUILD_TOOLS_CACHE_PATH = None
+
     # Skip automatic detection of Docker limits for testing
     DOCKER_LIMITS = {"memory": "200m", "time": 600}
 
@@ -9,17 +9,25 @@ in our Docker Development environment.
 
 # Disable abstract method because we are not overriding all the methods
 # pylint: disable=abstract-method
+import base64
+import posixpath
 from functools import cached_property
+from itertools import islice
 
+import structlog
+from botocore.exceptions import ClientError
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from storages.backends.s3boto3 import S3Boto3Storage, S3ManifestStaticStorage
+from storages.utils import clean_name
 
 from readthedocs.builds.storage import BuildMediaStorageMixin
 from readthedocs.storage.rclone import RCloneS3Remote
 
 from .mixins import OverrideHostnameMixin, S3PrivateBucketMixin
 
+log = structlog.get_logger(__name__)
+
 
 class S3BuildMediaStorageMixin(BuildMediaStorageMixin, S3Boto3Storage):
     @cached_property
@@ -40,6 +48,62 @@ class S3BuildMediaStorageMixin(BuildMediaStorageMixin, S3Boto3Storage):
             provider=provider,
         )
 
+    def _list_files(self, path):
+        """
+        Overridden to list all files with a single paginated listing of the prefix.
+
+        This avoids one request per directory, since we don't need to
+        group the files by directory.
+        """
+        prefix = self._normalize_name(clean_name(self._dirpath(path)))
+        for obj in self.bucket.objects.filter(Prefix=prefix):
+            if obj.key != prefix:
+                yield posixpath.relpath(obj.key, prefix)
+
+    def get_checksum(self, path):
+        """
+        Overridden to get the size and hash from the metadata of the object.
+
+        The ETag is the MD5 hash of the object, except for multipart uploads,
+        in that case we use the hash stored by rclone in the metadata (if any).
+        """
+        key = self._normalize_name(clean_name(path))
+        try:
+            response = self.connection.meta.client.head_object(
+                Bucket=self.bucket_name, Key=key
+            )
+        except ClientError as err:
+            if err.response["ResponseMetadata"]["HTTPStatusCode"] == 404:
+                return None
+            raise
+
+        file_hash = response["ETag"].strip('"')
+        if "-" in file_hash:
+            file_hash = None
+            rclone_hash = response.get("Metadata", {}).get("md5chksum")
+            if rclone_hash:
+                file_hash = base64.b64decode(rclone_hash).hex()
+        return response["ContentLength"], file_hash
+
+    def delete_files(self, paths):
+        """Overridden to delete files in batches using a single request per batch."""
+        keys = (self._normalize_name(clean_name(path)) for path in paths)
+        while batch := list(islice(keys, self.delete_files_batch_size)):
+            response = self.bucket.delete_objects(
+                Delete={
+                    "Objects": [{"Key": key} for key in batch],
+                    "Quiet": True,
+                },
+            )
+            # In quiet mode, only the keys that failed to be deleted are returned.
+            errors = response.get("Errors")
+            if errors:
+                log.error(
+                    "Error deleting files from storage.",
+                    errors=errors[:10],
+                    total_errors=len(errors),
+                )
+
 
 class S3BuildMediaStorage(OverrideHostnameMixin, S3BuildMediaStorageMixin):
 
@@ -45,6 +45,23 @@ class BuildDataManager(models.Manager):
                     "user": {},
                     "final": {}
                },
+               "build_tools_cache": {
+                    "hits": 1,
+                    "misses": 0,
+                    "bytes_saved": 104857600  # Size in bytes
+               },
+               "artifacts": {
+                    "html": {
+                        "action": "upload",
+                        "time": 1.5,  # Time in seconds
+                        "files": 10,
+                        "size": 2048  # Size in bytes
+                    },
+                    "pdf": {
+                        "action": "delete",
+                        "time": 0.2
+                    }
+               },
                "packages": {
                    "pip": {
                        "user": [
@@ -1,5 +1,6 @@
 """Git-related utilities."""
 
+import os
 import re
 from typing import Iterable
 
@@ -22,6 +23,13 @@ from readthedocs.projects.constants import (
 )
 from readthedocs.projects.exceptions import RepositoryError
 from readthedocs.vcs_support.base import BaseVCS, VCSVersion
+from readthedocs.vcs_support.mirrors import (
+    clear_mirror,
+    evict_mirrors,
+    get_mirror_path,
+    lock_mirror,
+    record_mirror_size,
+)
 
 log = structlog.get_logger(__name__)
 
@@ -66,11 +74,114 @@ class Backend(BaseVCS):
         """Clone and/or fetch remote repository."""
         super().update()
 
+        mirror_path = self.get_mirror_path()
+        if mirror_path:
+            return self.update_from_mirror(mirror_path)
+
         self.clone()
         # TODO: We are still using return values in this function that are legacy.
         # This should be either explained or removed.
         return self.fetch()
 
+    def get_mirror_path(self):
+        """
+        Get the path of the local mirror of the repository.
+
+        External versions (pull requests) never use the mirror,
+        since they run code we don't trust to build other versions.
+        """
+        if self.version_type == EXTERNAL:
+            return None
+        return get_mirror_path(self.project)
+
+    def update_from_mirror(self, mirror_path):
+        """
+        Clone and fetch the repository borrowing the objects from the local mirror.
+
+        The mirror is updated first, so only new objects are downloaded,
+        and the objects used by the clone are copied from it at the end,
+        so the clone doesn't depend on the mirror after the lock is released.
+        """
+        with lock_mirror(mirror_path):
+            try:
+                self.update_mirror(mirror_path)
+            except RepositoryError:
+                # Don't fail the build if the mirror is broken,
+                # it will be fetched again from the remote on the next build.
+                log.warning(
+                    "Error updating Git mirror.",
+                    project_slug=self.project.slug,
+                    mirror_path=mirror_path,
+                )
+                # The mirror is mounted in the container, it can't be removed from there.
+                clear_mirror(mirror_path)
+                self.clone()
+                result = self.fetch()
+            else:
+                record_mirror_size(mirror_path)
+                self.clone(reference=mirror_path)
+                result = self.fetch()
+                self.dissociate_from_mirror()
+
+        evict_mirrors(keep=mirror_path)
+        return result
+
+    def dissociate_from_mirror(self):
+        """
+        Copy the objects borrowed from the mirror into the clone.
+
+        Only the borrowed objects are packed,
+        the packs downloaded from the remote are kept as they are.
+        """
+        objects_path = os.path.join(self.working_dir, ".git", "objects")
+        alternates_path = os.path.join(objects_path, "info", "alternates")
+        if not os.path.exists(alternates_path):
+            return
+
+        pack_path = os.path.join(objects_path, "pack")
+        keep_packs = [
+            f"--keep-pack={name}"
+            for name in sorted(os.listdir(pack_path))
+            if name.endswith(".pack")
+        ]
+        self.run("git", "repack", "-a", "-d", "--quiet", *keep_packs, record=False)
+        os.remove(alternates_path)
+
+    def get_mirror_fetch_refspecs(self):
+        """
+        Get the refspecs to fetch into the mirror.
+
+        The mirror has the default branch and the reference built,
+        with their whole history, since ``git clone --reference``
+        doesn't support shallow repositories.
+        """
+        refspecs = ["+HEAD:refs/mirror/HEAD"]
+        remote_reference = self.get_remote_fetch_refspec()
+        if remote_reference:
+            source = remote_reference.split(":")[0]
+            if source.startswith("refs/"):
+                refspecs.append(f"+{source}:refs/mirror/{source[len('refs/'):]}")
+            else:
+                # A commit hash, its objects are fetched without creating a ref.
+                refspecs.append(source)
+        return refspecs
+
+    def update_mirror(self, mirror_path):
+        """Fetch the objects of the version being built into the mirror."""
+        if not os.path.exists(os.path.join(mirror_path, "HEAD")):
+            self.run("git", "init", "--bare", "--quiet", mirror_path, record=False)
+
+        cmd = [
+            "git",
+            "--git-dir",
+            mirror_path,
+            "fetch",
+            "--force",
+            self.repo_url,
+            *self.get_mirror_fetch_refspecs(),
+        ]
+        return self.run(*cmd)
+
     def get_remote_fetch_refspec(self):
         """
         Gets a valid remote reference for the identifier.
@@ -166,15 +277,22 @@ class Backend(BaseVCS):
                 project_slug=self.project.slug,
             )
 
-    def clone(self):
-        """Clones the repository."""
+    def clone(self, reference=None):
+        """
+        Clones the repository.
+
+        :param reference: path of a local repository to borrow objects from.
+        """
         # TODO: We should add "--no-checkout" in all git clone operations, except:
         #  There exists a case of version_type=BRANCH without a branch name.
         #  This case is relevant for building projects for the first time without knowing the name
         #  of the default branch. Once this case has been made redundant, we can have
         #  --no-checkout for all clones.
         # --depth 1: Shallow clone, fetch as little data as possible.
-        cmd = ["git", "clone", "--depth", "1", self.repo_url, "."]
+        cmd = ["git", "clone", "--depth", "1"]
+        if reference:
+            cmd.extend(["--reference", reference])
+        cmd.extend([self.repo_url, "."])
 
         try:
             # TODO: Explain or remove the return value
@@ -0,0 +1,175 @@
+"""
+Builder-local mirrors of Git repositories.
+
+When ``RTD_GIT_MIRRORS_PATH`` is set, each Git repository is fetched
+into a bare repository in that directory before cloning it,
+and the clone borrows the objects from it (``git clone --reference``),
+so only new objects are downloaded from the remote on each build.
+
+Mirrors are limited by size, the least recently used ones are removed first.
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import os
+import shutil
+
+import structlog
+from django.conf import settings
+
+from readthedocs.core.utils.filesystem import get_directory_size
+
+log = structlog.get_logger(__name__)
+
+
+def get_mirror_path(project):
+    """
+    Get the path of the mirror for the repository of `project`.
+
+    Mirrors aren't shared between projects,
+    a project can't modify the objects used to build other projects.
+
+    :returns: the path of the mirror, or ``None`` if mirrors are disabled.
+    """
+    if not settings.RTD_GIT_MIRRORS_PATH:
+        return None
+    repo_hash = hashlib.md5(
+        project.clean_repo.encode(), usedforsecurity=False
+    ).hexdigest()
+    return os.path.join(
+        settings.RTD_GIT_MIRRORS_PATH,
+        f"{project.slug}-{repo_hash}.git",
+    )
+
+
+@contextlib.contextmanager
+def lock_mirror(mirror_path, blocking=True):
+    """
+    Lock the mirror at `mirror_path`, so only one build can use it at a time.
+
+    The mirror is marked as recently used when the lock is released.
+
+    :param blocking: if ``False``, yield ``False`` if the mirror is already locked
+     instead of waiting for it.
+    """
+    os.makedirs(mirror_path, exist_ok=True)
+    lock_path = _get_lock_path(mirror_path)
+    while True:
+        fd = open(lock_path, "w")
+        flags = fcntl.LOCK_EX
+        if not blocking:
+            flags |= fcntl.LOCK_NB
+        try:
+            fcntl.flock(fd, flags)
+        except BlockingIOError:
+            fd.close()
+            yield False
+            return
+
+        # The lock file is removed together with its mirror,
+        # if it was removed while we were waiting for it, lock the new one.
+        try:
+            if os.stat(lock_path).st_ino == os.fstat(fd.fileno()).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        fd.close()
+        os.makedirs(mirror_path, exist_ok=True)
+
+    with fd:
+        try:
+            yield True
+        finally:
+            if os.path.exists(mirror_path):
+                os.utime(mirror_path)
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _get_lock_path(mirror_path):
+    return f"{mirror_path}.lock"
+
+
+def _get_size_path(mirror_path):
+    return f"{mirror_path}.size"
+
+
+def _get_mirror_size(mirror_path):
+    try:
+        with open(_get_size_path(mirror_path)) as fd:
+            return int(fd.read())
+    except (OSError, ValueError):
+        return record_mirror_size(mirror_path)
+
+
+def record_mirror_size(mirror_path):
+    """
+    Store the size of the mirror at `mirror_path` next to it.
+
+    The lock must be held when calling this function.
+    Sizes are recorded when a mirror is updated,
+    so the eviction doesn't need to walk all the mirrors.
+
+    :returns: the size of the mirror in bytes.
+    """
+    size = get_directory_size(mirror_path)
+    with open(_get_size_path(mirror_path), "w") as fd:
+        fd.write(str(size))
+    return size
+
+
+def clear_mirror(mirror_path):
+    """
+    Remove the content of the mirror at `mirror_path`.
+
+    The lock must be held when calling this function.
+    The directory itself is kept, it's mounted in the build containers.
+    """
+    for name in os.listdir(mirror_path):
+        path = os.path.join(mirror_path, name)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(_get_size_path(mirror_path))
+
+
+def evict_mirrors(keep=None):
+    """
+    Remove the least recently used mirrors until they fit in ``RTD_GIT_MIRRORS_MAX_SIZE``.
+
+    Mirrors being used by a build are never removed.
+
+    :param keep: path of a mirror that should never be removed.
+    """
+    mirrors_path = settings.RTD_GIT_MIRRORS_PATH
+    mirrors = []
+    for name in os.listdir(mirrors_path):
+        mirror_path = os.path.join(mirrors_path, name)
+        if not name.endswith(".git") or not os.path.isdir(mirror_path):
+            continue
+        mirrors.append(
+            (
+                os.path.getmtime(mirror_path),
+                mirror_path,
+                _get_mirror_size(mirror_path),
+            )
+        )
+
+    total_size = sum(size for _, _, size in mirrors)
+    for _, mirror_path, size in sorted(mirrors):
+        if total_size <= settings.RTD_GIT_MIRRORS_MAX_SIZE:
+            break
+        if mirror_path == keep:
+            continue
+        with lock_mirror(mirror_path, blocking=False) as locked:
+            if not locked:
+                continue
+            log.info("Removing Git mirror.", mirror_path=mirror_path, size=size)
+            shutil.rmtree(mirror_path, ignore_errors=True)
+            for path in (_get_size_path(mirror_path), _get_lock_path(mirror_path)):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+        total_size -= size